@@ -0,0 +1,49 @@
+"""Benchmark one pass with all analyzers vs. one pass per analyzer.
+
+Run with: python benchmarks/analyzers.py
+"""
+
+import timeit
+
+from synthetic_logs import END_NS, START_NS, SyntheticConfig, iter_synthetic_lines
+
+from otlp_analyzer.common.analyzers import (
+    ANALYZERS,
+    AnalysisOptions,
+    analyze_stream,
+    create_analyzers,
+)
+
+LINES = 5000
+OPTIONS = AnalysisOptions(START_NS, END_NS)
+
+
+def run_ms(lines: list[bytes], names: list[str]) -> float:
+    """Analyze the lines with the named analyzers, returning the best time in ms."""
+    seconds = min(
+        timeit.repeat(
+            lambda: analyze_stream(lines, create_analyzers(names, OPTIONS)),
+            number=1,
+            repeat=5,
+        )
+    )
+    return seconds * 1000
+
+
+def main() -> None:
+    lines = [
+        line.encode()
+        for line in iter_synthetic_lines(
+            SyntheticConfig(out_of_range_ratio=0.01), LINES
+        )
+    ]
+    separate = {name: run_ms(lines, [name]) for name in ANALYZERS}
+    print(f"{'analyzers':<24} {'ms':>8}")
+    for name, milliseconds in separate.items():
+        print(f"{name:<24} {milliseconds:>8.1f}")
+    print(f"{'one pass per analyzer':<24} {sum(separate.values()):>8.1f}")
+    print(f"{'single pass':<24} {run_ms(lines, list(ANALYZERS)):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
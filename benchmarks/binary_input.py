@@ -0,0 +1,54 @@
+"""Benchmark reading OTLP JSONL as text vs. as bytes with each JSON backend.
+
+Run with: python benchmarks/binary_input.py
+"""
+
+import io
+import timeit
+
+from parse_timestamps import make_line
+
+from otlp_analyzer.common.json_backend import (
+    BACKEND_NAMES,
+    JSONBackendError,
+    get_backend,
+    set_default_backend,
+)
+from otlp_analyzer.common.otlp_parser import iter_otlp_timestamps
+
+
+def main() -> None:
+    scenarios = [
+        ("small lines", (make_line(1, 4, 40) + "\n") * 20000),
+        ("batched lines", (make_line(200, 6, 80) + "\n") * 100),
+    ]
+    backends = []
+    for name in BACKEND_NAMES:
+        try:
+            backends.append(get_backend(name).name)
+        except JSONBackendError:
+            print(f"{name}: not installed")
+
+    print(f"{'scenario':<15} {'backend':<8} {'text MB/s':>10} {'bytes MB/s':>11}")
+    for scenario, text in scenarios:
+        data = text.encode()
+        for name in backends:
+            set_default_backend(name)
+            rates = []
+            for make_stream in (
+                lambda: io.TextIOWrapper(io.BytesIO(data), encoding="utf-8"),
+                lambda: io.BytesIO(data),
+            ):
+                seconds = min(
+                    timeit.repeat(
+                        lambda: sum(1 for _ in iter_otlp_timestamps(make_stream())),
+                        number=1,
+                        repeat=5,
+                    )
+                )
+                rates.append(len(data) / seconds / 1e6)
+            print(f"{scenario:<15} {name:<8} {rates[0]:>10.0f} {rates[1]:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
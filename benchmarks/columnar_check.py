@@ -0,0 +1,49 @@
+"""Benchmark per-record vs. columnar (NumPy) range checks in process_stream.
+
+Run with: python benchmarks/columnar_check.py
+"""
+
+import io
+import timeit
+
+from parse_timestamps import make_line
+
+from otlp_analyzer.tools.check_timestamp import process_stream
+
+START_NS = 1577836800000000000
+END_NS = 1609459199999000000
+
+
+def main() -> None:
+    scenarios = [
+        ("small lines", (make_line(1, 0, 0) + "\n") * 50000, 50000),
+        ("batched lines", (make_line(200, 0, 0) + "\n") * 250, 50000),
+    ]
+    print(f"{'scenario':<15} {'mode':<10} {'ns/record':>10} {'speedup':>8}")
+    for scenario, data, records in scenarios:
+        results = {}
+        for mode, columnar in (("per-record", False), ("columnar", True)):
+            seconds = min(
+                timeit.repeat(
+                    lambda: process_stream(
+                        io.StringIO(data),
+                        START_NS,
+                        END_NS,
+                        verbose=False,
+                        quiet=True,
+                        columnar=columnar,
+                    ),
+                    number=1,
+                    repeat=5,
+                )
+            )
+            results[mode] = seconds / records
+        for mode, seconds in results.items():
+            print(
+                f"{scenario:<15} {mode:<10} {seconds * 1e9:>10.0f} "
+                f"{results['per-record'] / seconds:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark built-in decompression vs. piping through an external decompressor.
+
+Run with: python benchmarks/decompression.py
+"""
+
+import gzip
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from parse_timestamps import make_line
+
+CHECK = [
+    sys.executable,
+    "-m",
+    "otlp_analyzer.tools.check_timestamp",
+    "--start",
+    "2020-01-01",
+    "--end",
+    "2020-12-31",
+    "--quiet",
+]
+
+
+def wall_time(command: str) -> float:
+    """Best wall-clock time of a shell command over three runs."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run(command, shell=True, check=False, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    data = ((make_line(20, 4, 80) + "\n") * 20000).encode()
+    check = " ".join(CHECK)
+    with tempfile.TemporaryDirectory() as directory:
+        plain = Path(directory) / "logs.jsonl"
+        plain.write_bytes(data)
+        gz = plain.with_suffix(".jsonl.gz")
+        gz.write_bytes(gzip.compress(data, compresslevel=6))
+
+        scenarios = [
+            ("uncompressed file", f"{check} {plain}"),
+            ("gzip file", f"{check} {gz}"),
+            ("gzip stdin", f"{check} < {gz}"),
+        ]
+        if shutil.which("zcat"):
+            scenarios.append(("zcat | check", f"zcat {gz} | {check}"))
+
+        zstd_path = plain.with_suffix(".jsonl.zst")
+        if shutil.which("zstd"):
+            subprocess.run(["zstd", "-q", str(plain), "-o", str(zstd_path)], check=True)
+            scenarios.append(("zstd file", f"{check} {zstd_path}"))
+            scenarios.append(("zstd -dc | check", f"zstd -dc {zstd_path} | {check}"))
+
+        print(f"{len(data) / 1e6:.0f} MB uncompressed")
+        print(f"{'scenario':<20} {'seconds':>8}")
+        for name, command in scenarios:
+            print(f"{name:<20} {wall_time(command):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
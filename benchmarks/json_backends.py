@@ -0,0 +1,55 @@
+"""Benchmark parse_otlp_line with each installed JSON backend.
+
+Run with: python benchmarks/json_backends.py
+"""
+
+import timeit
+
+from parse_timestamps import make_line
+
+from otlp_analyzer.common.json_backend import (
+    BACKEND_NAMES,
+    JSONBackendError,
+    get_backend,
+    set_default_backend,
+)
+from otlp_analyzer.common.otlp_parser import parse_otlp_line
+
+
+def main() -> None:
+    scenarios = [
+        ("small lines", make_line(1, 4, 40), 20000),
+        ("batched lines", make_line(200, 6, 80), 100),
+        ("large bodies", make_line(50, 2, 4000), 200),
+    ]
+    backends = []
+    for name in BACKEND_NAMES:
+        try:
+            backends.append(get_backend(name).name)
+        except JSONBackendError:
+            print(f"{name}: not installed")
+
+    print(
+        f"{'scenario':<15} {'backend':<8} {'us/line':>9} {'MB/s':>8} {'vs stdlib':>10}"
+    )
+    for scenario, line, number in scenarios:
+        timings = {}
+        for name in backends:
+            set_default_backend(name)
+            timings[name] = (
+                min(
+                    timeit.repeat(
+                        lambda: parse_otlp_line(line, 1), number=number, repeat=5
+                    )
+                )
+                / number
+            )
+        for name, seconds in timings.items():
+            print(
+                f"{scenario:<15} {name:<8} {seconds * 1e6:>9.1f} "
+                f"{len(line) / seconds / 1e6:>8.1f} {timings['stdlib'] / seconds:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
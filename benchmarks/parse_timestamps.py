@@ -0,0 +1,75 @@
+"""Benchmark timestamp extraction: full decode vs. the timestamps-only mode.
+
+Run with: python benchmarks/parse_timestamps.py
+"""
+
+import json
+import timeit
+
+from otlp_analyzer.common.otlp_parser import parse_otlp_line
+
+BASE_TIME_NS = 1592226645000000000
+
+
+def make_line(records: int, attributes: int, body_size: int) -> str:
+    """Build one compact OTLP JSONL line resembling collector output."""
+    log_records = [
+        {
+            "timeUnixNano": str(BASE_TIME_NS + i),
+            "observedTimeUnixNano": str(BASE_TIME_NS + i),
+            "severityNumber": 9,
+            "severityText": "INFO",
+            "body": {"stringValue": f'request {i} "ok" ' + "x" * body_size},
+            "attributes": [
+                {"key": f"attr.{j}", "value": {"stringValue": f"value-{j}"}}
+                for j in range(attributes)
+            ],
+            "traceId": "5b8efff798038103d269b633813fc60c",
+            "spanId": "eee19b7ec3c1b174",
+        }
+        for i in range(records)
+    ]
+    data = {
+        "resourceLogs": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": "bench"}}
+                    ]
+                },
+                "scopeLogs": [{"scope": {"name": "bench"}, "logRecords": log_records}],
+            }
+        ]
+    }
+    return json.dumps(data, separators=(",", ":"))
+
+
+def main() -> None:
+    scenarios = [
+        ("small lines", make_line(1, 4, 40), 20000),
+        ("batched lines", make_line(200, 6, 80), 100),
+        ("large bodies", make_line(50, 2, 4000), 200),
+    ]
+    print(
+        f"{'scenario':<15} {'bytes':>8} {'full (us)':>11} "
+        f"{'ts-only (us)':>12} {'speedup':>8}"
+    )
+    for name, line, number in scenarios:
+        full = min(
+            timeit.repeat(lambda: parse_otlp_line(line, 1), number=number, repeat=5)
+        )
+        timestamps = min(
+            timeit.repeat(
+                lambda: parse_otlp_line(line, 1, timestamps_only=True),
+                number=number,
+                repeat=5,
+            )
+        )
+        print(
+            f"{name:<15} {len(line):>8} {full / number * 1e6:>11.1f} "
+            f"{timestamps / number * 1e6:>12.1f} {full / timestamps:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
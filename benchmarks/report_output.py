@@ -0,0 +1,94 @@
+"""Benchmark printing many out-of-range results to a file and to a pipe.
+
+Compares writing every result with its own click.echo call (a buffer of one
+character) with collecting the output in buffers of increasing size.
+
+Run with: python benchmarks/report_output.py
+"""
+
+import contextlib
+import os
+import tempfile
+import threading
+import timeit
+from collections.abc import Callable, Iterator
+from typing import TextIO
+
+from otlp_analyzer.common.otlp_parser import LogRecord
+from otlp_analyzer.common.reports import ReportWriter, print_results
+from otlp_analyzer.common.timestamp_check import CheckResult
+
+START_NS = 1577836800000000000  # 2020-01-01
+END_NS = 1609459199999999999  # 2020-12-31 23:59:59.999999999
+BUFFER_SIZES = [1, 4 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024]
+
+
+def make_results(count: int) -> list[CheckResult]:
+    results = []
+    for index in range(count):
+        record = LogRecord(
+            START_NS - 10**12 * (index + 1), index // 2 + 1, index % 2, {}
+        )
+        results.append(CheckResult(record, "too_early"))
+    return results
+
+
+def print_all(results: list[CheckResult], stdout: TextIO, buffer_size: int) -> None:
+    with contextlib.redirect_stdout(stdout):
+        print_results(
+            (result for result in results),
+            START_NS,
+            END_NS,
+            False,
+            output=ReportWriter(buffer_size=buffer_size),
+        )
+
+
+@contextlib.contextmanager
+def to_file() -> Iterator[TextIO]:
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as file:
+        yield file
+
+
+@contextlib.contextmanager
+def to_pipe() -> Iterator[TextIO]:
+    read_fd, write_fd = os.pipe()
+
+    def drain() -> None:
+        with open(read_fd, "rb") as reader:
+            while reader.read(1 << 16):
+                pass
+
+    thread = threading.Thread(target=drain)
+    thread.start()
+    try:
+        with open(write_fd, "w", encoding="utf-8") as writer:
+            yield writer
+    finally:
+        thread.join()
+
+
+def main() -> None:
+    results = make_results(100000)
+    destinations: list[
+        tuple[str, Callable[[], contextlib.AbstractContextManager[TextIO]]]
+    ] = [
+        ("file", to_file),
+        ("pipe", to_pipe),
+    ]
+    print(f"{'buffer':>8} {'file results/s':>15} {'pipe results/s':>15}")
+    for buffer_size in BUFFER_SIZES:
+        rates = []
+        for _, destination in destinations:
+
+            def run() -> None:
+                with destination() as stdout:
+                    print_all(results, stdout, buffer_size)
+
+            seconds = min(timeit.repeat(run, number=1, repeat=3))
+            rates.append(len(results) / seconds)
+        print(f"{buffer_size:>8} {rates[0]:>15,.0f} {rates[1]:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark the cost of the skew histogram of out-of-range records.
+
+Run with: python benchmarks/skew_histogram.py
+"""
+
+import io
+import timeit
+from typing import Optional
+
+from parse_timestamps import BASE_TIME_NS, make_line
+
+from otlp_analyzer.common.skew_histogram import SkewHistogram
+from otlp_analyzer.tools.check_timestamp import process_stream
+
+DATA = (make_line(200, 0, 0) + "\n") * 250
+RECORDS = 50000
+
+
+def check(start_ns: int, columnar: bool, skew: Optional[SkewHistogram]) -> None:
+    process_stream(
+        io.StringIO(DATA),
+        start_ns,
+        start_ns + 10**18,
+        verbose=False,
+        quiet=True,
+        columnar=columnar,
+        skew=skew,
+    )
+
+
+def main() -> None:
+    # All records in range, or all too early (the worst case)
+    scenarios = [("in range", BASE_TIME_NS - 10**9), ("out of range", BASE_TIME_NS * 2)]
+    print(f"{'scenario':<13} {'mode':<10} {'no skew':>10} {'skew':>10} {'overhead':>9}")
+    for scenario, start_ns in scenarios:
+        for mode, columnar in (("per-record", False), ("columnar", True)):
+            seconds = [
+                min(
+                    timeit.repeat(
+                        lambda: check(start_ns, columnar, skew_histogram()),
+                        number=1,
+                        repeat=5,
+                    )
+                )
+                / RECORDS
+                for skew_histogram in (lambda: None, SkewHistogram)
+            ]
+            print(
+                f"{scenario:<13} {mode:<10} {seconds[0] * 1e9:>8.0f}ns "
+                f"{seconds[1] * 1e9:>8.0f}ns {seconds[1] / seconds[0] - 1:>8.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark the start of the CLI tools on a small file.
+
+Compares the wall time of the interpreter alone, importing click, listing
+the otlp subcommands and checking a file of a few lines with
+`otlp check-timestamp` and with the check_timestamp module run directly.
+Every command runs in a new process, as in batch jobs checking one file at
+a time.
+
+Run with: python benchmarks/startup.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from parse_timestamps import make_line
+
+RUNS = 20
+
+
+def run_ms(arguments: list[str], env: dict[str, str]) -> float:
+    """Run Python with arguments RUNS times, returning the fastest run in ms."""
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *arguments],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main() -> None:
+    source = Path(__file__).resolve().parents[1] / "src"
+    env = dict(os.environ, PYTHONPATH=str(source))
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "logs.jsonl"
+        path.write_text((make_line(2, 4, 40) + "\n") * 10)
+        check = ["--start", "2020-01-01", "--end", "2020-12-31", "-q", str(path)]
+        scenarios = [
+            ("python -c pass", ["-c", "pass"]),
+            ("import click", ["-c", "import click"]),
+            ("otlp --help", ["-m", "otlp_analyzer.tools.otlp", "--help"]),
+            (
+                "otlp check-timestamp",
+                ["-m", "otlp_analyzer.tools.otlp", "check-timestamp", *check],
+            ),
+            (
+                "check_timestamp module",
+                ["-m", "otlp_analyzer.tools.check_timestamp", *check],
+            ),
+        ]
+        print(f"{'command':<24} {'ms':>6}")
+        for name, arguments in scenarios:
+            print(f"{name:<24} {run_ms(arguments, env):>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Benchmark suite tracking the throughput of the timestamp check.
+
+Times parse_otlp_line (full and timestamps-only), check_timestamp_range,
+format_result, TimestampChecker fed one buffer of 10 lines at a time (as
+by a service) and end-to-end process_stream on synthetic data (see
+synthetic_logs) of several shapes. Results can be saved as JSON and
+compared with the results of an earlier version to spot regressions.
+
+Run with: python benchmarks/suite.py [--json results.json] [--baseline old.json]
+"""
+
+import contextlib
+import importlib.metadata
+import importlib.util
+import io
+import json
+import os
+import platform
+import time
+import timeit
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import click
+from synthetic_logs import END_NS, START_NS, SyntheticConfig, iter_synthetic_lines
+
+from otlp_analyzer.common.json_backend import default_backend
+from otlp_analyzer.common.otlp_parser import LogRecord, OTLPParseError, parse_otlp_line
+from otlp_analyzer.common.reports import format_result
+from otlp_analyzer.common.timestamp_check import (
+    TimestampChecker,
+    check_timestamp_range,
+)
+from otlp_analyzer.tools.check_timestamp import process_stream
+
+SCENARIOS = {
+    "small lines": SyntheticConfig(records_per_line=1, attributes=4, body_size=40),
+    "batched lines": SyntheticConfig(
+        resources=2, scopes=2, records_per_line=200, attributes=6
+    ),
+    "large bodies": SyntheticConfig(records_per_line=10, body_size=4000),
+    "dirty": SyntheticConfig(out_of_range_ratio=0.1, malformed_ratio=0.01),
+}
+# Lines per scenario, chosen for about 100k records (and fewer large bodies)
+LINES = {
+    "small lines": 100000,
+    "batched lines": 500,
+    "large bodies": 2000,
+    "dirty": 10000,
+}
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """Best time of a benchmark on a scenario."""
+
+    benchmark: str
+    scenario: str
+    seconds: float
+    items: int  # Records (or results) processed per run
+    bytes: int  # Input bytes processed per run (0 if not applicable)
+
+    @property
+    def key(self) -> str:
+        return f"{self.benchmark} / {self.scenario}"
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def parse_lines(lines: list[bytes], timestamps_only: bool) -> list[LogRecord]:
+    records = []
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            records += parse_otlp_line(line, line_number, timestamps_only)
+        except OTLPParseError:
+            pass
+    return records
+
+
+def run_scenario(
+    scenario: str, config: SyntheticConfig, lines: int, repeat: int
+) -> list[BenchmarkResult]:
+    data = [line.encode() for line in iter_synthetic_lines(config, lines)]
+    stream = b"\n".join(data) + b"\n"
+    records = parse_lines(data, timestamps_only=True)
+    results = [check_timestamp_range(record, START_NS, END_NS) for record in records]
+    offenders = [result for result in results if result.status != "in_range"]
+
+    def check() -> None:
+        for record in records:
+            check_timestamp_range(record, START_NS, END_NS)
+
+    def format_offenders() -> None:
+        for result in offenders:
+            format_result(result, START_NS, END_NS)
+
+    buffers = [b"\n".join(data[i : i + 10]) + b"\n" for i in range(0, len(data), 10)]
+    checker = TimestampChecker(START_NS, END_NS)
+
+    def feed_buffers() -> None:
+        for buffer in buffers:
+            checker.feed(buffer)
+            checker.result()
+
+    def check_stream() -> None:
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                process_stream(io.BytesIO(stream), START_NS, END_NS, False, False)
+
+    benchmarks: list[tuple[str, Callable[[], object], int, int]] = [
+        (
+            "parse_otlp_line",
+            lambda: parse_lines(data, False),
+            len(records),
+            len(stream),
+        ),
+        (
+            "parse_otlp_line timestamps",
+            lambda: parse_lines(data, True),
+            len(records),
+            len(stream),
+        ),
+        ("check_timestamp_range", check, len(records), 0),
+        ("format_result", format_offenders, len(offenders), 0),
+        ("TimestampChecker.feed", feed_buffers, len(records), len(stream)),
+        ("process_stream", check_stream, len(records), len(stream)),
+    ]
+    return [
+        BenchmarkResult(name, scenario, best_time(function, repeat), items, size)
+        for name, function, items, size in benchmarks
+        if items
+    ]
+
+
+def environment() -> dict[str, Any]:
+    try:
+        version = importlib.metadata.version("otlp-analyzer")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    return {
+        "version": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "json_backend": default_backend().name,
+        "numpy": importlib.util.find_spec("numpy") is not None,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def load_baseline(path: Path) -> dict[str, float]:
+    with open(path, encoding="utf-8") as file:
+        saved = json.load(file)
+    return {
+        f"{result['benchmark']} / {result['scenario']}": result["items_per_second"]
+        for result in saved["results"]
+    }
+
+
+@click.command()
+@click.option(
+    "--json",
+    "json_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Save the results and environment as JSON to this file",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Compare with the results saved by an earlier --json run",
+)
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True)
+@click.option(
+    "--scale",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    show_default=True,
+    help="Multiply the number of lines of every scenario (e.g. 0.1 for a quick run)",
+)
+def main(
+    json_path: Optional[Path], baseline: Optional[Path], repeat: int, scale: float
+) -> None:
+    """Run all benchmarks on all scenarios."""
+    previous = load_baseline(baseline) if baseline is not None else {}
+    print(
+        f"{'benchmark':<27} {'scenario':<14} {'items/s':>12} {'MB/s':>8} {'change':>7}"
+    )
+    results = []
+    for scenario, config in SCENARIOS.items():
+        lines = max(1, int(LINES[scenario] * scale))
+        for result in run_scenario(scenario, config, lines, repeat):
+            results.append(result)
+            megabytes = (
+                f"{result.bytes / result.seconds / 1e6:.1f}" if result.bytes else "-"
+            )
+            change = (
+                f"{result.items_per_second / previous[result.key] - 1:+7.1%}"
+                if result.key in previous
+                else ""
+            )
+            print(
+                f"{result.benchmark:<27} {scenario:<14} "
+                f"{result.items_per_second:>12,.0f} {megabytes:>8} {change:>7}"
+            )
+
+    if json_path is not None:
+        saved = {
+            "environment": environment(),
+            "results": [
+                asdict(result) | {"items_per_second": result.items_per_second}
+                for result in results
+            ],
+        }
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(saved, file, indent=2)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
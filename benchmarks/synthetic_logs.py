@@ -0,0 +1,182 @@
+"""Deterministic synthetic OTLP logs for benchmarks.
+
+The same configuration and seed always give the same lines, so benchmark
+results of different versions are measured on identical input. Records are
+spread evenly over the resources and scopes of a line; out-of-range records
+lie up to a month before or after the range, and malformed lines are valid
+lines cut off at a random point.
+
+Run with: python benchmarks/synthetic_logs.py --lines 100000 > logs.jsonl
+"""
+
+import json
+import random
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import click
+
+# The range checked by the benchmarks: all of 2020
+START_NS = 1577836800000000000
+END_NS = 1609459199999999999
+
+MONTH_NS = 31 * 86400 * 10**9
+SEVERITIES = [(5, "DEBUG"), (9, "INFO"), (13, "WARN"), (17, "ERROR")]
+WORDS = ["request", "handled", "user", "cache", "miss", "timeout", "retry", "ok"]
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticConfig:  # pylint: disable=too-many-instance-attributes
+    """Shape and content of synthetic OTLP JSONL lines."""
+
+    resources: int = 1  # resourceLogs per line
+    scopes: int = 1  # scopeLogs per resource
+    records_per_line: int = 10
+    attributes: int = 4  # Attributes per record
+    body_size: int = 80  # Characters of every body
+    out_of_range_ratio: float = 0.0  # Share of records outside the range
+    malformed_ratio: float = 0.0  # Share of lines that are invalid JSON
+    seed: int = 0
+
+
+def iter_synthetic_lines(config: SyntheticConfig, lines: int) -> Iterator[str]:
+    """
+    Generate OTLP JSONL lines (without line endings).
+
+    Args:
+        config: Shape and content of the lines
+        lines: Number of lines
+
+    Yields:
+        The lines, the same for every call with the same arguments
+    """
+    rng = random.Random(config.seed)
+    text = " ".join(rng.choice(WORDS) for _ in range(config.body_size // 3 + 1))
+    body = text[: config.body_size]
+    scopes = config.resources * config.scopes
+    for line_number in range(lines):
+        records = [
+            _make_record(
+                rng, config, line_number * config.records_per_line + index, body
+            )
+            for index in range(config.records_per_line)
+        ]
+        data = {
+            "resourceLogs": [
+                {
+                    "resource": {
+                        "attributes": [
+                            _attribute("service.name", f"service-{resource}"),
+                            _attribute("host.name", f"host-{line_number % 16}"),
+                        ]
+                    },
+                    "scopeLogs": [
+                        {
+                            "scope": {"name": f"scope-{scope}", "version": "1.0.0"},
+                            "logRecords": records[
+                                resource * config.scopes + scope :: scopes
+                            ],
+                        }
+                        for scope in range(config.scopes)
+                    ],
+                }
+                for resource in range(config.resources)
+            ]
+        }
+        line = json.dumps(data, separators=(",", ":"))
+        if rng.random() < config.malformed_ratio:
+            line = line[: rng.randrange(1, len(line))]
+        yield line
+
+
+def _make_record(
+    rng: random.Random, config: SyntheticConfig, number: int, body: str
+) -> dict[str, Any]:
+    if rng.random() < config.out_of_range_ratio:
+        if rng.random() < 0.5:
+            time_unix_nano = START_NS - rng.randrange(1, MONTH_NS)
+        else:
+            time_unix_nano = END_NS + rng.randrange(1, MONTH_NS)
+    else:
+        time_unix_nano = rng.randrange(START_NS, END_NS + 1)
+    severity_number, severity_text = rng.choice(SEVERITIES)
+    return {
+        "timeUnixNano": str(time_unix_nano),
+        "observedTimeUnixNano": str(time_unix_nano + rng.randrange(10**9)),
+        "severityNumber": severity_number,
+        "severityText": severity_text,
+        "body": {"stringValue": body},
+        "attributes": [
+            _attribute(f"attr.{index}", f"value-{number}-{index}")
+            for index in range(config.attributes)
+        ],
+        "traceId": f"{rng.getrandbits(128):032x}",
+        "spanId": f"{rng.getrandbits(64):016x}",
+    }
+
+
+def _attribute(key: str, value: str) -> dict[str, Any]:
+    return {"key": key, "value": {"stringValue": value}}
+
+
+@click.command()
+@click.option("--lines", type=click.IntRange(min=0), default=10000, show_default=True)
+@click.option("--resources", type=click.IntRange(min=1), default=1, show_default=True)
+@click.option("--scopes", type=click.IntRange(min=1), default=1, show_default=True)
+@click.option(
+    "--records-per-line", type=click.IntRange(min=0), default=10, show_default=True
+)
+@click.option("--attributes", type=click.IntRange(min=0), default=4, show_default=True)
+@click.option("--body-size", type=click.IntRange(min=0), default=80, show_default=True)
+@click.option(
+    "--out-of-range-ratio",
+    type=click.FloatRange(0, 1),
+    default=0.0,
+    show_default=True,
+)
+@click.option(
+    "--malformed-ratio", type=click.FloatRange(0, 1), default=0.0, show_default=True
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False),
+    help="Write the lines to this file instead of stdout",
+)
+def main(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    lines: int,
+    resources: int,
+    scopes: int,
+    records_per_line: int,
+    attributes: int,
+    body_size: int,
+    out_of_range_ratio: float,
+    malformed_ratio: float,
+    seed: int,
+    output: Optional[str],
+) -> None:
+    """Write synthetic OTLP JSONL lines, with 2020 as the expected range."""
+    config = SyntheticConfig(
+        resources,
+        scopes,
+        records_per_line,
+        attributes,
+        body_size,
+        out_of_range_ratio,
+        malformed_ratio,
+        seed,
+    )
+    with (
+        open(output, "w", encoding="utf-8")
+        if output is not None
+        else open(sys.stdout.fileno(), "w", encoding="utf-8", closefd=False)
+    ) as file:
+        for line in iter_synthetic_lines(config, lines):
+            file.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
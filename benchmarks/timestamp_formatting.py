@@ -0,0 +1,83 @@
+"""Benchmark formatting timestamps and differences: floats vs. integers.
+
+Compares the integer formatters of otlp_analyzer.common.utils with the
+float and strftime based versions they replaced, for timestamps from a few
+seconds (as in bursts of reported records) and from all over the year
+(every second a cache miss).
+
+Run with: python benchmarks/timestamp_formatting.py
+"""
+
+import random
+import timeit
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from otlp_analyzer.common.utils import format_difference, format_timestamp
+
+START_NS = 1577836800000000000  # 2020-01-01
+YEAR_NS = 366 * 86400 * 10**9
+
+
+def float_format_timestamp(timestamp_ns: int) -> str:
+    """The float and strftime based format_timestamp."""
+    timestamp_s = timestamp_ns / 1e9
+    dt = datetime.fromtimestamp(timestamp_s, tz=timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def float_format_difference(difference_ns: int, reference: str = "") -> str:
+    """The float based format_difference."""
+    total_seconds = abs(difference_ns) / 1e9
+    days = int(total_seconds // 86400)
+    remaining_seconds = total_seconds % 86400
+    hours = int(remaining_seconds // 3600)
+    remaining_seconds %= 3600
+    minutes = int(remaining_seconds // 60)
+    seconds = remaining_seconds % 60
+    parts = []
+    if days > 0:
+        parts.append(f"{days} day{'s' if days != 1 else ''}")
+    parts.append(f"{hours:02d}:{minutes:02d}:{seconds:06.3f}")
+    duration = ", ".join(parts)
+    return f"{duration} {reference}" if reference else duration
+
+
+def per_call_ns(function: Callable[[int], str], values: list[int]) -> float:
+    seconds = min(
+        timeit.repeat(lambda: [function(value) for value in values], number=1, repeat=5)
+    )
+    return seconds / len(values) * 1e9
+
+
+def main() -> None:
+    generator = random.Random(0)
+    scenarios = [
+        (
+            "timestamp, burst",
+            float_format_timestamp,
+            format_timestamp,
+            [START_NS + generator.randrange(5 * 10**9) for _ in range(100000)],
+        ),
+        (
+            "timestamp, year",
+            float_format_timestamp,
+            format_timestamp,
+            [START_NS + generator.randrange(YEAR_NS) for _ in range(100000)],
+        ),
+        (
+            "difference",
+            float_format_difference,
+            format_difference,
+            [generator.randrange(YEAR_NS) for _ in range(100000)],
+        ),
+    ]
+    print(f"{'scenario':<18} {'float ns':>9} {'integer ns':>11} {'speedup':>8}")
+    for name, old, new, values in scenarios:
+        old_ns = per_call_ns(old, values)
+        new_ns = per_call_ns(new, values)
+        print(f"{name:<18} {old_ns:>9.0f} {new_ns:>11.0f} {old_ns / new_ns:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
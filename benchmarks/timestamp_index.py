@@ -0,0 +1,75 @@
+"""Benchmark checking a file without and with its timestamp index or extract.
+
+Run with: python benchmarks/timestamp_index.py
+"""
+
+import contextlib
+import io
+import tempfile
+import timeit
+from pathlib import Path
+
+from parse_timestamps import make_line
+
+from otlp_analyzer.common.timestamp_extract import build_extract, extract_path_for
+from otlp_analyzer.common.timestamp_index import build_index, index_path_for
+from otlp_analyzer.tools.check_timestamp import process_file
+
+# make_line timestamps lie in 2020
+START_NS = 1577836800000000000  # 2020-01-01
+END_NS = 1609459199999999999  # 2020-12-31 23:59:59.999999999
+# Printing every record would dominate reports of out-of-range records, so
+# those are only checked in quiet mode
+SCENARIOS = [
+    ("all in range", START_NS, END_NS, False),
+    ("all in range", START_NS, END_NS, True),
+    ("all too late", START_NS - 10**18, START_NS - 1, True),
+]
+
+
+def check(path: Path, start_ns: int, end_ns: int, quiet: bool, use_index: bool) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_file(path, start_ns, end_ns, False, quiet, use_index=use_index)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "logs.jsonl"
+        path.write_text((make_line(20, 4, 80) + "\n") * 20000)
+        size = path.stat().st_size
+        for name, build in (("index", build_index), ("extract", build_extract)):
+            seconds = min(timeit.repeat(lambda: build(path), number=1, repeat=3))
+            print(f"building {name}: {size / seconds / 1e6:.0f} MB/s")
+        extract = extract_path_for(path)
+        hidden = extract.with_name("hidden")
+
+        print(
+            f"{'window':<14} {'mode':<8} {'no index ms':>12} {'index ms':>9}"
+            f" {'extract ms':>11}"
+        )
+        for window, start_ns, end_ns, quiet in SCENARIOS:
+            times = []
+            # Without sidecars, with the index only, with the extract
+            for use_index, use_extract in ((False, False), (True, False), (True, True)):
+                if use_extract:
+                    hidden.rename(extract)
+                elif extract.exists():
+                    extract.rename(hidden)
+                seconds = min(
+                    timeit.repeat(
+                        lambda: check(path, start_ns, end_ns, quiet, use_index),
+                        number=1,
+                        repeat=3,
+                    )
+                )
+                times.append(seconds * 1000)
+            mode = "quiet" if quiet else "default"
+            print(
+                f"{window:<14} {mode:<8} {times[0]:>12.1f} {times[1]:>9.1f}"
+                f" {times[2]:>11.1f}"
+            )
+        assert index_path_for(path).exists()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark generic vs. typed (msgspec schema) decoding of OTLP lines.
+
+Run with: python benchmarks/typed_decoding.py
+"""
+
+import timeit
+import tracemalloc
+
+from parse_timestamps import make_line
+
+from otlp_analyzer.common.json_backend import set_default_backend
+from otlp_analyzer.common.otlp_parser import parse_otlp_line
+
+
+def peak_bytes(line: str, timestamps_only: bool) -> int:
+    """Peak memory allocated while parsing and holding the records of a line."""
+    tracemalloc.start()
+    records = parse_otlp_line(line, 1, timestamps_only=timestamps_only)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return peak
+
+
+def main() -> None:
+    set_default_backend("msgspec")
+    scenarios = [
+        ("small lines", make_line(1, 4, 40), 20000, 1),
+        ("batched lines", make_line(200, 6, 80), 100, 200),
+        ("large bodies", make_line(50, 2, 4000), 200, 50),
+    ]
+    print(
+        f"{'scenario':<15} {'mode':<8} {'us/line':>9} {'speedup':>8} "
+        f"{'peak B/record':>14}"
+    )
+    for scenario, line, number, records in scenarios:
+        results = {}
+        for mode, timestamps_only in (("generic", False), ("typed", True)):
+            seconds = (
+                min(
+                    timeit.repeat(
+                        lambda: parse_otlp_line(
+                            line, 1, timestamps_only=timestamps_only
+                        ),
+                        number=number,
+                        repeat=5,
+                    )
+                )
+                / number
+            )
+            results[mode] = (seconds, peak_bytes(line, timestamps_only))
+        for mode, (seconds, peak) in results.items():
+            print(
+                f"{scenario:<15} {mode:<8} {seconds * 1e6:>9.1f} "
+                f"{results['generic'][0] / seconds:>7.1f}x {peak // records:>14}"
+            )
+
+
+if __name__ == "__main__":
+    main()
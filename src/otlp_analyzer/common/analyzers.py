@@ -0,0 +1,509 @@
+"""Running several analyses of OTLP logs over a single decode of the input.
+
+Every analyzer is registered in ANALYZERS under the name of its otlp analyze
+option. analyze_stream decodes each line once and passes every record to all
+analyzers, so enabling more analyses adds their own cost but no further
+parsing. Analyzers that only look at timeUnixNano declare so, and if all
+enabled analyzers do, lines are decoded for their timestamps only.
+"""
+
+import binascii
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, ClassVar, Optional, TypeVar
+
+from otlp_analyzer.common.otlp_parser import (
+    Line,
+    LogRecord,
+    OTLPParseError,
+    StreamProgress,
+    iter_otlp_records,
+)
+from otlp_analyzer.common.reports import format_summary
+from otlp_analyzer.common.timestamp_check import (
+    Summary,
+    check_timestamp_range,
+    count_result,
+)
+from otlp_analyzer.common.utils import format_timestamp
+
+_A = TypeVar("_A", bound=type["Analyzer"])
+
+
+class AnalyzerError(Exception):
+    """Raised when an analyzer cannot be created from the given options."""
+
+
+@dataclass(frozen=True, slots=True)
+class AnalysisOptions:
+    """Options of an analysis run, shared by all analyzers."""
+
+    start_ns: Optional[int] = None  # Time range of the check-timestamp analyzer
+    end_ns: Optional[int] = None
+
+
+class Analyzer(ABC):
+    """
+    An analysis of the log records of a stream.
+
+    Subclasses are registered with @register_analyzer and receive every
+    record and every invalid line of the stream in input order, followed by
+    a single call to finish().
+    """
+
+    name: ClassVar[str]  # Name of the analyzer and its otlp analyze option
+    help: ClassVar[str]  # Help of the otlp analyze option
+    # Whether records need their decoded fields in raw_data; otherwise only
+    # their time_unix_nano is set
+    needs_raw_data: ClassVar[bool] = True
+
+    @classmethod
+    def from_options(cls, options: AnalysisOptions) -> "Analyzer":
+        """
+        Create the analyzer for an analysis run.
+
+        Raises:
+            AnalyzerError: If the options do not suit the analyzer
+        """
+        del options
+        return cls()
+
+    @abstractmethod
+    def add_record(self, record: LogRecord) -> None:
+        """Analyze a log record."""
+
+    def add_error(self, line_number: int, error: OTLPParseError) -> None:
+        """Count a line that could not be parsed."""
+
+    def finish(self, progress: StreamProgress) -> None:
+        """Complete the analysis once the whole stream has been read."""
+
+    @abstractmethod
+    def format_report(self) -> str:
+        """Format the results of the analysis."""
+
+    def has_issues(self) -> bool:
+        """Whether the analysis found problems in the input."""
+        return False
+
+
+# Registered analyzers by name, in the order of their reports
+ANALYZERS: dict[str, type[Analyzer]] = {}
+
+
+def register_analyzer(cls: _A) -> _A:
+    """Class decorator adding an analyzer to ANALYZERS."""
+    ANALYZERS[cls.name] = cls
+    return cls
+
+
+def create_analyzers(names: Iterable[str], options: AnalysisOptions) -> list[Analyzer]:
+    """
+    Create the analyzers with the given names, in the order of ANALYZERS.
+
+    Args:
+        names: Names of registered analyzers
+        options: Options of the analysis
+
+    Returns:
+        New analyzers
+
+    Raises:
+        AnalyzerError: If a name is unknown or the options do not suit an analyzer
+    """
+    names = set(names)
+    unknown = names - ANALYZERS.keys()
+    if unknown:
+        raise AnalyzerError(f"Unknown analyzer(s): {', '.join(sorted(unknown))}")
+    return [
+        cls.from_options(options) for name, cls in ANALYZERS.items() if name in names
+    ]
+
+
+def analyze_stream(
+    input_stream: Iterable[Line],
+    analyzers: Sequence[Analyzer],
+    *,
+    on_error: Optional[Callable[[int, OTLPParseError], None]] = None,
+    progress: Optional[StreamProgress] = None,
+) -> StreamProgress:
+    """
+    Decode a JSONL stream once and pass its records to all analyzers.
+
+    Args:
+        input_stream: Lines of JSONL to analyze
+        analyzers: The analyzers, finished once the stream is exhausted
+        on_error: Also called with the line number and error of invalid lines
+        progress: Updated with the number of lines and bytes read
+
+    Returns:
+        The progress, counting all lines and bytes read
+    """
+    if progress is None:
+        progress = StreamProgress()
+    adders = [analyzer.add_record for analyzer in analyzers]
+
+    def add_error(line_number: int, error: OTLPParseError) -> None:
+        for analyzer in analyzers:
+            analyzer.add_error(line_number, error)
+        if on_error is not None:
+            on_error(line_number, error)
+
+    records = iter_otlp_records(
+        input_stream,
+        timestamps_only=not any(analyzer.needs_raw_data for analyzer in analyzers),
+        on_error=add_error,
+        progress=progress,
+    )
+    for record in records:
+        for add in adders:
+            add(record)
+
+    for analyzer in analyzers:
+        analyzer.finish(progress)
+    return progress
+
+
+@register_analyzer
+class TimestampAnalyzer(Analyzer):
+    """Counts records within, before and after a time range (see timestamp_check)."""
+
+    name = "check-timestamp"
+    help = "Count log records inside and outside of --start..--end"
+    needs_raw_data = False
+
+    def __init__(self, start_ns: int, end_ns: int) -> None:
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.summary = Summary()
+
+    @classmethod
+    def from_options(cls, options: AnalysisOptions) -> "TimestampAnalyzer":
+        if options.start_ns is None or options.end_ns is None:
+            raise AnalyzerError("--check-timestamp requires --start and --end")
+        return cls(options.start_ns, options.end_ns)
+
+    def add_record(self, record: LogRecord) -> None:
+        count_result(
+            self.summary, check_timestamp_range(record, self.start_ns, self.end_ns)
+        )
+
+    def add_error(self, line_number: int, error: OTLPParseError) -> None:
+        self.summary.errors += 1
+
+    def finish(self, progress: StreamProgress) -> None:
+        self.summary.total_lines = progress.lines
+
+    def format_report(self) -> str:
+        return format_summary(self.summary)
+
+    def has_issues(self) -> bool:
+        return self.summary.has_issues()
+
+
+@register_analyzer
+class StatsAnalyzer(Analyzer):
+    """Counts lines, records and severities, and finds the time span of the records."""
+
+    name = "stats"
+    help = "Count records by severity and find their earliest and latest timestamps"
+
+    def __init__(self) -> None:
+        self.lines = 0
+        self.invalid_lines = 0
+        self.records = 0
+        self.missing_timestamps = 0
+        self.earliest: Optional[int] = None
+        self.latest: Optional[int] = None
+        self.severities: Counter[str] = Counter()
+
+    def add_record(self, record: LogRecord) -> None:
+        self.records += 1
+        time_unix_nano = record.time_unix_nano
+        if time_unix_nano is None:
+            self.missing_timestamps += 1
+        else:
+            if self.earliest is None or time_unix_nano < self.earliest:
+                self.earliest = time_unix_nano
+            if self.latest is None or time_unix_nano > self.latest:
+                self.latest = time_unix_nano
+        self.severities[_severity(record.raw_data)] += 1
+
+    def add_error(self, line_number: int, error: OTLPParseError) -> None:
+        self.invalid_lines += 1
+
+    def finish(self, progress: StreamProgress) -> None:
+        self.lines = progress.lines
+
+    def format_report(self) -> str:
+        lines = [
+            "---",
+            "Statistics:",
+            f"  Total lines processed: {self.lines}",
+            f"  Invalid lines: {self.invalid_lines}",
+            f"  Total log records: {self.records}",
+            f"  Records without timeUnixNano: {self.missing_timestamps}",
+        ]
+        if self.earliest is not None and self.latest is not None:
+            lines.append(f"  Earliest timestamp: {format_timestamp(self.earliest)}")
+            lines.append(f"  Latest timestamp: {format_timestamp(self.latest)}")
+        if self.severities:
+            lines.append("  Severities:")
+            lines.extend(
+                f"    {severity}: {count}"
+                for severity, count in self.severities.most_common()
+            )
+        return "\n".join(lines)
+
+
+def _severity(record: Mapping[str, Any]) -> str:
+    """The severityText of a record, or its severityNumber if it has no text."""
+    severity_text = record.get("severityText")
+    if isinstance(severity_text, str) and severity_text:
+        return severity_text
+    severity_number = record.get("severityNumber")
+    if isinstance(severity_number, int) and severity_number:
+        return f"severityNumber {severity_number}"
+    return "unspecified"
+
+
+# Examples of schema violations shown in the report of SchemaAnalyzer
+SCHEMA_EXAMPLES = 5
+
+_HEX_PATTERN = re.compile(r"(?:[0-9a-fA-F]{2})*")
+_UINT_PATTERN = re.compile(r"[0-9]+")
+_INT_PATTERN = re.compile(r"-?[0-9]+")
+_MAX_UINT64 = 2**64 - 1
+
+
+@register_analyzer
+class SchemaAnalyzer(Analyzer):
+    """
+    Validates log records against the OTLP JSON encoding of LogRecord.
+
+    Checks the type of every known field, the values of enums, integers and
+    IDs, the structure of bodies and attributes (AnyValue and KeyValue), and
+    reports unknown fields, which are most often misspelled ones.
+    """
+
+    name = "schema"
+    help = "Validate the fields of log records against the OTLP JSON schema"
+
+    def __init__(self) -> None:
+        self.invalid_lines = 0
+        self.records = 0
+        self.invalid_records = 0
+        self.violations: Counter[str] = Counter()
+        self.examples: list[str] = []
+
+    def add_record(self, record: LogRecord) -> None:
+        self.records += 1
+        violations = validate_log_record(record.raw_data)
+        if not violations:
+            return
+        self.invalid_records += 1
+        self.violations.update(violations)
+        if len(self.examples) < SCHEMA_EXAMPLES:
+            self.examples.append(
+                f"Line {record.line_number}, record {record.record_index}: "
+                + "; ".join(violations)
+            )
+
+    def add_error(self, line_number: int, error: OTLPParseError) -> None:
+        self.invalid_lines += 1
+        if len(self.examples) < SCHEMA_EXAMPLES:
+            self.examples.append(f"Line {line_number}: {error}")
+
+    def format_report(self) -> str:
+        lines = [
+            "---",
+            "Schema:",
+            f"  Invalid lines: {self.invalid_lines}",
+            f"  Total log records: {self.records}",
+            f"  Invalid log records: {self.invalid_records}",
+        ]
+        if self.violations:
+            lines.append("  Violations:")
+            lines.extend(
+                f"    {violation}: {count}"
+                for violation, count in sorted(self.violations.items())
+            )
+        if self.examples:
+            lines.append("  First issues:")
+            lines.extend(f"    {example}" for example in self.examples)
+        return "\n".join(lines)
+
+    def has_issues(self) -> bool:
+        return self.invalid_lines + self.invalid_records > 0
+
+
+def validate_log_record(record: Mapping[str, Any]) -> list[str]:
+    """
+    Validate a decoded log record against the OTLP JSON encoding.
+
+    Args:
+        record: The decoded log record object
+
+    Returns:
+        Descriptions of the violations, e.g. "severityNumber: not an integer"
+        (empty if the record is valid)
+    """
+    violations = []
+    for key, value in record.items():
+        validate = _FIELD_VALIDATORS.get(key)
+        message = validate(value) if validate is not None else "unknown field"
+        if message:
+            violations.append(f"{key}: {message}")
+    return violations
+
+
+def _validate_uint64(value: Any) -> str:
+    if isinstance(value, str):
+        if not _UINT_PATTERN.fullmatch(value):
+            return "not a decimal integer"
+        # Shorter strings are always in range
+        if len(value) < 20:
+            return ""
+        value = int(value)
+    elif not isinstance(value, int) or isinstance(value, bool):
+        return "not an integer"
+    if not 0 <= value <= _MAX_UINT64:
+        return "out of range"
+    return ""
+
+
+def _validate_count(value: Any) -> str:
+    if not isinstance(value, int) or isinstance(value, bool):
+        return "not an integer"
+    if not 0 <= value < 2**32:
+        return "out of range"
+    return ""
+
+
+def _validate_severity_number(value: Any) -> str:
+    if not isinstance(value, int) or isinstance(value, bool):
+        return "not an integer"
+    if not 0 <= value <= 24:
+        return "not a SeverityNumber"
+    return ""
+
+
+def _validate_string(value: Any) -> str:
+    return "" if isinstance(value, str) else "not a string"
+
+
+def _id_validator(size: int) -> Callable[[Any], str]:
+    """Validator of hex-encoded IDs of size bytes (or empty)."""
+
+    def validate(value: Any) -> str:
+        if not isinstance(value, str):
+            return "not a string"
+        if value and (len(value) != 2 * size or not _HEX_PATTERN.fullmatch(value)):
+            return f"not {size} hex-encoded bytes"
+        return ""
+
+    return validate
+
+
+def _validate_any_value(value: Any) -> str:
+    if not isinstance(value, dict):
+        return "not an AnyValue object"
+    # Most values are strings, so they are checked first
+    if isinstance(value.get("stringValue"), str) and len(value) == 1:
+        return ""
+    if len(value) > 1:
+        return "more than one value"
+    for kind, item in value.items():
+        validate = _ANY_VALUE_VALIDATORS.get(kind)
+        if validate is None:
+            return f"unknown value type {kind}"
+        return validate(item)
+    return ""
+
+
+def _validate_attributes(value: Any) -> str:
+    if not isinstance(value, list):
+        return "not a list"
+    for item in value:
+        if not isinstance(item, dict) or not isinstance(item.get("key"), str):
+            return "attribute without a key"
+        message = _validate_any_value(item.get("value", {}))
+        if message:
+            return f"attribute {item['key']}: {message}"
+    return ""
+
+
+def _validate_int64(value: Any) -> str:
+    if isinstance(value, str):
+        return "" if _INT_PATTERN.fullmatch(value) else "not a decimal integer"
+    if not isinstance(value, int) or isinstance(value, bool):
+        return "not an integer"
+    return ""
+
+
+def _validate_double(value: Any) -> str:
+    if isinstance(value, str):
+        return "" if value in ("NaN", "Infinity", "-Infinity") else "not a number"
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return "not a number"
+    return ""
+
+
+def _validate_bool(value: Any) -> str:
+    return "" if isinstance(value, bool) else "not a boolean"
+
+
+def _validate_bytes(value: Any) -> str:
+    if not isinstance(value, str):
+        return "not a string"
+    try:
+        binascii.a2b_base64(value, strict_mode=True)
+    except binascii.Error:
+        return "not base64"
+    return ""
+
+
+def _validate_array(value: Any) -> str:
+    if not isinstance(value, dict) or not isinstance(value.get("values", []), list):
+        return "not an ArrayValue object"
+    for item in value.get("values", []):
+        message = _validate_any_value(item)
+        if message:
+            return message
+    return ""
+
+
+def _validate_kvlist(value: Any) -> str:
+    if not isinstance(value, dict):
+        return "not a KeyValueList object"
+    return _validate_attributes(value.get("values", []))
+
+
+_ANY_VALUE_VALIDATORS: dict[str, Callable[[Any], str]] = {
+    "stringValue": _validate_string,
+    "boolValue": _validate_bool,
+    "intValue": _validate_int64,
+    "doubleValue": _validate_double,
+    "arrayValue": _validate_array,
+    "kvlistValue": _validate_kvlist,
+    "bytesValue": _validate_bytes,
+}
+
+# Fields of LogRecord in the OTLP JSON encoding (camelCase, 64-bit integers
+# as decimal strings or numbers, IDs hex-encoded)
+_FIELD_VALIDATORS: dict[str, Callable[[Any], str]] = {
+    "timeUnixNano": _validate_uint64,
+    "observedTimeUnixNano": _validate_uint64,
+    "severityNumber": _validate_severity_number,
+    "severityText": _validate_string,
+    "body": _validate_any_value,
+    "attributes": _validate_attributes,
+    "droppedAttributesCount": _validate_count,
+    "flags": _validate_count,
+    "traceId": _id_validator(16),
+    "spanId": _id_validator(8),
+    "eventName": _validate_string,
+}
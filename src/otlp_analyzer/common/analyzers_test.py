@@ -0,0 +1,234 @@
+"""Tests for analyzers module."""
+
+import io
+from typing import Any
+
+import pytest
+
+from otlp_analyzer.common.analyzers import (
+    ANALYZERS,
+    AnalysisOptions,
+    Analyzer,
+    AnalyzerError,
+    SchemaAnalyzer,
+    StatsAnalyzer,
+    TimestampAnalyzer,
+    analyze_stream,
+    create_analyzers,
+    validate_log_record,
+)
+from otlp_analyzer.common.otlp_parser import (
+    NO_RAW_DATA,
+    LogRecord,
+    OTLPParseError,
+    StreamProgress,
+)
+from otlp_analyzer.common.timestamp_check import Summary, iter_check_results
+
+DATA = (
+    b'{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000","severityText":"INFO"},{"timeUnixNano":"1576408200000000000","severityNumber":17}]}]}]}\n'
+    b"{invalid json\n"
+    b'{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1615819530123000000","severityNumber":"ERROR"},{"severityText":"INFO"}]}]}]}\n'
+)
+START_NS = 1577836800000000000  # 2020-01-01
+END_NS = 1609459199999000000  # 2020-12-31 23:59:59.999
+
+
+class RecordingAnalyzer(Analyzer):
+    """Keeps everything it is passed, without raw data."""
+
+    name = "recording"
+    help = "Record everything"
+    needs_raw_data = False
+
+    def __init__(self) -> None:
+        self.records: list[LogRecord] = []
+        self.errors: list[int] = []
+        self.finished: list[int] = []
+
+    def add_record(self, record: LogRecord) -> None:
+        self.records.append(record)
+
+    def add_error(self, line_number: int, error: OTLPParseError) -> None:
+        self.errors.append(line_number)
+
+    def finish(self, progress: StreamProgress) -> None:
+        self.finished.append(progress.lines)
+
+    def format_report(self) -> str:
+        return f"{len(self.records)} records"
+
+
+class TestAnalyzeStream:
+    """Test passing a stream to several analyzers."""
+
+    def test_dispatch(self) -> None:
+        """Test that every analyzer gets every record, error and the end."""
+        analyzers = [RecordingAnalyzer(), RecordingAnalyzer()]
+        on_error: list[int] = []
+
+        progress = analyze_stream(
+            io.BytesIO(DATA),
+            analyzers,
+            on_error=lambda line_number, _error: on_error.append(line_number),
+        )
+
+        assert progress.lines == 3
+        assert on_error == [2]
+        for analyzer in analyzers:
+            assert [(r.line_number, r.record_index) for r in analyzer.records] == [
+                (1, 0),
+                (1, 1),
+                (3, 0),
+                (3, 1),
+            ]
+            assert analyzer.errors == [2]
+            assert analyzer.finished == [3]
+
+    def test_timestamps_only(self) -> None:
+        """Test that records are only decoded in full if an analyzer needs it."""
+        recording = RecordingAnalyzer()
+        analyze_stream(io.BytesIO(DATA), [recording])
+        assert all(record.raw_data is NO_RAW_DATA for record in recording.records)
+
+        recording = RecordingAnalyzer()
+        analyze_stream(io.BytesIO(DATA), [recording, StatsAnalyzer()])
+        assert recording.records[0].raw_data["severityText"] == "INFO"
+
+
+class TestCreateAnalyzers:
+    """Test creating analyzers from the registry."""
+
+    def test_registry_order(self) -> None:
+        """Test that analyzers come in the order of the registry."""
+        analyzers = create_analyzers(
+            ["schema", "check-timestamp", "stats"], AnalysisOptions(START_NS, END_NS)
+        )
+
+        assert [analyzer.name for analyzer in analyzers] == list(ANALYZERS)
+        assert isinstance(analyzers[0], TimestampAnalyzer)
+        assert analyzers[0].start_ns == START_NS
+
+    def test_unknown(self) -> None:
+        """Test that unknown names are rejected."""
+        with pytest.raises(AnalyzerError, match="Unknown analyzer"):
+            create_analyzers(["everything"], AnalysisOptions())
+
+    def test_missing_range(self) -> None:
+        """Test that the timestamp check requires a time range."""
+        with pytest.raises(AnalyzerError, match="--start and --end"):
+            create_analyzers(["check-timestamp"], AnalysisOptions(START_NS))
+
+
+class TestAnalyzers:
+    """Test the registered analyzers."""
+
+    def test_timestamp(self) -> None:
+        """Test that the summary matches the timestamp check."""
+        analyzer = TimestampAnalyzer(START_NS, END_NS)
+        expected = Summary()
+        for _ in iter_check_results(
+            io.BytesIO(DATA), START_NS, END_NS, expected, on_error=lambda *_: None
+        ):
+            pass
+
+        analyze_stream(io.BytesIO(DATA), [analyzer])
+
+        assert analyzer.summary == expected
+        assert analyzer.has_issues()
+
+    def test_stats(self) -> None:
+        """Test counting severities and finding the time span."""
+        analyzer = StatsAnalyzer()
+
+        analyze_stream(io.BytesIO(DATA), [analyzer])
+
+        assert analyzer.format_report() == (
+            "---\n"
+            "Statistics:\n"
+            "  Total lines processed: 3\n"
+            "  Invalid lines: 1\n"
+            "  Total log records: 4\n"
+            "  Records without timeUnixNano: 1\n"
+            "  Earliest timestamp: 2019-12-15T11:10:00.000Z\n"
+            "  Latest timestamp: 2021-03-15T14:45:30.123Z\n"
+            "  Severities:\n"
+            "    INFO: 2\n"
+            "    severityNumber 17: 1\n"
+            "    unspecified: 1"
+        )
+        assert not analyzer.has_issues()
+
+    def test_schema(self) -> None:
+        """Test counting violations and showing the first issues."""
+        analyzer = SchemaAnalyzer()
+
+        analyze_stream(io.BytesIO(DATA), [analyzer])
+
+        assert analyzer.invalid_lines == 1
+        assert analyzer.invalid_records == 1
+        assert dict(analyzer.violations) == {"severityNumber: not an integer": 1}
+        assert analyzer.examples[1] == (
+            "Line 3, record 0: severityNumber: not an integer"
+        )
+        assert analyzer.has_issues()
+
+
+class TestValidateLogRecord:
+    """Test validating log records against the OTLP JSON encoding."""
+
+    def test_valid(self) -> None:
+        """Test a record using every field."""
+        record = {
+            "timeUnixNano": "1592224245000000000",
+            "observedTimeUnixNano": 1592224245000000001,
+            "severityNumber": 9,
+            "severityText": "INFO",
+            "body": {"kvlistValue": {"values": [{"key": "a", "value": {}}]}},
+            "attributes": [
+                {"key": "s", "value": {"stringValue": "x"}},
+                {"key": "b", "value": {"boolValue": True}},
+                {"key": "i", "value": {"intValue": "-5"}},
+                {"key": "d", "value": {"doubleValue": "NaN"}},
+                {"key": "y", "value": {"bytesValue": "aGk="}},
+                {"key": "l", "value": {"arrayValue": {"values": [{"intValue": 1}]}}},
+            ],
+            "droppedAttributesCount": 0,
+            "flags": 1,
+            "traceId": "5b8efff798038103d269b633813fc60c",
+            "spanId": "",
+            "eventName": "login",
+        }
+
+        assert not validate_log_record(record)
+
+    @pytest.mark.parametrize(
+        "record, violation",
+        [
+            ({"timeUnixNano": "1.5"}, "timeUnixNano: not a decimal integer"),
+            ({"timeUnixNano": str(2**64)}, "timeUnixNano: out of range"),
+            ({"observedTimeUnixNano": -1}, "observedTimeUnixNano: out of range"),
+            ({"severityNumber": 25}, "severityNumber: not a SeverityNumber"),
+            ({"severityText": 3}, "severityText: not a string"),
+            ({"body": "text"}, "body: not an AnyValue object"),
+            ({"body": {"textValue": "x"}}, "body: unknown value type textValue"),
+            (
+                {"body": {"stringValue": "x", "intValue": 1}},
+                "body: more than one value",
+            ),
+            ({"body": {"bytesValue": "a"}}, "body: not base64"),
+            ({"attributes": {}}, "attributes: not a list"),
+            ({"attributes": [{"value": {}}]}, "attributes: attribute without a key"),
+            (
+                {"attributes": [{"key": "a", "value": {"boolValue": "yes"}}]},
+                "attributes: attribute a: not a boolean",
+            ),
+            ({"flags": True}, "flags: not an integer"),
+            ({"traceId": "xyz"}, "traceId: not 16 hex-encoded bytes"),
+            ({"spanId": "5b8efff798038103d2"}, "spanId: not 8 hex-encoded bytes"),
+            ({"timeUnixNanos": "1"}, "timeUnixNanos: unknown field"),
+        ],
+    )
+    def test_invalid(self, record: dict[str, Any], violation: str) -> None:
+        """Test that each kind of violation is described."""
+        assert validate_log_record(record) == [violation]
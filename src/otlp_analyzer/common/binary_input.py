@@ -0,0 +1,54 @@
+"""Reading JSONL input as bytes in large blocks."""
+
+import io
+from collections.abc import Iterable
+from typing import Any, BinaryIO, TextIO, Union, cast
+
+from otlp_analyzer.common.compression import (
+    MAGIC_SIZE,
+    detect_compression,
+    iter_decompressed_lines,
+)
+
+# Read size for input streams; much larger than the default of 8 KiB so that
+# reading a large input takes few system calls
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+def binary_lines(
+    stream: Union[TextIO, BinaryIO], buffer_size: int = READ_BUFFER_SIZE
+) -> Iterable[bytes]:
+    """
+    Get the lines of an input stream as bytes, skipping the text decoding.
+
+    Lines are split by the C implementation of the buffered reader, so each
+    line costs a single bytes object instead of a bytes read and a decoded
+    str. For streams backed by a file descriptor (e.g. sys.stdin), the
+    descriptor is read directly in blocks of buffer_size; data already
+    buffered by the stream itself is not seen, so this must be called before
+    anything is read from the stream.
+
+    Compressed input (see compression.COMPRESSION_MAGIC) is detected from
+    its first bytes and decompressed while reading.
+
+    Args:
+        stream: A text stream with a binary buffer (e.g. sys.stdin) or a
+                binary stream
+        buffer_size: Size of the blocks read from a file descriptor
+
+    Returns:
+        Iterable over the lines including their line endings
+    """
+    binary = cast(BinaryIO, getattr(stream, "buffer", stream))
+    raw: Any
+    try:
+        raw = io.FileIO(binary.fileno(), closefd=False)
+    except (AttributeError, OSError):
+        # In-memory streams have no descriptor (io.UnsupportedOperation)
+        raw = binary
+    reader = io.BufferedReader(raw, buffer_size)
+
+    compression = detect_compression(reader.peek(MAGIC_SIZE)[:MAGIC_SIZE])
+    if compression is not None:
+        return iter_decompressed_lines(cast(BinaryIO, reader), compression, buffer_size)
+    return reader
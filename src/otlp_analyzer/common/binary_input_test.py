@@ -0,0 +1,40 @@
+"""Tests for binary_input module."""
+
+import gzip
+import io
+from pathlib import Path
+
+from otlp_analyzer.common.binary_input import binary_lines
+
+
+class TestBinaryLines:
+    """Test reading input streams as bytes."""
+
+    def test_in_memory_stream(self) -> None:
+        """Test that in-memory binary streams are used as they are."""
+        stream = io.BytesIO(b"a\nb")
+
+        assert list(binary_lines(stream)) == [b"a\n", b"b"]
+
+    def test_text_stream(self) -> None:
+        """Test reading the buffer of a text stream."""
+        stream = io.TextIOWrapper(io.BytesIO("é\n\n".encode()), encoding="utf-8")
+
+        assert list(binary_lines(stream)) == ["é\n".encode(), b"\n"]
+
+    def test_file_descriptor(self, tmp_path: Path) -> None:
+        """Test that streams with a file descriptor are read in blocks."""
+        path = tmp_path / "data.jsonl"
+        path.write_bytes(b"x" * 100 + b"\ny\n")
+
+        with open(path, encoding="utf-8") as stream:
+            lines = binary_lines(stream, buffer_size=16)
+
+            assert isinstance(lines, io.BufferedReader)
+            assert list(lines) == [b"x" * 100 + b"\n", b"y\n"]
+
+    def test_compressed(self) -> None:
+        """Test that compressed input is decompressed."""
+        stream = io.BytesIO(gzip.compress(b"a\nb\n"))
+
+        assert list(binary_lines(stream)) == [b"a\n", b"b\n"]
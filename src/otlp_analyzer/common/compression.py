@@ -0,0 +1,130 @@
+"""Detecting and decompressing gzip, bzip2 and zstd compressed input."""
+
+import importlib
+import io
+import os
+from collections.abc import Iterator
+from typing import Any, BinaryIO, Optional, Union
+
+# Leading bytes of each supported compression format
+COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+MAGIC_SIZE = max(len(magic) for magic in COMPRESSION_MAGIC.values())
+
+
+class CompressionError(Exception):
+    """Raised when compressed input cannot be decompressed."""
+
+
+def detect_compression(header: bytes) -> Optional[str]:
+    """
+    Detect the compression format of data from its first bytes.
+
+    Args:
+        header: The first MAGIC_SIZE (or more) bytes of the data
+
+    Returns:
+        One of the keys of COMPRESSION_MAGIC, or None for uncompressed data
+    """
+    for name, magic in COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return name
+    return None
+
+
+def file_compression(path: Union[str, "os.PathLike[str]"]) -> Optional[str]:
+    """
+    Detect the compression format of a file.
+
+    Args:
+        path: Path of the file
+
+    Returns:
+        One of the keys of COMPRESSION_MAGIC, or None for uncompressed files
+    """
+    with open(path, "rb") as file:
+        return detect_compression(file.read(MAGIC_SIZE))
+
+
+def iter_decompressed_lines(
+    stream: BinaryIO, compression: str, buffer_size: int
+) -> Iterator[bytes]:
+    """
+    Read the lines of a compressed binary stream.
+
+    Decompression is streamed in blocks of buffer_size, so memory use does
+    not depend on the size of the data. Concatenated gzip members and zstd
+    frames (e.g. from appending to a rotated file) are read as one stream.
+
+    Args:
+        stream: The compressed stream, positioned at its start
+        compression: One of the keys of COMPRESSION_MAGIC
+        buffer_size: Size of the blocks of decompressed data
+
+    Yields:
+        Lines of the decompressed data including their line endings
+
+    Raises:
+        CompressionError: If the data is corrupt or truncated, or for zstd
+                          data if no zstd implementation is installed
+    """
+    raw, errors = _open_decompressor(stream, compression)
+    try:
+        yield from io.BufferedReader(raw, buffer_size)
+    except errors as e:
+        raise CompressionError(f"Invalid {compression} data: {e}") from e
+
+
+def _open_decompressor(
+    stream: BinaryIO, compression: str
+) -> tuple[Any, tuple[type[Exception], ...]]:
+    """
+    Open a decompressing reader of a stream.
+
+    Args:
+        stream: The compressed stream
+        compression: One of the keys of COMPRESSION_MAGIC
+
+    Returns:
+        The reader and the exceptions it raises for invalid data
+
+    Raises:
+        CompressionError: For zstd if no zstd implementation is installed
+    """
+    # Imported here, as most checks read uncompressed input
+    if compression == "gzip":
+        # pylint: disable=import-outside-toplevel
+        import gzip
+        import zlib
+
+        return gzip.GzipFile(fileobj=stream, mode="rb"), (
+            OSError,
+            EOFError,
+            zlib.error,
+        )
+    if compression == "bz2":
+        # pylint: disable-next=import-outside-toplevel
+        import bz2
+
+        return bz2.BZ2File(stream, mode="rb"), (OSError, EOFError)
+    if compression != "zstd":
+        raise ValueError(f"Unknown compression '{compression}'")
+
+    # Part of the standard library since Python 3.14
+    try:
+        zstd = importlib.import_module("compression.zstd")
+        return zstd.ZstdFile(stream, mode="rb"), (zstd.ZstdError, EOFError)
+    except ImportError:
+        pass
+
+    try:
+        zstandard = importlib.import_module("zstandard")
+    except ImportError as e:
+        raise CompressionError(
+            "zstd input requires Python 3.14 or the zstandard package"
+        ) from e
+    reader = zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+    return reader, (zstandard.ZstdError,)
@@ -0,0 +1,73 @@
+"""Tests for compression module."""
+
+import bz2
+import gzip
+import io
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from otlp_analyzer.common.compression import (
+    CompressionError,
+    detect_compression,
+    file_compression,
+    iter_decompressed_lines,
+)
+
+DATA = b'{"resourceLogs":[]}\n' * 3 + b"last"
+LINES = [b'{"resourceLogs":[]}\n'] * 3 + [b"last"]
+
+
+def zstd_compress(data: bytes) -> bytes:
+    zstandard = pytest.importorskip("zstandard")
+    compressed: bytes = zstandard.ZstdCompressor().compress(data)
+    return compressed
+
+
+class TestDetectCompression:
+    """Test detecting compression formats."""
+
+    def test_formats(self) -> None:
+        """Test detecting each format from its magic bytes."""
+        assert detect_compression(gzip.compress(DATA)) == "gzip"
+        assert detect_compression(bz2.compress(DATA)) == "bz2"
+        assert detect_compression(b"\x28\xb5\x2f\xfd\x00") == "zstd"
+
+    def test_uncompressed(self) -> None:
+        """Test that JSONL and short data are not compressed."""
+        assert detect_compression(DATA) is None
+        assert detect_compression(b"\x1f") is None
+        assert detect_compression(b"") is None
+
+    def test_file(self, tmp_path: Path) -> None:
+        """Test detecting the format of a file."""
+        path = tmp_path / "logs.jsonl.gz"
+        path.write_bytes(gzip.compress(DATA))
+
+        assert file_compression(path) == "gzip"
+
+
+class TestIterDecompressedLines:
+    """Test streaming decompression."""
+
+    @pytest.mark.parametrize(
+        ("compression", "compress"),
+        [("gzip", gzip.compress), ("bz2", bz2.compress), ("zstd", zstd_compress)],
+    )
+    def test_decompress(
+        self, compression: str, compress: Callable[[bytes], bytes]
+    ) -> None:
+        """Test reading the lines of concatenated compressed streams."""
+        data = compress(DATA) + compress(DATA)
+
+        lines = list(iter_decompressed_lines(io.BytesIO(data), compression, 16))
+
+        assert lines == LINES[:-1] + [b"last" + LINES[0]] + LINES[1:]
+
+    def test_truncated(self) -> None:
+        """Test that truncated data raises CompressionError."""
+        data = gzip.compress(DATA)[:-8]
+
+        with pytest.raises(CompressionError, match="Invalid gzip data"):
+            list(iter_decompressed_lines(io.BytesIO(data), "gzip", 16))
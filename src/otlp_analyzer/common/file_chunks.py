@@ -0,0 +1,149 @@
+"""Reading JSONL files, whole or in byte ranges that start at line boundaries."""
+
+import io
+import mmap
+import os
+from collections.abc import Iterator
+from typing import Optional, Union, cast
+
+from otlp_analyzer.common.binary_input import READ_BUFFER_SIZE
+from otlp_analyzer.common.compression import (
+    MAGIC_SIZE,
+    detect_compression,
+    iter_decompressed_lines,
+)
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Amount of a memory-mapped file read before its pages are released
+RELEASE_SIZE = 16 * 1024 * 1024
+
+
+def split_line_ranges(path: PathLike, count: int) -> list[tuple[int, int]]:
+    """
+    Split a file into at most count byte ranges of whole lines.
+
+    Each range starts at the beginning of a line and ends at the beginning of
+    the next range, so every line belongs to exactly one range. Ranges are
+    roughly equal in size; fewer are returned for files with fewer lines.
+
+    Args:
+        path: Path of the file to split
+        count: Desired number of ranges
+
+    Returns:
+        List of (start, end) byte offsets in file order
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as file:
+        for part in range(1, count):
+            position = size * part // count
+            if position <= boundaries[-1]:
+                continue
+            # Move to the start of the line following position
+            file.seek(position - 1)
+            position += len(file.readline()) - 1
+            if boundaries[-1] < position < size:
+                boundaries.append(position)
+    boundaries.append(size)
+
+    return [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end
+    ]
+
+
+def iter_range_lines(
+    path: PathLike, start: int = 0, end: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Read the lines of a byte range of a file.
+
+    Regular files are memory-mapped, so that the pages already read can be
+    released and the resident memory stays small (see _iter_mapped_lines).
+    Each line is still copied out of the mapping into a bytes object. Other
+    files (e.g. pipes) are read through a large buffer instead. Whole
+    compressed files are decompressed while reading (see
+    compression.COMPRESSION_MAGIC); byte ranges always refer to the file as
+    it is stored.
+
+    Args:
+        path: Path of the file to read
+        start: Offset of the first line
+        end: Offset after the last line (see split_line_ranges), or None to
+             read to the end of the file
+
+    Yields:
+        Lines including their line endings, as bytes
+    """
+    with open(path, "rb", buffering=READ_BUFFER_SIZE) as file:
+        if start == 0 and end is None:
+            header = cast(io.BufferedReader, file).peek(MAGIC_SIZE)[:MAGIC_SIZE]
+            compression = detect_compression(header)
+            if compression is not None:
+                yield from iter_decompressed_lines(file, compression, READ_BUFFER_SIZE)
+                return
+
+        try:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Not mappable (pipe, character device) or empty
+            mapping = None
+
+        if mapping is not None:
+            with mapping:
+                yield from _iter_mapped_lines(mapping, start, end)
+            return
+
+        if start:
+            file.seek(start)
+        if end is None:
+            yield from file
+            return
+        remaining = end - start
+        for line in file:
+            if remaining <= 0:
+                break
+            remaining -= len(line)
+            yield line
+
+
+def _iter_mapped_lines(
+    mapping: mmap.mmap, start: int, end: Optional[int]
+) -> Iterator[bytes]:
+    """
+    Read the lines of a byte range of a memory-mapped file.
+
+    Each line is copied out of the mapping by mmap.readline, which splits
+    lines faster than Python code slicing the mapping would. The mapping
+    does not save that copy. What it gives is that pages that have been read
+    are released every RELEASE_SIZE bytes, so the resident memory of the
+    process stays small however large the file is (the pages stay in the
+    page cache).
+
+    Args:
+        mapping: The memory-mapped file
+        start: Offset of the first line
+        end: Offset after the last line, or None for the end of the file
+
+    Yields:
+        Lines including their line endings, as bytes
+    """
+    if end is None:
+        end = len(mapping)
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mapping.madvise(mmap.MADV_SEQUENTIAL)
+    release = hasattr(mmap, "MADV_DONTNEED")
+
+    mapping.seek(start)
+    readline = mapping.readline
+    position = start
+    released = start - start % mmap.PAGESIZE
+    while position < end:
+        line = readline()
+        position += len(line)
+        yield line
+        if release and position - released >= RELEASE_SIZE:
+            boundary = position - position % mmap.PAGESIZE
+            mapping.madvise(mmap.MADV_DONTNEED, released, boundary - released)
+            released = boundary
@@ -0,0 +1,109 @@
+"""Tests for file_chunks module."""
+
+import gzip
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from otlp_analyzer.common import file_chunks
+from otlp_analyzer.common.file_chunks import iter_range_lines, split_line_ranges
+
+
+class TestSplitLineRanges:
+    """Test splitting files at line boundaries."""
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 7, 100])
+    def test_ranges_cover_lines(self, tmp_path: Path, count: int) -> None:
+        """Test that ranges are contiguous and every line is read once."""
+        lines = [f"line {i} " + "x" * (i % 5) + "\n" for i in range(20)] + ["last"]
+        path = tmp_path / "data.jsonl"
+        path.write_text("".join(lines))
+
+        ranges = split_line_ranges(path, count)
+
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == path.stat().st_size
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+        assert len(ranges) <= count
+        read = [
+            line for start, end in ranges for line in iter_range_lines(path, start, end)
+        ]
+        assert read == [line.encode() for line in lines]
+
+    def test_long_line(self, tmp_path: Path) -> None:
+        """Test that a line spanning several ranges is not split."""
+        path = tmp_path / "data.jsonl"
+        path.write_text("a\n" + "b" * 100 + "\nc\n")
+
+        assert split_line_ranges(path, 10) == [(0, 103), (103, 105)]
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        """Test that an empty file has no ranges."""
+        path = tmp_path / "data.jsonl"
+        path.write_text("")
+
+        assert not split_line_ranges(path, 4)
+
+    def test_range(self, tmp_path: Path) -> None:
+        """Test that only the lines of the range are read, as bytes."""
+        path = tmp_path / "data.jsonl"
+        path.write_bytes("é\nü\nx\n".encode())
+
+        assert list(iter_range_lines(path, 3, 6)) == ["ü\n".encode()]
+
+
+class TestIterRangeLines:
+    """Test reading lines of files."""
+
+    def test_whole_file(self, tmp_path: Path) -> None:
+        """Test reading all lines of a file, including an unterminated one."""
+        path = tmp_path / "data.jsonl"
+        path.write_bytes(b"a\n\nb\r\nc")
+
+        assert list(iter_range_lines(path)) == [b"a\n", b"\n", b"b\r\n", b"c"]
+
+    def test_release_pages(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that releasing read pages of a mapping keeps all lines intact."""
+        monkeypatch.setattr(file_chunks, "RELEASE_SIZE", 1)
+        lines = [f"{i:05d}".encode() * 300 + b"\n" for i in range(100)]
+        path = tmp_path / "data.jsonl"
+        path.write_bytes(b"".join(lines))
+        start = len(lines[0]) * 10
+        end = len(lines[0]) * 90
+
+        assert list(iter_range_lines(path)) == lines
+        assert list(iter_range_lines(path, start, end)) == lines[10:90]
+
+    def test_compressed_file(self, tmp_path: Path) -> None:
+        """Test that whole compressed files are decompressed."""
+        path = tmp_path / "data.jsonl.gz"
+        path.write_bytes(gzip.compress(b"a\nb\n"))
+
+        assert list(iter_range_lines(path)) == [b"a\n", b"b\n"]
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        """Test that empty files, which cannot be mapped, have no lines."""
+        path = tmp_path / "data.jsonl"
+        path.write_bytes(b"")
+
+        assert not list(iter_range_lines(path))
+
+    def test_pipe(self, tmp_path: Path) -> None:
+        """Test that files that cannot be mapped are read sequentially."""
+        path = tmp_path / "pipe"
+        os.mkfifo(path)
+
+        def write() -> None:
+            with open(path, "wb") as pipe:
+                pipe.write(b"a\nb\n")
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        lines = list(iter_range_lines(path))
+        writer.join()
+
+        assert lines == [b"a\n", b"b\n"]
@@ -0,0 +1,188 @@
+"""Following a growing file like ``tail -F``, with resumable positions."""
+
+import json
+import os
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from otlp_analyzer.common.binary_input import READ_BUFFER_SIZE
+
+
+class CheckpointError(Exception):
+    """Raised when a checkpoint file cannot be used."""
+
+
+@dataclass(slots=True)
+class Checkpoint:
+    """Position in a followed file and the state derived from what was read."""
+
+    path: str
+    inode: int
+    offset: int  # Byte offset after the last line read
+    lines: int  # Number of lines read from the current file
+    state: dict[str, int] = field(default_factory=dict)
+
+
+def load_checkpoint(checkpoint_path: Path) -> Optional[Checkpoint]:
+    """
+    Read a checkpoint file.
+
+    Args:
+        checkpoint_path: Path of the checkpoint
+
+    Returns:
+        The checkpoint, or None if the file does not exist
+
+    Raises:
+        CheckpointError: If the file is not a valid checkpoint
+    """
+    try:
+        with open(checkpoint_path, encoding="utf-8") as file:
+            data = json.load(file)
+        return Checkpoint(**data)
+    except FileNotFoundError:
+        return None
+    except (ValueError, TypeError) as e:
+        raise CheckpointError(f"Invalid checkpoint {checkpoint_path}: {e}") from e
+
+
+def save_checkpoint(checkpoint_path: Path, checkpoint: Checkpoint) -> None:
+    """
+    Write a checkpoint file.
+
+    The checkpoint is written to a temporary file that replaces
+    checkpoint_path, so a crash never leaves a partial checkpoint.
+
+    Args:
+        checkpoint_path: Path of the checkpoint
+        checkpoint: The checkpoint to write
+    """
+    temporary_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(asdict(checkpoint), file)
+    os.replace(temporary_path, checkpoint_path)
+
+
+class FileFollower:
+    """
+    Reads the lines of a file as they are appended to it.
+
+    Only complete lines are read; a partially written last line is held back
+    until its line ending arrives. The file is considered rotated when the
+    path refers to a different file (rename and re-create) or the file shrank
+    below the position read so far (truncation). After a rename, the rest of
+    the old file is read before switching to the new one.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        offset: int = 0,
+        inode: Optional[int] = None,
+    ) -> None:
+        """
+        Start following a file.
+
+        Args:
+            path: Path of the file to follow
+            offset: Byte offset of the first line to read
+            inode: Inode the offset refers to (default: the current file); if
+                   the path now refers to another file, reading starts at
+                   its beginning
+        """
+        self.path = path
+        # Called when no new data is available, before waiting for it
+        self.on_idle: Callable[[], None] = _do_nothing
+        # Called before the first line of a new file (after rotation)
+        self.on_rotate: Callable[[], None] = _do_nothing
+
+        self._file: BinaryIO = open(  # pylint: disable=consider-using-with
+            path, "rb", buffering=READ_BUFFER_SIZE
+        )
+        self.inode = os.fstat(self._file.fileno()).st_ino
+        self.offset = 0
+        if inode is None or inode == self.inode:
+            if offset > os.fstat(self._file.fileno()).st_size:
+                offset = 0  # Truncated since
+            self.offset = offset
+            self._file.seek(offset)
+        self._stopped = False
+
+    def __enter__(self) -> "FileFollower":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the followed file."""
+        self._file.close()
+
+    def stop(self) -> None:
+        """Make lines() return instead of waiting for more data."""
+        self._stopped = True
+
+    def lines(self, poll_interval: float = 1.0) -> Iterator[bytes]:
+        """
+        Read lines as they are appended, until stop() is called.
+
+        offset is the position after the last yielded line whenever the
+        consumer asks for the next one.
+
+        Args:
+            poll_interval: Seconds to wait for new data at the end of the file
+
+        Yields:
+            Complete lines including their line endings
+        """
+        partial = b""
+        while True:
+            line = self._file.readline()
+            if line.endswith(b"\n"):
+                line = partial + line
+                partial = b""
+                self.offset += len(line)
+                yield line
+                continue
+            partial += line
+
+            if self._rotated():
+                if partial:
+                    # The old file is complete, even without a line ending
+                    self.offset += len(partial)
+                    yield partial
+                    partial = b""
+                self._reopen()
+                continue
+
+            self.on_idle()
+            if self._stopped:
+                return
+            time.sleep(poll_interval)
+
+    def _rotated(self) -> bool:
+        """Check whether the path refers to a new or truncated file."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            # Renamed, and the new file does not exist yet
+            return False
+        # Only called at the end of the old file, so all of it has been read
+        return stat.st_ino != self.inode or stat.st_size < self._file.tell()
+
+    def _reopen(self) -> None:
+        """Switch to the file that is now at the path, or restart a truncated one."""
+        self._file.close()
+        self._file = open(  # pylint: disable=consider-using-with
+            self.path, "rb", buffering=READ_BUFFER_SIZE
+        )
+        self.inode = os.fstat(self._file.fileno()).st_ino
+        self.offset = 0
+        self.on_rotate()
+
+
+def _do_nothing() -> None:
+    pass
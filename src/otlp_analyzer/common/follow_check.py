@@ -0,0 +1,186 @@
+"""Checking the timestamps of a growing file as lines are appended."""
+
+import os
+import time
+from collections.abc import Iterator
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from otlp_analyzer.common.follow import (
+    Checkpoint,
+    CheckpointError,
+    FileFollower,
+    load_checkpoint,
+    save_checkpoint,
+)
+from otlp_analyzer.common.otlp_parser import StreamProgress
+from otlp_analyzer.common.reports import (
+    ReportLimits,
+    ReportWriter,
+    error_printer,
+    print_results,
+    report_mode,
+)
+from otlp_analyzer.common.timestamp_check import Summary, iter_check_results
+
+# Seconds between checkpoints while following a file that keeps growing
+CHECKPOINT_INTERVAL = 10.0
+
+
+def process_follow(  # pylint: disable=too-many-arguments
+    path: Path,
+    start_ns: int,
+    end_ns: int,
+    verbose: bool,
+    quiet: bool,
+    *,
+    checkpoint_path: Optional[Path] = None,
+    poll_interval: float = 1.0,
+    limits: Optional[ReportLimits] = None,
+    report_format: str = "text",
+) -> tuple[Summary, bool]:
+    """
+    Check the lines of a growing JSONL file as they are appended.
+
+    Runs until interrupted (KeyboardInterrupt) or stopped by the limits.
+    Line numbers restart with
+    every new file after a rotation (see follow.FileFollower), while the
+    summary covers everything read.
+
+    With a checkpoint path, the read position and the summary are saved
+    every CHECKPOINT_INTERVAL seconds and whenever all available lines have
+    been checked, and a later call resumes from the saved position. If the
+    file was rotated in between, the new file is read from its beginning.
+
+    Args:
+        path: Path of the JSONL file
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+        verbose: Show all records (including in-range)
+        quiet: Only show summary
+        checkpoint_path: Where to save and resume the position
+        poll_interval: Seconds to wait for new lines at the end of the file
+        limits: Limits on the results printed and when to stop reading (see
+                reports.ReportLimits)
+        report_format: Output format of the results (see reports.REPORT_FORMATS)
+
+    Returns:
+        Tuple of (Summary, has_issues) once interrupted or stopped
+
+    Raises:
+        CheckpointError: If the checkpoint is invalid or belongs to another file
+    """
+    session = _FollowSession(path, checkpoint_path, notify_rotation=not quiet)
+    output = ReportWriter(report_format)
+
+    def on_idle() -> None:
+        # Show the results of the lines appended so far before waiting
+        output.flush()
+        session.save()
+
+    session.follower.on_idle = on_idle
+    with session.follower:
+        # Records are checked one by one: batches would hold back the results
+        # until enough lines have been appended
+        results = iter_check_results(
+            session.lines(poll_interval),
+            start_ns,
+            end_ns,
+            session.summary,
+            report=report_mode(verbose, quiet, limits),
+            on_error=error_printer(quiet, limits, output),
+            progress=session.progress,
+            columnar=False,
+        )
+        try:
+            print_results(results, start_ns, end_ns, quiet, limits, output=output)
+        except KeyboardInterrupt:
+            pass
+
+    session.summary.total_lines = session.total_lines()
+    return session.summary, session.summary.has_issues()
+
+
+class _FollowSession:
+    """What process_follow has read, and where it saves its checkpoints."""
+
+    def __init__(
+        self, path: Path, checkpoint_path: Optional[Path], notify_rotation: bool
+    ) -> None:
+        self.summary = Summary()
+        self._checkpoint_path = checkpoint_path
+        checkpoint = (
+            None if checkpoint_path is None else load_checkpoint(checkpoint_path)
+        )
+        offset, inode, lines = 0, None, 0
+        if checkpoint is not None:
+            if checkpoint.path != os.path.abspath(path):
+                raise CheckpointError(
+                    f"Checkpoint {checkpoint_path} belongs to {checkpoint.path}"
+                )
+            try:
+                self.summary = Summary(**checkpoint.state)
+            except TypeError as e:
+                raise CheckpointError(
+                    f"Invalid checkpoint {checkpoint_path}: {e}"
+                ) from e
+            offset, inode, lines = checkpoint.offset, checkpoint.inode, checkpoint.lines
+
+        self.follower = FileFollower(path, offset, inode)
+        if self.follower.offset != offset:
+            lines = 0  # Rotated or truncated since the checkpoint
+        self.progress = StreamProgress(lines=lines, byte_offset=self.follower.offset)
+        # Lines of the files read before the current one
+        self._rotated_lines = self.summary.total_lines - lines
+        self._saved = (self.follower.inode, self.follower.offset)
+
+        self.follower.on_idle = self.save
+        if notify_rotation:
+            self.follower.on_rotate = self._rotate_and_notify
+        else:
+            self.follower.on_rotate = self._rotate
+
+    def total_lines(self) -> int:
+        """Number of lines read from all files."""
+        return self._rotated_lines + self.progress.lines
+
+    def lines(self, poll_interval: float) -> Iterator[bytes]:
+        """Follow the file, saving a checkpoint every CHECKPOINT_INTERVAL seconds."""
+        saved_at = time.monotonic()
+        for line in self.follower.lines(poll_interval):
+            yield line
+            # Asked for the next line, so the previous one has been counted
+            if time.monotonic() - saved_at >= CHECKPOINT_INTERVAL:
+                self.save()
+                saved_at = time.monotonic()
+
+    def save(self) -> None:
+        """Save the position and summary, if anything was read since the last time."""
+        position = (self.follower.inode, self.follower.offset)
+        if self._checkpoint_path is None or position == self._saved:
+            return
+        self.summary.total_lines = self.total_lines()
+        save_checkpoint(
+            self._checkpoint_path,
+            Checkpoint(
+                os.path.abspath(self.follower.path),
+                self.follower.inode,
+                self.follower.offset,
+                self.progress.lines,
+                asdict(self.summary),
+            ),
+        )
+        self._saved = position
+
+    def _rotate(self) -> None:
+        self._rotated_lines += self.progress.lines
+        self.progress.lines = self.progress.byte_offset = 0
+
+    def _rotate_and_notify(self) -> None:
+        self._rotate()
+        click.echo(
+            f"{self.follower.path}: file rotated, following the new file", err=True
+        )
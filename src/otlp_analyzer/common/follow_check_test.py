@@ -0,0 +1,167 @@
+"""Tests for follow_check module."""
+
+import gzip
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from otlp_analyzer.common.timestamp_check import Summary
+
+from otlp_analyzer.common.follow import CheckpointError
+from otlp_analyzer.common.follow_check import process_follow
+from otlp_analyzer.tools import check_timestamp
+
+
+class TestProcessFollow:
+    """Test following a growing file."""
+
+    IN_RANGE = '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"}]}]}]}\n'
+    TOO_EARLY = '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1576408200000000000"}]}]}]}\n'
+    START_NS = 1577836800000000000
+    END_NS = 1609459199999000000
+
+    @pytest.fixture(autouse=True)
+    def interrupt_when_idle(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Interrupt following once all lines have been read."""
+
+        def sleep(_seconds: float) -> None:
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(time, "sleep", sleep)
+
+    def follow(
+        self, path: Path, checkpoint_path: Path, quiet: bool = False
+    ) -> tuple[Summary, bool]:
+        """Follow a file in the time range of the test until it is read."""
+        return process_follow(
+            path,
+            self.START_NS,
+            self.END_NS,
+            False,
+            quiet,
+            checkpoint_path=checkpoint_path,
+        )
+
+    def test_resume_from_checkpoint(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that a restart only checks the lines appended since."""
+        path = tmp_path / "logs.jsonl"
+        checkpoint_path = tmp_path / "logs.ckpt"
+        path.write_text(self.IN_RANGE + self.TOO_EARLY)
+
+        summary, has_issues = self.follow(path, checkpoint_path)
+        assert (summary.total_lines, summary.in_range, summary.too_early) == (2, 1, 1)
+        assert has_issues
+        assert "Line 2," in capsys.readouterr().out
+
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(self.IN_RANGE + self.TOO_EARLY)
+        summary, _ = self.follow(path, checkpoint_path)
+
+        assert (summary.total_lines, summary.in_range, summary.too_early) == (4, 2, 2)
+        output = capsys.readouterr().out
+        assert "Line 2," not in output
+        assert "Line 4," in output
+
+    def test_rotated_since_checkpoint(self, tmp_path: Path) -> None:
+        """Test that a file replaced since the checkpoint is read from its start."""
+        path = tmp_path / "logs.jsonl"
+        checkpoint_path = tmp_path / "logs.ckpt"
+        path.write_text(self.IN_RANGE * 3)
+        self.follow(path, checkpoint_path, quiet=True)
+
+        path.rename(tmp_path / "logs.jsonl.1")
+        path.write_text(self.TOO_EARLY)
+        summary, _ = self.follow(path, checkpoint_path, quiet=True)
+
+        assert (summary.total_lines, summary.in_range, summary.too_early) == (4, 3, 1)
+
+    def test_checkpoint_of_other_file(self, tmp_path: Path) -> None:
+        """Test that a checkpoint only resumes the file it was saved for."""
+        checkpoint_path = tmp_path / "logs.ckpt"
+        for name in ("a.jsonl", "b.jsonl"):
+            (tmp_path / name).write_text(self.IN_RANGE)
+        process_follow(
+            tmp_path / "a.jsonl", 0, 1, False, True, checkpoint_path=checkpoint_path
+        )
+
+        with pytest.raises(CheckpointError, match="a.jsonl"):
+            process_follow(
+                tmp_path / "b.jsonl", 0, 1, False, True, checkpoint_path=checkpoint_path
+            )
+
+
+class TestFollowOptions:
+    """Test the follow mode options of otlp-check-timestamp."""
+
+    IN_RANGE = TestProcessFollow.IN_RANGE
+
+    def test_main(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that --follow prints the summary when interrupted."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.IN_RANGE * 2)
+
+        def sleep(_seconds: float) -> None:
+            # Interrupted once all lines have been read
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(time, "sleep", sleep)
+
+        result = CliRunner().invoke(
+            check_timestamp.main,
+            ["--start", "2020-01-01", "--end", "2020-12-31", "-q", "-f", str(path)],
+        )
+
+        assert result.exit_code == 0
+        assert "In range: 2, Out of range: 0, Errors: 0" in result.output
+
+    def test_skew_unavailable(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that --follow says the skew is unavailable instead of leaving it out."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(TestProcessFollow.TOO_EARLY)
+
+        def sleep(_seconds: float) -> None:
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(time, "sleep", sleep)
+
+        result = CliRunner().invoke(
+            check_timestamp.main,
+            ["--start", "2020-01-01", "--end", "2020-12-31", "-f", str(path)],
+        )
+
+        assert result.exit_code == 1
+        assert result.output.endswith(
+            "Skew of out-of-range records: not available with --follow\n"
+        )
+
+    @pytest.mark.parametrize(
+        ("options", "message"),
+        [
+            (["--follow"], "--follow requires exactly one INPUT_FILE"),
+            (["--follow", "-j", "2", "{path}"], "cannot be combined with --jobs"),
+            (["--checkpoint", "x.ckpt", "{path}"], "--checkpoint requires --follow"),
+            (["--follow", "{path}.gz"], "cannot read compressed files"),
+        ],
+    )
+    def test_invalid_options(
+        self, tmp_path: Path, options: list[str], message: str
+    ) -> None:
+        """Test the option combinations that are rejected."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.IN_RANGE)
+        path.with_name("logs.jsonl.gz").write_bytes(gzip.compress(b""))
+
+        result = CliRunner().invoke(
+            check_timestamp.main,
+            ["--start", "2020-01-01", "--end", "2020-12-31"]
+            + [option.format(path=path) for option in options],
+        )
+
+        assert result.exit_code == 2
+        assert message in result.output
@@ -0,0 +1,145 @@
+"""Tests for follow module."""
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from otlp_analyzer.common.follow import (
+    Checkpoint,
+    CheckpointError,
+    FileFollower,
+    load_checkpoint,
+    save_checkpoint,
+)
+
+
+def follow(follower: FileFollower, *actions: Callable[[], object]) -> list[bytes]:
+    """Read lines, running the next action whenever the follower is idle."""
+    pending = list(actions)
+
+    def on_idle() -> None:
+        if pending:
+            pending.pop(0)()
+        else:
+            follower.stop()
+
+    follower.on_idle = on_idle
+    return list(follower.lines(poll_interval=0))
+
+
+def append(path: Path, data: bytes) -> Callable[[], None]:
+    """Action appending data to a file."""
+
+    def run() -> None:
+        with open(path, "ab") as file:
+            file.write(data)
+
+    return run
+
+
+class TestFileFollower:
+    """Test following growing files."""
+
+    def test_appended_lines(self, tmp_path: Path) -> None:
+        """Test reading lines as they are appended."""
+        path = tmp_path / "logs.jsonl"
+        path.write_bytes(b"a\nb\n")
+
+        with FileFollower(path) as follower:
+            lines = follow(follower, append(path, b"c\n"), append(path, b"d\ne\n"))
+
+            assert lines == [b"a\n", b"b\n", b"c\n", b"d\n", b"e\n"]
+            assert follower.offset == 10
+
+    def test_partial_line(self, tmp_path: Path) -> None:
+        """Test that a line is only read once its line ending is written."""
+        path = tmp_path / "logs.jsonl"
+        path.write_bytes(b"a\nb")
+
+        with FileFollower(path) as follower:
+            lines = follow(follower, append(path, b"c"), append(path, b"d\n"))
+
+            assert lines == [b"a\n", b"bcd\n"]
+            assert follower.offset == 6
+
+    def test_resume(self, tmp_path: Path) -> None:
+        """Test starting at an offset of the same file."""
+        path = tmp_path / "logs.jsonl"
+        path.write_bytes(b"a\nb\n")
+        inode = path.stat().st_ino
+
+        with FileFollower(path, offset=2, inode=inode) as follower:
+            assert follow(follower) == [b"b\n"]
+
+    @pytest.mark.parametrize("offset", [10, 2])
+    def test_resume_replaced_file(self, tmp_path: Path, offset: int) -> None:
+        """Test that a truncated or replaced file is read from its start."""
+        path = tmp_path / "logs.jsonl"
+        path.write_bytes(b"a\nb\n")
+        inode = path.stat().st_ino if offset == 10 else -1
+
+        with FileFollower(path, offset=offset, inode=inode) as follower:
+            assert follow(follower) == [b"a\n", b"b\n"]
+
+    def test_rename_rotation(self, tmp_path: Path) -> None:
+        """Test that the rest of a renamed file is read before the new file."""
+        path = tmp_path / "logs.jsonl"
+        path.write_bytes(b"a\n")
+        rotations: list[int] = []
+
+        def rotate() -> None:
+            with open(path, "ab") as file:
+                file.write(b"b\nunterminated")
+            path.rename(tmp_path / "logs.jsonl.1")
+
+        with FileFollower(path) as follower:
+            follower.on_rotate = lambda: rotations.append(follower.offset)
+            lines = follow(
+                follower,
+                rotate,
+                lambda: None,  # The new file does not exist yet
+                append(path, b"c\n"),
+            )
+
+            assert lines == [b"a\n", b"b\n", b"unterminated", b"c\n"]
+            assert rotations == [0]
+            assert follower.offset == 2
+
+    def test_truncation(self, tmp_path: Path) -> None:
+        """Test that a truncated file is read again from its start."""
+        path = tmp_path / "logs.jsonl"
+        path.write_bytes(b"a\nb\n")
+
+        with FileFollower(path) as follower:
+            lines = follow(follower, lambda: path.write_bytes(b"c\n"))
+
+            assert lines == [b"a\n", b"b\n", b"c\n"]
+
+
+class TestCheckpoint:
+    """Test saving and loading checkpoints."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test that a saved checkpoint is loaded unchanged."""
+        checkpoint = Checkpoint("/logs.jsonl", 42, 1000, 10, {"errors": 3})
+        path = tmp_path / "follow.ckpt"
+
+        save_checkpoint(path, checkpoint)
+
+        assert load_checkpoint(path) == checkpoint
+        assert os.listdir(tmp_path) == ["follow.ckpt"]
+
+    def test_missing(self, tmp_path: Path) -> None:
+        """Test that a missing checkpoint means starting afresh."""
+        assert load_checkpoint(tmp_path / "follow.ckpt") is None
+
+    @pytest.mark.parametrize("content", ["", "[]", '{"path": "/logs.jsonl"}'])
+    def test_invalid(self, tmp_path: Path, content: str) -> None:
+        """Test that invalid checkpoints are an error."""
+        path = tmp_path / "follow.ckpt"
+        path.write_text(content)
+
+        with pytest.raises(CheckpointError):
+            load_checkpoint(path)
@@ -0,0 +1,137 @@
+"""Pluggable JSON decoder backends for parsing OTLP JSONL."""
+
+import importlib
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+# Backend names in order of preference for automatic selection
+BACKEND_NAMES = ("msgspec", "orjson", "stdlib")
+
+
+class JSONBackendError(Exception):
+    """Raised when a JSON backend is unknown or not installed."""
+
+
+@dataclass(frozen=True)
+class JSONBackend:
+    """A JSON decoder and the exceptions it raises for invalid input."""
+
+    name: str
+    loads: Callable[[Union[str, bytes]], Any]
+    # Raised for invalid JSON, including invalid UTF-8 in bytes input
+    errors: tuple[type[Exception], ...]
+    # Decodes the timeUnixNano of every log record in one pass, returning
+    # None for lines that have to be parsed generically
+    decode_timestamps: Optional[
+        Callable[[Union[str, bytes]], Optional[list[Optional[int]]]]
+    ] = None
+
+
+def _loads_stdlib(data: Union[str, bytes]) -> Any:
+    # json.loads detects the encoding of bytes in Python; OTLP JSON is UTF-8
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def _load_stdlib() -> JSONBackend:
+    return JSONBackend(
+        name="stdlib",
+        loads=_loads_stdlib,
+        errors=(json.JSONDecodeError, UnicodeDecodeError),
+    )
+
+
+def _load_msgspec() -> JSONBackend:
+    msgspec = importlib.import_module("msgspec")
+    otlp_schema = importlib.import_module("otlp_analyzer.common.otlp_schema")
+    return JSONBackend(
+        name="msgspec",
+        loads=msgspec.json.Decoder().decode,
+        errors=(msgspec.DecodeError, UnicodeDecodeError),
+        decode_timestamps=otlp_schema.decode_time_unix_nanos,
+    )
+
+
+def _load_orjson() -> JSONBackend:
+    orjson = importlib.import_module("orjson")
+    return JSONBackend(
+        name="orjson",
+        loads=orjson.loads,
+        errors=(orjson.JSONDecodeError,),
+    )
+
+
+_LOADERS: dict[str, Callable[[], JSONBackend]] = {
+    "msgspec": _load_msgspec,
+    "orjson": _load_orjson,
+    "stdlib": _load_stdlib,
+}
+
+_loaded: dict[str, JSONBackend] = {}
+# Backend used by the OTLP parser, selected lazily under the key "default"
+_selected: dict[str, JSONBackend] = {}
+
+
+def get_backend(name: Optional[str] = None) -> JSONBackend:
+    """
+    Get a JSON backend by name.
+
+    Args:
+        name: One of BACKEND_NAMES, or None (or "auto") to pick the first
+              installed backend in order of preference
+
+    Returns:
+        The requested JSON backend
+
+    Raises:
+        JSONBackendError: If the backend is unknown or not installed
+    """
+    if name is None or name == "auto":
+        for candidate in BACKEND_NAMES:
+            try:
+                return get_backend(candidate)
+            except JSONBackendError:
+                continue
+
+    if name not in _LOADERS:
+        raise JSONBackendError(f"Unknown JSON backend '{name}'")
+
+    if name not in _loaded:
+        try:
+            _loaded[name] = _LOADERS[name]()
+        except ImportError as e:
+            raise JSONBackendError(f"JSON backend '{name}' is not installed") from e
+    return _loaded[name]
+
+
+def default_backend() -> JSONBackend:
+    """
+    Get the JSON backend used by the OTLP parser.
+
+    Returns:
+        The backend set with set_default_backend, or the preferred
+        installed backend
+    """
+    backend = _selected.get("default")
+    if backend is None:
+        backend = _selected["default"] = get_backend()
+    return backend
+
+
+def set_default_backend(name: Optional[str]) -> JSONBackend:
+    """
+    Select the JSON backend used by the OTLP parser.
+
+    Args:
+        name: One of BACKEND_NAMES, or None (or "auto") for automatic selection
+
+    Returns:
+        The selected JSON backend
+
+    Raises:
+        JSONBackendError: If the backend is unknown or not installed
+    """
+    backend = _selected["default"] = get_backend(name)
+    return backend
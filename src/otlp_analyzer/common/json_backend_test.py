@@ -0,0 +1,100 @@
+"""Tests for json_backend module."""
+
+import importlib.util
+from collections.abc import Iterator
+
+import pytest
+
+from otlp_analyzer.common.json_backend import (
+    BACKEND_NAMES,
+    JSONBackendError,
+    default_backend,
+    get_backend,
+    set_default_backend,
+)
+from otlp_analyzer.common.otlp_parser import OTLPParseError, parse_otlp_line
+
+INSTALLED_BACKENDS = [
+    name
+    for name in BACKEND_NAMES
+    if name == "stdlib" or importlib.util.find_spec(name) is not None
+]
+
+
+@pytest.fixture(name="restore_default")
+def fixture_restore_default() -> Iterator[None]:
+    """Restore the default backend after a test changed it."""
+    previous = default_backend()
+    yield
+    set_default_backend(previous.name)
+
+
+class TestGetBackend:
+    """Test backend lookup."""
+
+    def test_auto_selects_preferred_installed_backend(self) -> None:
+        """Test that automatic selection picks the first installed backend."""
+        assert get_backend().name == INSTALLED_BACKENDS[0]
+        assert get_backend("auto").name == INSTALLED_BACKENDS[0]
+
+    def test_stdlib_always_available(self) -> None:
+        """Test that the stdlib backend is always available."""
+        backend = get_backend("stdlib")
+        assert backend.name == "stdlib"
+
+    def test_unknown_backend(self) -> None:
+        """Test that an unknown backend raises JSONBackendError."""
+        with pytest.raises(JSONBackendError):
+            get_backend("simdjson")
+
+    @pytest.mark.parametrize("name", INSTALLED_BACKENDS)
+    def test_decode(self, name: str) -> None:
+        """Test that every installed backend decodes str and bytes."""
+        backend = get_backend(name)
+        assert backend.loads('{"a": [1, "2"]}') == {"a": [1, "2"]}
+        assert backend.loads(b'{"a": [1, "2"]}') == {"a": [1, "2"]}
+
+    @pytest.mark.parametrize("name", INSTALLED_BACKENDS)
+    def test_decode_error(self, name: str) -> None:
+        """Test that every installed backend raises one of its errors."""
+        backend = get_backend(name)
+        with pytest.raises(backend.errors):
+            backend.loads("{invalid json")
+
+
+@pytest.mark.usefixtures("restore_default")
+class TestDefaultBackend:
+    """Test selecting the backend used by the OTLP parser."""
+
+    def test_set_default_backend(self) -> None:
+        """Test that the selected backend becomes the default."""
+        assert set_default_backend("stdlib").name == "stdlib"
+        assert default_backend().name == "stdlib"
+
+    def test_set_unknown_default_backend(self) -> None:
+        """Test that selecting an unknown backend keeps the previous one."""
+        previous = default_backend()
+        with pytest.raises(JSONBackendError):
+            set_default_backend("simdjson")
+        assert default_backend() is previous
+
+    @pytest.mark.parametrize("name", INSTALLED_BACKENDS)
+    def test_parse_error_semantics(self, name: str) -> None:
+        """Test that invalid JSON raises OTLPParseError with every backend."""
+        set_default_backend(name)
+        with pytest.raises(OTLPParseError, match="Invalid JSON"):
+            parse_otlp_line("{invalid json", 1)
+
+    @pytest.mark.parametrize("name", INSTALLED_BACKENDS)
+    def test_parse_records(self, name: str) -> None:
+        """Test that every backend yields the same log records."""
+        set_default_backend(name)
+        line = (
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":'
+            '[{"timeUnixNano":"1577836800000000000"},{"timeUnixNano":5}]}]}]}'
+        )
+
+        records = parse_otlp_line(line, 3)
+
+        assert [r.time_unix_nano for r in records] == [1577836800000000000, 5]
+        assert records[0].raw_data == {"timeUnixNano": "1577836800000000000"}
@@ -1,34 +1,236 @@
 """Parse OTLP JSON structure and extract log records."""
 
-import json
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from dataclasses import dataclass
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Optional, Union
 
+from otlp_analyzer.common.json_backend import JSONBackend, default_backend
+from otlp_analyzer.common.profiling import StageProfile
 
-@dataclass
+# A line of JSONL, as text or as UTF-8 encoded bytes
+Line = Union[str, bytes]
+
+# Shared read-only raw_data of records that do not keep their decoded data
+NO_RAW_DATA: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(slots=True)
 class LogRecord:
     """Represents a single OTLP log record with its position."""
 
     time_unix_nano: Optional[int]
     line_number: int
     record_index: int
-    raw_data: dict[str, Any]
+    raw_data: Mapping[str, Any]
+    byte_offset: int = 0  # Offset of the record's line in the input
+
+
+@dataclass(slots=True)
+class StreamProgress:
+    """How much of an input stream has been consumed."""
+
+    lines: int = 0
+    byte_offset: int = 0
+
+
+@dataclass(slots=True)
+class LineTimestamps:
+    """The timeUnixNano of every log record of one line."""
+
+    line_number: int
+    byte_offset: int
+    time_unix_nanos: list[Optional[int]]
 
 
 class OTLPParseError(Exception):
     """Raised when OTLP JSON structure cannot be parsed."""
 
 
-def parse_otlp_line(line: str, line_number: int) -> list[LogRecord]:
+def iter_otlp_records(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    stream: Iterable[Line],
+    timestamps_only: bool = False,
+    on_error: Optional[Callable[[int, OTLPParseError], None]] = None,
+    progress: Optional[StreamProgress] = None,
+    keep_raw_data: Optional[Callable[[Optional[int]], bool]] = None,
+    profile: Optional[StageProfile] = None,
+) -> Iterator[LogRecord]:
+    """
+    Lazily yield the log records of all lines of an OTLP JSONL stream.
+
+    Records are produced one at a time, so no list of records is built even
+    for lines holding large batches. Each record carries its line number,
+    its index within the line and the byte offset of the line (assuming
+    UTF-8 and line endings as read from the stream).
+
+    Lines may be str or UTF-8 encoded bytes; bytes are passed to the JSON
+    decoder as they are, without decoding them to str first.
+
+    Args:
+        stream: Lines of JSONL containing OTLP data (e.g. a text or binary file)
+        timestamps_only: Only extract timeUnixNano (see parse_otlp_line)
+        on_error: Called with the line number and error for lines that cannot
+                  be parsed, after which the stream continues. Without it
+                  the error is raised.
+        progress: Updated with the number of lines and bytes read. A line
+                  counts as read before its records are yielded.
+        keep_raw_data: Only keep raw_data for records whose timeUnixNano
+                       satisfies this predicate (see parse_otlp_line)
+        profile: Times decoding the lines as the "decode" stage
+
+    Yields:
+        LogRecord objects in input order
+
+    Raises:
+        OTLPParseError: If a line cannot be parsed and no on_error is given
+    """
+    decode = _line_records if profile is None else profile.wrap("decode", _line_records)
+    for line_number, byte_offset, line in _iter_lines(stream, progress):
+        try:
+            records = decode(
+                line, line_number, byte_offset, timestamps_only, keep_raw_data
+            )
+        except OTLPParseError as e:
+            if on_error is None:
+                raise
+            on_error(line_number, e)
+            continue
+
+        yield from records
+
+
+def iter_otlp_timestamps(
+    stream: Iterable[Line],
+    on_error: Optional[Callable[[int, OTLPParseError], None]] = None,
+    progress: Optional[StreamProgress] = None,
+    profile: Optional[StageProfile] = None,
+) -> Iterator[LineTimestamps]:
+    """
+    Yield the timeUnixNano values of each line of an OTLP JSONL stream.
+
+    Like iter_otlp_records in timestamps-only mode, but without creating a
+    LogRecord per record, for consumers that process whole columns.
+
+    Args:
+        stream: Lines of JSONL containing OTLP data (e.g. a text file)
+        on_error: Called with the line number and error for lines that cannot
+                  be parsed (see iter_otlp_records)
+        progress: Updated with the number of lines and bytes read
+        profile: Times decoding the lines as the "decode" stage
+
+    Yields:
+        LineTimestamps for every line containing log records
+
+    Raises:
+        OTLPParseError: If a line cannot be parsed and no on_error is given
+    """
+    decode = (
+        parse_otlp_timestamps
+        if profile is None
+        else profile.wrap("decode", parse_otlp_timestamps)
+    )
+    for line_number, byte_offset, line in _iter_lines(stream, progress):
+        if not line or line.isspace():
+            continue
+
+        try:
+            timestamps = decode(line)
+        except OTLPParseError as e:
+            if on_error is None:
+                raise
+            on_error(line_number, e)
+            continue
+
+        if timestamps:
+            yield LineTimestamps(line_number, byte_offset, timestamps)
+
+
+def parse_otlp_timestamps(line: Line) -> list[Optional[int]]:
+    """
+    Extract the timeUnixNano of every log record of a line of OTLP JSONL.
+
+    Uses the same fast paths as parse_otlp_line in timestamps-only mode.
+
+    Args:
+        line: A single line of JSONL containing OTLP data (str or UTF-8 bytes)
+
+    Returns:
+        Timestamps in nanoseconds in record order (None for missing or
+        invalid values); empty for blank lines
+
+    Raises:
+        OTLPParseError: If the JSON is invalid or doesn't match expected structure
+    """
+    if not line or line.isspace():
+        return []
+
+    timestamps = _extract_time_unix_nanos(line, default_backend())
+    if timestamps is None:
+        timestamps = [
+            record.time_unix_nano
+            for record in _line_records(line, 0, 0, False, _keep_none)
+        ]
+    return timestamps
+
+
+def _iter_lines(
+    stream: Iterable[Line], progress: Optional[StreamProgress]
+) -> Iterator[tuple[int, int, Line]]:
+    """
+    Yield the lines of a stream with their line numbers and byte offsets.
+
+    Args:
+        stream: Lines of text or bytes
+        progress: Updated with the number of lines and bytes read
+
+    Yields:
+        Tuples of (line number, byte offset, line)
+    """
+    if progress is None:
+        progress = StreamProgress()
+
+    for line in stream:
+        line_number = progress.lines + 1
+        byte_offset = progress.byte_offset
+        progress.lines = line_number
+        progress.byte_offset += (
+            len(line)
+            if isinstance(line, bytes) or line.isascii()
+            else len(line.encode("utf-8"))
+        )
+        yield line_number, byte_offset, line
+
+
+def parse_otlp_line(
+    line: Line,
+    line_number: int,
+    timestamps_only: bool = False,
+    keep_raw_data: Optional[Callable[[Optional[int]], bool]] = None,
+) -> list[LogRecord]:
     """
     Parse a single line of OTLP JSONL and extract all log records.
 
     The OTLP structure is:
     resourceLogs[i].scopeLogs[j].logRecords[k]
 
+    Lines are decoded with the JSON backend selected in ``json_backend``.
+
+    With ``timestamps_only`` only ``timeUnixNano`` is extracted, by the
+    backend's typed decoder (see ``otlp_schema``) if it has one. Lines that
+    cannot be handled this way, and all lines with the stdlib backend, are
+    decoded in full.
+
+    Records without their decoded data (all of them in timestamps-only mode)
+    share the empty read-only ``NO_RAW_DATA`` mapping. ``keep_raw_data``
+    restricts raw_data to the records that are going to be reported; in
+    timestamps-only mode only lines with such records are decoded in full.
+
     Args:
-        line: A single line of JSONL containing OTLP data
+        line: A single line of JSONL containing OTLP data (str or UTF-8 bytes)
         line_number: Line number in the input (for error reporting)
+        timestamps_only: Only extract timeUnixNano, skipping all other fields
+        keep_raw_data: Only keep raw_data for records whose timeUnixNano
+                       satisfies this predicate
 
     Returns:
         List of LogRecord objects extracted from the line
@@ -36,25 +238,92 @@ def parse_otlp_line(line: str, line_number: int) -> list[LogRecord]:
     Raises:
         OTLPParseError: If the JSON is invalid or doesn't match expected structure
     """
-    # Skip empty lines
-    if not line.strip():
-        return []
+    return list(_line_records(line, line_number, 0, timestamps_only, keep_raw_data))
+
+
+def _line_records(
+    line: Line,
+    line_number: int,
+    byte_offset: int,
+    timestamps_only: bool,
+    keep_raw_data: Optional[Callable[[Optional[int]], bool]],
+) -> Iterator[LogRecord]:
+    """
+    Decode a line of OTLP JSONL and return a lazy iterator over its records.
+
+    Decoding happens immediately, so errors are raised by this call and not
+    while iterating.
+
+    Args:
+        line: A single line of JSONL containing OTLP data
+        line_number: Line number in the input (for error reporting)
+        byte_offset: Offset of the line in the input
+        timestamps_only: Only extract timeUnixNano, skipping all other fields
+        keep_raw_data: Only keep raw_data for records whose timeUnixNano
+                       satisfies this predicate
+
+    Returns:
+        Iterator over the LogRecord objects of the line
+
+    Raises:
+        OTLPParseError: If the JSON is invalid or doesn't match expected structure
+    """
+    # Skip empty lines (isspace avoids copying large lines like strip would)
+    if not line or line.isspace():
+        return iter(())
+
+    if keep_raw_data is None:
+        keep_raw_data = _keep_none if timestamps_only else _keep_all
+
+    if timestamps_only:
+        timestamps = _extract_time_unix_nanos(line, default_backend())
+        if timestamps is not None and not any(map(keep_raw_data, timestamps)):
+            return (
+                LogRecord(
+                    time_unix_nano=time_unix_nano,
+                    line_number=line_number,
+                    record_index=record_index,
+                    raw_data=NO_RAW_DATA,
+                    byte_offset=byte_offset,
+                )
+                for record_index, time_unix_nano in enumerate(timestamps)
+            )
 
     # Parse JSON
+    backend = default_backend()
     try:
-        data = json.loads(line)
-    except json.JSONDecodeError as e:
+        data = backend.loads(line)
+    except backend.errors as e:
         raise OTLPParseError(f"Invalid JSON: {e}") from e
 
-    # Extract log records from nested structure
-    log_records: list[LogRecord] = []
-    record_index = 0
-
-    # Navigate: resourceLogs[*].scopeLogs[*].logRecords[*]
     resource_logs = data.get("resourceLogs", [])
     if not isinstance(resource_logs, list):
         raise OTLPParseError("resourceLogs must be a list")
 
+    return _walk_log_records(resource_logs, line_number, byte_offset, keep_raw_data)
+
+
+def _walk_log_records(
+    resource_logs: list[Any],
+    line_number: int,
+    byte_offset: int,
+    keep_raw_data: Callable[[Optional[int]], bool],
+) -> Iterator[LogRecord]:
+    """
+    Extract log records from a decoded resourceLogs list.
+
+    Args:
+        resource_logs: The decoded resourceLogs list of a line
+        line_number: Line number in the input (for error reporting)
+        byte_offset: Offset of the line in the input
+        keep_raw_data: Whether to keep raw_data for a record's timeUnixNano
+
+    Yields:
+        LogRecord objects in document order
+    """
+    record_index = 0
+
+    # Navigate: resourceLogs[*].scopeLogs[*].logRecords[*]
     for resource_log in resource_logs:
         if not isinstance(resource_log, dict):
             continue
@@ -78,17 +347,26 @@ def parse_otlp_line(line: str, line_number: int) -> list[LogRecord]:
                 # Extract timeUnixNano
                 time_unix_nano = _extract_time_unix_nano(log_record_data)
 
-                log_records.append(
-                    LogRecord(
-                        time_unix_nano=time_unix_nano,
-                        line_number=line_number,
-                        record_index=record_index,
-                        raw_data=log_record_data,
-                    )
+                yield LogRecord(
+                    time_unix_nano=time_unix_nano,
+                    line_number=line_number,
+                    record_index=record_index,
+                    raw_data=(
+                        log_record_data
+                        if keep_raw_data(time_unix_nano)
+                        else NO_RAW_DATA
+                    ),
+                    byte_offset=byte_offset,
                 )
                 record_index += 1
 
-    return log_records
+
+def _keep_all(_time_unix_nano: Optional[int]) -> bool:
+    return True
+
+
+def _keep_none(_time_unix_nano: Optional[int]) -> bool:
+    return False
 
 
 def _extract_time_unix_nano(log_record: dict[str, Any]) -> Optional[int]:
@@ -116,3 +394,28 @@ def _extract_time_unix_nano(log_record: dict[str, Any]) -> Optional[int]:
         return None
     except (ValueError, TypeError):
         return None
+
+
+def _extract_time_unix_nanos(
+    line: Line, backend: JSONBackend
+) -> Optional[list[Optional[int]]]:
+    """
+    Extract the timeUnixNano of every log record without a generic decode.
+
+    Args:
+        line: A single non-empty line of JSONL containing OTLP data
+        backend: The JSON backend in use
+
+    Returns:
+        Timestamps in nanoseconds in record order (None for missing or
+        invalid values), or None if the line has to be decoded in full
+
+    Raises:
+        OTLPParseError: If the JSON is invalid
+    """
+    if backend.decode_timestamps is not None:
+        try:
+            return backend.decode_timestamps(line)
+        except backend.errors as e:
+            raise OTLPParseError(f"Invalid JSON: {e}") from e
+    return None
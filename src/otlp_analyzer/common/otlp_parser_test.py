@@ -1,10 +1,23 @@
 """Tests for otlp_parser module."""
 
 import json
+import io
+from collections.abc import Iterator
 
 import pytest
 
-from otlp_analyzer.common.otlp_parser import OTLPParseError, parse_otlp_line
+from otlp_analyzer.common.json_backend import default_backend, set_default_backend
+from otlp_analyzer.common.json_backend_test import INSTALLED_BACKENDS
+from otlp_analyzer.common.otlp_parser import (
+    NO_RAW_DATA,
+    LogRecord,
+    OTLPParseError,
+    StreamProgress,
+    iter_otlp_records,
+    iter_otlp_timestamps,
+    parse_otlp_line,
+    parse_otlp_timestamps,
+)
 
 
 class TestParseOTLPLine:
@@ -213,3 +226,444 @@ class TestParseOTLPLine:
         records = parse_otlp_line(line, 42)
 
         assert records[0].line_number == 42
+
+
+class TestParseOTLPLineTimestampsOnly:
+    """Test the timestamp-only mode with every installed backend."""
+
+    @pytest.fixture(autouse=True, params=INSTALLED_BACKENDS)
+    def backend(self, request: pytest.FixtureRequest) -> Iterator[None]:
+        """Run each test with one of the installed backends."""
+        previous = default_backend()
+        set_default_backend(request.param)
+        yield
+        set_default_backend(previous.name)
+
+    def test_compact_line(self) -> None:
+        """Test a compact line with nested resources and scopes."""
+        line = (
+            '{"resourceLogs":[{"resource":{"attributes":[{"key":"service.name",'
+            '"value":{"stringValue":"svc"}}]},"scopeLogs":[{"scope":{"name":"s"},'
+            '"logRecords":[{"timeUnixNano":"1000000000000000000","body":'
+            '{"stringValue":"a"},"attributes":[{"key":"k","value":{"intValue":"1"}}]},'
+            '{"timeUnixNano":2000000000000000000}]}]},{"scopeLogs":[{"logRecords":'
+            '[{"timeUnixNano":"3000000000000000000"}]}]}]}'
+        )
+
+        records = parse_otlp_line(line, 7, timestamps_only=True)
+
+        assert [r.time_unix_nano for r in records] == [
+            1000000000000000000,
+            2000000000000000000,
+            3000000000000000000,
+        ]
+        assert [r.record_index for r in records] == [0, 1, 2]
+        assert all(r.line_number == 7 for r in records)
+        assert all(r.raw_data == {} for r in records)
+
+    def test_ignores_structure_inside_strings(self) -> None:
+        """Test that escaped JSON inside a body string is not counted."""
+        body = json.dumps({"timeUnixNano": "1", "nested": {"a": [{"b": 1}]}})
+        line = json.dumps(
+            {
+                "resourceLogs": [
+                    {
+                        "scopeLogs": [
+                            {
+                                "logRecords": [
+                                    {
+                                        "timeUnixNano": "1577836800000000000",
+                                        "body": {"stringValue": body},
+                                    }
+                                ]
+                            }
+                        ]
+                    }
+                ]
+            },
+            separators=(",", ":"),
+        )
+
+        records = parse_otlp_line(line, 1, timestamps_only=True)
+
+        assert len(records) == 1
+        assert records[0].time_unix_nano == 1577836800000000000
+
+    def test_bytes(self) -> None:
+        """Test that bytes lines are decoded like str lines."""
+        line = (
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":['
+            '{"timeUnixNano":"1000000000000000000"},{"body":{"stringValue":"\u00e9"}},'
+            '{"timeUnixNano":2}]}]}]}\n'
+        )
+
+        assert parse_otlp_timestamps(line.encode()) == parse_otlp_timestamps(line)
+        assert parse_otlp_timestamps(line) == [1000000000000000000, None, 2]
+
+    def test_record_without_timestamp(self) -> None:
+        """Test that records lacking timeUnixNano are still reported."""
+        line = (
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":['
+            '{"timeUnixNano":"1000000000000000000"},'
+            '{"body":{"stringValue":"no time"}},'
+            '{"timeUnixNano":"2000000000000000000"}'
+            "]}]}]}"
+        )
+
+        records = parse_otlp_line(line, 1, timestamps_only=True)
+
+        assert [r.time_unix_nano for r in records] == [
+            1000000000000000000,
+            None,
+            2000000000000000000,
+        ]
+
+    def test_timestamp_not_first_key(self) -> None:
+        """Test that a timeUnixNano after other keys is found."""
+        line = (
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":['
+            '{"observedTimeUnixNano":"1","timeUnixNano":"2000000000000000000"}'
+            "]}]}]}"
+        )
+
+        records = parse_otlp_line(line, 1, timestamps_only=True)
+
+        assert records[0].time_unix_nano == 2000000000000000000
+
+    def test_empty_objects(self) -> None:
+        """Test that empty objects, also inside strings, are not miscounted."""
+        line = (
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":['
+            '{"timeUnixNano":"1000000000000000000","body":{"stringValue":"[{}]"}},'
+            "{}]}]}]}"
+        )
+
+        records = parse_otlp_line(line, 1, timestamps_only=True)
+
+        assert [r.time_unix_nano for r in records] == [1000000000000000000, None]
+
+    def test_invalid_time_unix_nano(self) -> None:
+        """Test that non-numeric timeUnixNano values yield None."""
+        line = (
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":'
+            '[{"timeUnixNano":"not-a-number"}]}]}]}'
+        )
+
+        records = parse_otlp_line(line, 1, timestamps_only=True)
+
+        assert len(records) == 1
+        assert records[0].time_unix_nano is None
+
+    def test_matches_full_decode_for_spaced_json(self) -> None:
+        """Test that non-compact JSON gives the same records."""
+        line = json.dumps(
+            {
+                "resourceLogs": [
+                    {
+                        "scopeLogs": [
+                            {
+                                "logRecords": [
+                                    {"timeUnixNano": "1000000000000000000"},
+                                    {"body": {"stringValue": "x"}},
+                                ]
+                            }
+                        ]
+                    }
+                ]
+            }
+        )
+
+        records = parse_otlp_line(line, 1, timestamps_only=True)
+
+        assert [r.time_unix_nano for r in records] == [1000000000000000000, None]
+
+    def test_truncated_line(self) -> None:
+        """Test that a truncated line raises OTLPParseError."""
+        line = (
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":'
+            '[{"timeUnixNano":"1000000000000000000","body":{"stringValue":"a'
+        )
+
+        with pytest.raises(OTLPParseError):
+            parse_otlp_line(line, 1, timestamps_only=True)
+
+    def test_resource_logs_not_list(self) -> None:
+        """Test that an invalid structure still raises OTLPParseError."""
+        with pytest.raises(OTLPParseError):
+            parse_otlp_line('{"resourceLogs":"not-a-list"}', 1, timestamps_only=True)
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            # Truncated after the last record
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1"},'
+            '{"timeUnixNano":"2"},{"timeUnixNano":"3"}',
+            # Trailing garbage
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1"},'
+            '{"timeUnixNano":"2"},{"timeUnixNano":"3"}]}]}]}garbage}',
+            # Missing comma and an invalid escape
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1"}'
+            '{"timeUnixNano":"2","body":{"stringValue":"\\q"}}]}]}]}',
+        ],
+    )
+    def test_malformed_line(self, line: str) -> None:
+        """Test that a malformed line is one error and yields no records."""
+        errors: list[tuple[int, OTLPParseError]] = []
+
+        records = list(
+            iter_otlp_records(
+                io.StringIO(line + "\n"),
+                timestamps_only=True,
+                on_error=lambda n, e: errors.append((n, e)),
+            )
+        )
+
+        assert not records
+        assert len(errors) == 1
+        assert str(errors[0][1]).startswith("Invalid JSON")
+        with pytest.raises(OTLPParseError, match="Invalid JSON"):
+            parse_otlp_timestamps(line)
+
+    def test_spaced_resource_and_scope(self) -> None:
+        """Test that resource and scope objects are not taken for records."""
+        line = (
+            '{"resourceLogs":[{"resource": {"attributes":[]},"scopeLogs":'
+            '[{"scope": {"attributes":[]},"logRecords":[{"timeUnixNano":"1"}]}]}]}'
+        )
+
+        records = parse_otlp_line(line, 1, timestamps_only=True)
+
+        assert [r.time_unix_nano for r in records] == [1]
+
+    def test_foreign_objects(self) -> None:
+        """Test that objects outside logRecords with record fields are skipped."""
+        line = (
+            '{"resourceLogs":[{"resource":{"attributes":[],"extra":'
+            '{"timeUnixNano":"5"}},"scopeLogs":[{"logRecords":'
+            '[{"timeUnixNano":"1","meta":{"body":{"timeUnixNano":"6"}}},'
+            '{"body":{"stringValue":"x"}}]}]}]}'
+        )
+
+        records = parse_otlp_line(line, 1, timestamps_only=True)
+
+        assert [r.time_unix_nano for r in records] == [1, None]
+        assert parse_otlp_timestamps(line) == [1, None]
+
+
+class TestIterOTLPRecords:
+    """Test lazy record iteration over a whole stream."""
+
+    LINE = (
+        '{"resourceLogs":[{"scopeLogs":[{"logRecords":'
+        '[{"timeUnixNano":"1"},{"timeUnixNano":"2"}]}]}]}\n'
+    )
+
+    def test_positions(self) -> None:
+        """Test line numbers, record indices and byte offsets across lines."""
+        stream = io.StringIO(self.LINE + "\n" + self.LINE.replace('"2"', '"\u00e9"'))
+
+        records = list(iter_otlp_records(stream))
+
+        assert [(r.line_number, r.record_index) for r in records] == [
+            (1, 0),
+            (1, 1),
+            (3, 0),
+            (3, 1),
+        ]
+        assert [r.byte_offset for r in records] == [0, 0, 95, 95]
+        assert [r.time_unix_nano for r in records] == [1, 2, 1, None]
+
+    def test_progress(self) -> None:
+        """Test that progress counts all lines and bytes read."""
+        stream = io.StringIO(self.LINE + "\u00e9\n" + "\n")
+        progress = StreamProgress()
+
+        list(iter_otlp_records(stream, on_error=lambda *_: None, progress=progress))
+
+        assert progress.lines == 3
+        assert progress.byte_offset == len(self.LINE) + 4
+
+    def test_lazy(self) -> None:
+        """Test that lines are only read when their records are needed."""
+        read: list[int] = []
+
+        def lines() -> Iterator[str]:
+            for number in range(3):
+                read.append(number)
+                yield self.LINE
+
+        records = iter_otlp_records(lines())
+
+        assert next(records).line_number == 1
+        assert read == [0]
+
+    def test_error_callback(self) -> None:
+        """Test that errors are reported and the stream continues."""
+        stream = io.StringIO("{invalid json\n" + self.LINE)
+        errors: list[tuple[int, OTLPParseError]] = []
+
+        records = list(
+            iter_otlp_records(stream, on_error=lambda n, e: errors.append((n, e)))
+        )
+
+        assert len(records) == 2
+        assert records[0].line_number == 2
+        assert [n for n, _ in errors] == [1]
+        assert "Invalid JSON" in str(errors[0][1])
+
+    def test_error_raised(self) -> None:
+        """Test that errors are raised without a callback."""
+        stream = io.StringIO(self.LINE + "{invalid json\n")
+
+        with pytest.raises(OTLPParseError):
+            list(iter_otlp_records(stream))
+
+    @pytest.mark.parametrize("timestamps_only", [False, True])
+    def test_bytes_lines(self, timestamps_only: bool) -> None:
+        """Test that bytes lines give the same records as str lines."""
+        text = self.LINE + "\n" + self.LINE.replace('"2"', '"\u00e9"')
+
+        from_text = list(
+            iter_otlp_records(io.StringIO(text), timestamps_only=timestamps_only)
+        )
+        from_bytes = list(
+            iter_otlp_records(
+                io.BytesIO(text.encode()), timestamps_only=timestamps_only
+            )
+        )
+
+        assert from_bytes == from_text
+
+    @pytest.mark.parametrize("backend", INSTALLED_BACKENDS)
+    def test_invalid_utf8(self, backend: str) -> None:
+        """Test that invalid UTF-8 in bytes lines is an error of that line."""
+        previous = default_backend()
+        set_default_backend(backend)
+        errors: list[int] = []
+        try:
+            records = list(
+                iter_otlp_records(
+                    [b'{"resourceLogs":[{"x":"\xff"}]}\n', self.LINE.encode()],
+                    on_error=lambda n, _: errors.append(n),
+                )
+            )
+        finally:
+            set_default_backend(previous.name)
+
+        assert errors == [1]
+        assert [r.line_number for r in records] == [2, 2]
+
+    def test_timestamps_only(self) -> None:
+        """Test that timestamps-only records do not keep raw data."""
+        records = list(iter_otlp_records(io.StringIO(self.LINE), timestamps_only=True))
+
+        assert [r.time_unix_nano for r in records] == [1, 2]
+        assert all(r.raw_data == {} for r in records)
+
+
+class TestIterOTLPTimestamps:
+    """Test per-line timestamp iteration over a whole stream."""
+
+    LINE = TestIterOTLPRecords.LINE
+
+    @pytest.mark.parametrize("backend", ["stdlib", "auto"])
+    def test_lines(self, backend: str) -> None:
+        """Test that every line with records yields its timestamps."""
+        previous = default_backend()
+        set_default_backend(backend)
+        try:
+            stream = io.StringIO(
+                self.LINE
+                + "\n"
+                + '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{}]}]}]}\n'
+                + '{"resourceLogs":[]}\n'
+            )
+            lines = list(iter_otlp_timestamps(stream))
+        finally:
+            set_default_backend(previous.name)
+
+        assert [(t.line_number, t.byte_offset) for t in lines] == [
+            (1, 0),
+            (3, len(self.LINE) + 1),
+        ]
+        assert [t.time_unix_nanos for t in lines] == [[1, 2], [None]]
+
+    def test_error_callback(self) -> None:
+        """Test that errors are reported and the stream continues."""
+        stream = io.StringIO("{invalid json\n" + self.LINE)
+        errors: list[int] = []
+        progress = StreamProgress()
+
+        lines = list(
+            iter_otlp_timestamps(
+                stream, on_error=lambda n, _: errors.append(n), progress=progress
+            )
+        )
+
+        assert [t.line_number for t in lines] == [2]
+        assert errors == [1]
+        assert progress.lines == 2
+
+    def test_error_raised(self) -> None:
+        """Test that errors are raised without a callback."""
+        with pytest.raises(OTLPParseError):
+            list(iter_otlp_timestamps(io.StringIO('{"resourceLogs":{}}')))
+
+
+class TestRawDataRetention:
+    """Test compact records and selective raw_data retention."""
+
+    LINE = (
+        '{"resourceLogs":[{"scopeLogs":[{"logRecords":['
+        '{"timeUnixNano":"1","body":{"stringValue":"a"}},'
+        '{"timeUnixNano":"5","body":{"stringValue":"b"}},'
+        '{"body":{"stringValue":"c"}}]}]}]}'
+    )
+
+    def test_log_record_is_slotted(self) -> None:
+        """Test that log records do not carry a per-instance __dict__."""
+        record = LogRecord(
+            time_unix_nano=1, line_number=1, record_index=0, raw_data=NO_RAW_DATA
+        )
+
+        assert not hasattr(record, "__dict__")
+
+    def test_keep_all_by_default(self) -> None:
+        """Test that the generic parser keeps raw_data for every record."""
+        records = parse_otlp_line(self.LINE, 1)
+
+        assert [r.raw_data["body"]["stringValue"] for r in records] == ["a", "b", "c"]
+
+    def test_keep_selected(self) -> None:
+        """Test that raw_data is only kept for records matching the predicate."""
+        records = parse_otlp_line(
+            self.LINE, 1, keep_raw_data=lambda t: t is None or t > 2
+        )
+
+        assert records[0].raw_data is NO_RAW_DATA
+        assert records[1].raw_data["body"] == {"stringValue": "b"}
+        assert records[2].raw_data["body"] == {"stringValue": "c"}
+
+    @pytest.mark.parametrize("backend", ["stdlib", "auto"])
+    def test_timestamps_only_keeps_none(self, backend: str) -> None:
+        """Test that timestamps-only records share NO_RAW_DATA."""
+        previous = default_backend()
+        set_default_backend(backend)
+        try:
+            records = parse_otlp_line(self.LINE, 1, timestamps_only=True)
+        finally:
+            set_default_backend(previous.name)
+
+        assert [r.time_unix_nano for r in records] == [1, 5, None]
+        assert all(r.raw_data is NO_RAW_DATA for r in records)
+
+    def test_timestamps_only_keeps_selected(self) -> None:
+        """Test that timestamps-only mode decodes lines with kept records."""
+        records = parse_otlp_line(
+            self.LINE, 1, timestamps_only=True, keep_raw_data=lambda t: t == 5
+        )
+
+        assert [r.time_unix_nano for r in records] == [1, 5, None]
+        assert records[0].raw_data is NO_RAW_DATA
+        assert records[1].raw_data["body"] == {"stringValue": "b"}
+        assert records[2].raw_data is NO_RAW_DATA
@@ -0,0 +1,103 @@
+"""Typed msgspec schema for decoding OTLP logs JSON in a single pass.
+
+Requires the optional msgspec package. The containers are generic over the
+log record type, so each tool declares a record struct with only the fields
+it needs; msgspec skips all other fields without allocating them.
+"""
+
+# pylint: disable=too-few-public-methods
+
+from functools import cache
+from typing import Any, Generic, Optional, TypeVar, Union
+
+import msgspec
+
+RecordT = TypeVar("RecordT")
+
+
+class TimestampLogRecord(msgspec.Struct, rename="camel", gc=False):
+    """Log record reduced to its timeUnixNano field."""
+
+    time_unix_nano: Union[int, str, None] = None
+
+
+class ScopeLogs(msgspec.Struct, Generic[RecordT], rename="camel", gc=False):
+    """Log records produced by one instrumentation scope."""
+
+    log_records: list[RecordT] = []
+
+
+class ResourceLogs(msgspec.Struct, Generic[RecordT], rename="camel", gc=False):
+    """Scope logs produced by one resource."""
+
+    scope_logs: list[ScopeLogs[RecordT]] = []
+
+
+class LogsData(msgspec.Struct, Generic[RecordT], rename="camel", gc=False):
+    """A single line of OTLP logs JSONL."""
+
+    resource_logs: list[ResourceLogs[RecordT]] = []
+
+
+@cache
+def logs_decoder(record_type: type[Any]) -> Any:
+    """
+    Get a JSON decoder for OTLP logs with the given log record struct.
+
+    Args:
+        record_type: msgspec Struct declaring the log record fields to decode
+
+    Returns:
+        A msgspec.json.Decoder producing LogsData[record_type]
+    """
+    return msgspec.json.Decoder(LogsData[record_type])  # type: ignore[valid-type]
+
+
+def decode_time_unix_nanos(line: Union[str, bytes]) -> Optional[list[Optional[int]]]:
+    """
+    Decode a line of OTLP JSONL into the timeUnixNano of each log record.
+
+    The result matches the generic parser for lines that fit the schema.
+    Lines that are valid JSON but deviate from it (e.g. resourceLogs is not
+    a list, timeUnixNano is a float) return None, so the caller can fall
+    back to the lenient generic parser.
+
+    Args:
+        line: A single non-empty line of JSONL containing OTLP data
+
+    Returns:
+        Timestamps in nanoseconds in record order (None for missing or
+        invalid values), or None if the line does not fit the schema
+
+    Raises:
+        msgspec.DecodeError: If the line is not valid JSON
+    """
+    try:
+        data = logs_decoder(TimestampLogRecord).decode(line)
+    except msgspec.ValidationError:
+        return None
+
+    return [
+        _to_time_unix_nano(record.time_unix_nano)
+        for resource_logs in data.resource_logs
+        for scope_logs in resource_logs.scope_logs
+        for record in scope_logs.log_records
+    ]
+
+
+def _to_time_unix_nano(value: Union[int, str, None]) -> Optional[int]:
+    """
+    Convert a decoded timeUnixNano value to nanoseconds.
+
+    Args:
+        value: The decoded field value
+
+    Returns:
+        Timestamp in nanoseconds, or None if missing or not numeric
+    """
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return value
@@ -0,0 +1,118 @@
+"""Tests for otlp_schema module."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("msgspec")
+
+# pylint: disable=wrong-import-position
+import msgspec
+
+from otlp_analyzer.common.json_backend import default_backend, set_default_backend
+from otlp_analyzer.common.otlp_parser import OTLPParseError, parse_otlp_line
+from otlp_analyzer.common.otlp_schema import (
+    LogsData,
+    decode_time_unix_nanos,
+    logs_decoder,
+)
+
+TEST_DATA = Path(__file__).parents[3] / "tests" / "data"
+
+
+class SeverityLogRecord(msgspec.Struct, rename="camel"):
+    """Record type requesting fields other than timeUnixNano."""
+
+    severity_text: str = ""
+
+
+class TestDecodeTimeUnixNanos:
+    """Test typed timestamp decoding."""
+
+    def test_decode_nested(self) -> None:
+        """Test decoding multiple resources, scopes and records."""
+        line = (
+            '{"resourceLogs":[{"resource":{"attributes":[]},"scopeLogs":['
+            '{"logRecords":[{"timeUnixNano":"1"},{"body":{"stringValue":"x"}}]},'
+            '{"logRecords":[{"timeUnixNano":2}]}]},'
+            '{"scopeLogs":[{"logRecords":[{"timeUnixNano":"bad"}]}]}]}'
+        )
+
+        assert decode_time_unix_nanos(line) == [1, None, 2, None]
+
+    def test_decode_bytes(self) -> None:
+        """Test decoding a bytes line."""
+        line = (
+            b'{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"7"}]}]}]}'
+        )
+
+        assert decode_time_unix_nanos(line) == [7]
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            '{"resourceLogs":"not-a-list"}',
+            '{"resourceLogs":[{"scopeLogs":null}]}',
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":[1]}]}]}',
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":1.5}]}]}]}',
+        ],
+    )
+    def test_schema_mismatch(self, line: str) -> None:
+        """Test that lines deviating from the schema return None."""
+        assert decode_time_unix_nanos(line) is None
+
+    def test_invalid_json(self) -> None:
+        """Test that invalid JSON raises msgspec.DecodeError."""
+        with pytest.raises(msgspec.DecodeError):
+            decode_time_unix_nanos("{invalid json")
+
+    def test_custom_record_type(self) -> None:
+        """Test decoding only the fields requested by a record type."""
+        line = (
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":'
+            '[{"timeUnixNano":"1","severityText":"WARN"}]}]}]}'
+        )
+
+        data = logs_decoder(SeverityLogRecord).decode(line)
+
+        assert isinstance(data, LogsData)
+        record = data.resource_logs[0].scope_logs[0].log_records[0]
+        assert record == SeverityLogRecord(severity_text="WARN")
+
+
+class TestParseOTLPLineWithSchema:
+    """Test parse_otlp_line in timestamps-only mode with the msgspec backend."""
+
+    @pytest.fixture(autouse=True)
+    def msgspec_backend(self) -> Iterator[None]:
+        """Use the msgspec backend."""
+        previous = default_backend()
+        set_default_backend("msgspec")
+        yield
+        set_default_backend(previous.name)
+
+    @pytest.mark.parametrize(
+        "path", sorted(TEST_DATA.glob("*.jsonl")), ids=lambda path: path.name
+    )
+    def test_matches_generic_parser(self, path: Path) -> None:
+        """Test that typed decoding yields the same records as the generic one."""
+        for line_number, line in enumerate(path.read_text().splitlines(), start=1):
+            try:
+                expected = parse_otlp_line(line, line_number)
+            except OTLPParseError:
+                with pytest.raises(OTLPParseError):
+                    parse_otlp_line(line, line_number, timestamps_only=True)
+                continue
+
+            records = parse_otlp_line(line, line_number, timestamps_only=True)
+
+            assert [(r.time_unix_nano, r.record_index) for r in records] == [
+                (r.time_unix_nano, r.record_index) for r in expected
+            ]
+            assert all(r.raw_data == {} for r in records)
+
+    def test_schema_mismatch_falls_back(self) -> None:
+        """Test that the generic parser handles lines outside the schema."""
+        with pytest.raises(OTLPParseError, match="must be a list"):
+            parse_otlp_line('{"resourceLogs":"x"}', 1, timestamps_only=True)
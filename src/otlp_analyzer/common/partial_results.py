@@ -0,0 +1,215 @@
+"""Partial check results of sharded runs, saved by workers and merged later.
+
+A worker checking part of the input saves its summary and offenders with
+otlp-check-timestamp --emit-partial; otlp merge-summaries combines any
+number of these files without reading the input again. Merging is
+associative, so partial results can also be merged in stages (e.g. per
+node, then per day) with the same outcome as merging all at once.
+"""
+
+import json
+import os
+import sys
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from otlp_analyzer.common.binary_input import binary_lines
+from otlp_analyzer.common.file_chunks import iter_range_lines
+from otlp_analyzer.common.json_backend import default_backend
+from otlp_analyzer.common.otlp_parser import Line, OTLPParseError
+from otlp_analyzer.common.timestamp_check import (
+    Summary,
+    TimestampChecker,
+    add_summary,
+    to_chunk_report,
+)
+
+# Identifies partial result files, and the version of their layout
+PARTIAL_FORMAT = "otlp-check-timestamp-partial"
+PARTIAL_VERSION = 1
+
+# Offenders kept in a partial result; further ones are only counted, which
+# bounds the size of the files and the memory of merging them
+MAX_OFFENDERS = 100_000
+
+# An offender as reported by check_chunk, with its source (input file, or
+# "-" for stdin) first: (source, line number, record index, timeUnixNano,
+# status, error message), with record index -1 for invalid lines
+Offender = tuple[str, int, int, Optional[int], str, str]
+
+
+class PartialResultError(Exception):
+    """Raised when partial results cannot be read or merged."""
+
+
+@dataclass(slots=True)
+class PartialResult:
+    """The summary and offenders of checking part of the input."""
+
+    start_ns: int
+    end_ns: int
+    summary: Summary = field(default_factory=Summary)
+    offenders: list[Offender] = field(default_factory=list)
+    # Offenders beyond MAX_OFFENDERS, counted but not kept
+    dropped_offenders: int = 0
+
+    def add_offender(self, offender: Offender) -> None:
+        """Keep an offender, or count it if MAX_OFFENDERS are kept already."""
+        if len(self.offenders) < MAX_OFFENDERS:
+            self.offenders.append(offender)
+        else:
+            self.dropped_offenders += 1
+
+    def merge(self, other: "PartialResult") -> None:
+        """
+        Add another partial result of the same time range to this one.
+
+        The offenders of other follow those of this result, up to
+        MAX_OFFENDERS in total.
+
+        Raises:
+            PartialResultError: If the time ranges differ
+        """
+        if (other.start_ns, other.end_ns) != (self.start_ns, self.end_ns):
+            raise PartialResultError(
+                "Cannot merge partial results of different time ranges"
+            )
+        add_summary(self.summary, other.summary)
+        kept = other.offenders[: MAX_OFFENDERS - len(self.offenders)]
+        self.offenders.extend(kept)
+        self.dropped_offenders += (
+            other.dropped_offenders + len(other.offenders) - len(kept)
+        )
+
+
+def merge_partials(partials: Iterable[PartialResult]) -> PartialResult:
+    """
+    Merge partial results in order.
+
+    Args:
+        partials: Partial results of the same time range (at least one)
+
+    Returns:
+        A new partial result holding all of them
+
+    Raises:
+        PartialResultError: If there are no partial results, or their time
+                            ranges differ
+    """
+    merged: Optional[PartialResult] = None
+    for partial in partials:
+        if merged is None:
+            merged = PartialResult(partial.start_ns, partial.end_ns)
+        merged.merge(partial)
+    if merged is None:
+        raise PartialResultError("No partial results to merge")
+    return merged
+
+
+def load_partial(path: Path) -> PartialResult:
+    """
+    Read a partial result file.
+
+    Args:
+        path: Path of a file written by save_partial
+
+    Returns:
+        The partial result
+
+    Raises:
+        PartialResultError: If the file cannot be read or is not a partial result
+    """
+    try:
+        data = default_backend().loads(path.read_bytes())
+        if data.get("format") != PARTIAL_FORMAT:
+            raise ValueError("not a partial result")
+        if data.get("version") != PARTIAL_VERSION:
+            raise ValueError(f"unsupported version {data.get('version')}")
+        return PartialResult(
+            data["start_ns"],
+            data["end_ns"],
+            Summary(**data["summary"]),
+            [tuple(offender) for offender in data["offenders"]],
+            data["dropped_offenders"],
+        )
+    except OSError as e:
+        raise PartialResultError(f"Cannot read {path}: {e.strerror}") from e
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise PartialResultError(f"Invalid partial result {path}: {e}") from e
+
+
+def save_partial(path: Path, partial: PartialResult) -> None:
+    """
+    Write a partial result file.
+
+    Like checkpoints, the file is written to a temporary file that replaces
+    path, so a crashed worker never leaves a partial file behind.
+
+    Args:
+        path: Path of the file
+        partial: The partial result to write
+    """
+    data: dict[str, Any] = {
+        "format": PARTIAL_FORMAT,
+        "version": PARTIAL_VERSION,
+        "start_ns": partial.start_ns,
+        "end_ns": partial.end_ns,
+        "summary": asdict(partial.summary),
+        "offenders": partial.offenders,
+        "dropped_offenders": partial.dropped_offenders,
+    }
+    temporary_path = path.with_name(path.name + ".tmp")
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, separators=(",", ":"))
+    os.replace(temporary_path, path)
+
+
+def process_partial(
+    paths: Sequence[Path], start_ns: int, end_ns: int, partial_path: Path
+) -> tuple[Summary, bool]:
+    """
+    Check stdin or several files and save the result to a partial result file.
+
+    Nothing is printed: the offenders are saved with their source and line
+    numbers counted from the start of each file.
+
+    Args:
+        paths: Paths of the JSONL files (stdin if empty)
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+        partial_path: Path of the partial result file
+
+    Returns:
+        Tuple of (Summary, has_issues) of all input
+    """
+    sources: Iterable[tuple[str, Iterable[Line]]] = (
+        ((str(path), iter_range_lines(path)) for path in paths)
+        if paths
+        else [("-", binary_lines(sys.stdin))]
+    )
+    partial = PartialResult(start_ns, end_ns)
+    checker = TimestampChecker(start_ns, end_ns)
+    for source, stream in sources:
+        _check_source(checker, partial, source, stream)
+
+    save_partial(partial_path, partial)
+    return partial.summary, partial.summary.has_issues()
+
+
+def _check_source(
+    checker: TimestampChecker,
+    partial: PartialResult,
+    source: str,
+    stream: Iterable[Line],
+) -> None:
+    """Check one input, adding its offenders and counts to partial."""
+
+    def add_error(line_number: int, error: OTLPParseError) -> None:
+        partial.add_offender((source, line_number, -1, None, "error", str(error)))
+
+    for result in checker.check_stream(stream, on_error=add_error):
+        partial.add_offender((source, *to_chunk_report(result)))
+    # Also restarts the line numbers for the next input
+    add_summary(partial.summary, checker.result().summary)
@@ -0,0 +1,145 @@
+"""Tests for partial_results module."""
+
+from pathlib import Path
+
+import pytest
+
+from otlp_analyzer.common import partial_results
+from otlp_analyzer.common.partial_results import (
+    Offender,
+    PartialResult,
+    PartialResultError,
+    load_partial,
+    merge_partials,
+    process_partial,
+    save_partial,
+)
+from otlp_analyzer.common.timestamp_check import Summary
+
+DATA = (
+    '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"},{"timeUnixNano":"1576408200000000000"}]}]}]}\n'
+    "{invalid json\n"
+    '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1615819530123000000"}]}]}]}\n'
+)
+START_NS = 1577836800000000000  # 2020-01-01
+END_NS = 1609459199999000000  # 2020-12-31 23:59:59.999
+
+
+def make_partial(source: str, offenders: int) -> PartialResult:
+    """A partial result with the given number of too_late offenders."""
+    return PartialResult(
+        START_NS,
+        END_NS,
+        Summary(offenders, offenders, 0, 0, offenders, 0),
+        [(source, line, 0, END_NS + 1, "too_late", "") for line in range(offenders)],
+    )
+
+
+class TestMerge:
+    """Test merging partial results."""
+
+    def test_merge(self) -> None:
+        """Test that counts add up and offenders keep their order."""
+        merged = merge_partials([make_partial("a", 2), make_partial("b", 1)])
+
+        assert merged.summary == Summary(3, 3, 0, 0, 3, 0)
+        assert [offender[:2] for offender in merged.offenders] == [
+            ("a", 0),
+            ("a", 1),
+            ("b", 0),
+        ]
+
+    def test_associative(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that merging in stages gives the same result, also when capped."""
+        monkeypatch.setattr(partial_results, "MAX_OFFENDERS", 4)
+        parts = [make_partial("a", 3), make_partial("b", 2), make_partial("c", 2)]
+
+        at_once = merge_partials(parts)
+        staged = merge_partials([parts[0], merge_partials(parts[1:])])
+
+        assert at_once == staged
+        assert len(at_once.offenders) == 4
+        assert at_once.dropped_offenders == 3
+        assert at_once.offenders[-1][:2] == ("b", 0)
+
+    def test_inputs_unchanged(self) -> None:
+        """Test that merging does not modify the partial results merged."""
+        part = make_partial("a", 1)
+
+        merge_partials([part, part])
+
+        assert part == make_partial("a", 1)
+
+    def test_different_ranges(self) -> None:
+        """Test that partial results of different time ranges are rejected."""
+        other = PartialResult(START_NS, END_NS + 1)
+
+        with pytest.raises(PartialResultError, match="different time ranges"):
+            merge_partials([make_partial("a", 1), other])
+
+    def test_nothing_to_merge(self) -> None:
+        """Test that merging requires at least one partial result."""
+        with pytest.raises(PartialResultError, match="No partial results"):
+            merge_partials([])
+
+
+class TestFiles:
+    """Test saving and loading partial results."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test that a loaded partial result equals the saved one."""
+        path = tmp_path / "part.json"
+        partial = make_partial("a", 2)
+        partial.add_offender(("a", 5, -1, None, "error", "Invalid JSON"))
+
+        save_partial(path, partial)
+
+        assert load_partial(path) == partial
+        assert not path.with_name("part.json.tmp").exists()
+
+    @pytest.mark.parametrize(
+        "content, message",
+        [
+            ("{", "Invalid partial result"),
+            ('{"format": "other"}', "not a partial result"),
+            (
+                '{"format": "otlp-check-timestamp-partial", "version": 99}',
+                "unsupported version 99",
+            ),
+            ('{"format": "otlp-check-timestamp-partial", "version": 1}', "start_ns"),
+        ],
+    )
+    def test_invalid(self, tmp_path: Path, content: str, message: str) -> None:
+        """Test that other files are rejected."""
+        path = tmp_path / "part.json"
+        path.write_text(content)
+
+        with pytest.raises(PartialResultError, match=message):
+            load_partial(path)
+
+
+class TestProcessPartial:
+    """Test checking input into a partial result file."""
+
+    def test_files(self, tmp_path: Path) -> None:
+        """Test that offenders are saved by file, in input order."""
+        paths = [tmp_path / "a.jsonl", tmp_path / "b.jsonl"]
+        for path in paths:
+            path.write_text(DATA)
+        partial_path = tmp_path / "part.json"
+
+        summary, has_issues = process_partial(paths, START_NS, END_NS, partial_path)
+
+        assert summary == Summary(6, 6, 2, 2, 2, 2)
+        assert has_issues
+        partial = load_partial(partial_path)
+        assert partial.summary == summary
+        expected: list[Offender] = []
+        for path in paths:
+            expected += [
+                (str(path), 1, 1, 1576408200000000000, "too_early", ""),
+                (str(path), 2, -1, None, "error", partial.offenders[1][5]),
+                (str(path), 3, 0, 1615819530123000000, "too_late", ""),
+            ]
+        assert partial.offenders == expected
+        assert "Invalid JSON" in partial.offenders[1][5]
@@ -0,0 +1,183 @@
+"""Timing the stages of a check, and saving cProfile statistics.
+
+A StageProfile splits the time of a check into the stages of STAGES. The
+stages run interleaved, as generators pulling from each other, so time is
+measured whenever the running stage changes: every stage gets the time
+spent in it, excluding the stages it calls. A disabled profile leaves the
+iterators and functions it is given unchanged, so it costs nothing per
+record.
+"""
+
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# Reading lines, decoding JSON, walking the decoded records
+# (or assembling batches), checking timestamps and writing the results
+STAGES = ("read", "decode", "walk", "check", "output")
+
+
+@dataclass(slots=True)
+class StageTime:
+    """Time spent in a stage, in seconds."""
+
+    wall: float = 0.0
+    cpu: float = 0.0
+
+
+class StageProfile:
+    """Wall and CPU time spent in each stage, plus the amount of input read."""
+
+    def __init__(self, enabled: bool = True) -> None:
+        """
+        Start with no time in any stage.
+
+        Args:
+            enabled: Measure the stages; if False, every method leaves what
+                     it is given unchanged
+        """
+        self.enabled = enabled
+        self.times = {stage: StageTime() for stage in STAGES}
+        self.lines = 0
+        self.bytes = 0
+        self._stack: list[str] = []
+        self._wall = 0.0
+        self._cpu = 0.0
+
+    def enter(self, stage: str) -> None:
+        """Start timing a stage, pausing the running one until leave()."""
+        self._switch()
+        self._stack.append(stage)
+
+    def leave(self) -> None:
+        """Stop timing the running stage and resume the one it interrupted."""
+        self._switch()
+        self._stack.pop()
+
+    def _switch(self) -> None:
+        """Add the time since the last switch to the running stage."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        if self._stack:
+            stage_time = self.times[self._stack[-1]]
+            stage_time.wall += wall - self._wall
+            stage_time.cpu += cpu - self._cpu
+        self._wall, self._cpu = wall, cpu
+
+    def iterate(self, stage: str, iterable: Iterable[_T]) -> Iterable[_T]:
+        """
+        Time the production of every item of an iterable as a stage.
+
+        Closing the returned iterator closes the iterator of iterable, so
+        generators still run their cleanup when the consumer stops early.
+
+        Args:
+            stage: One of STAGES
+            iterable: The items
+
+        Returns:
+            The same items (iterable itself if disabled)
+        """
+        if not self.enabled:
+            return iterable
+        return self._iterate(stage, iter(iterable))
+
+    def _iterate(self, stage: str, iterator: Iterator[_T]) -> Iterator[_T]:
+        try:
+            while True:
+                self.enter(stage)
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.leave()
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def wrap(self, stage: str, function: Callable[..., _R]) -> Callable[..., _R]:
+        """
+        Time every call of a function as a stage.
+
+        Args:
+            stage: One of STAGES
+            function: The function to time
+
+        Returns:
+            A function with the same arguments and result (function itself if
+            disabled)
+        """
+        if not self.enabled:
+            return function
+
+        def timed(*args: object, **kwargs: object) -> _R:
+            self.enter(stage)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.leave()
+
+        return timed
+
+
+def format_profile(profile: StageProfile, records: int) -> str:
+    """
+    Format the stage times and throughput of a profile.
+
+    Args:
+        profile: The measured profile
+        records: Number of log records checked
+
+    Returns:
+        Formatted table for output
+    """
+    total_wall = sum(stage_time.wall for stage_time in profile.times.values())
+    total_cpu = sum(stage_time.cpu for stage_time in profile.times.values())
+    lines = [
+        "Profile:",
+        f"  {'stage':<8} {'wall s':>9} {'CPU s':>9} {'share':>7}",
+    ]
+    for stage, stage_time in profile.times.items():
+        share = stage_time.wall / total_wall if total_wall else 0.0
+        lines.append(
+            f"  {stage:<8} {stage_time.wall:>9.3f} {stage_time.cpu:>9.3f} {share:>7.1%}"
+        )
+    lines.append(f"  {'total':<8} {total_wall:>9.3f} {total_cpu:>9.3f}")
+    if total_wall:
+        lines.append(
+            f"  {profile.lines} lines, {records} records, {profile.bytes} bytes: "
+            f"{records / total_wall:,.0f} records/s, "
+            f"{profile.bytes / total_wall / 1e6:,.1f} MB/s"
+        )
+    return "\n".join(lines)
+
+
+def start_cprofile(path: Path) -> Callable[[], None]:
+    """
+    Start profiling all function calls with cProfile.
+
+    Args:
+        path: Where to save the statistics (readable with pstats)
+
+    Returns:
+        Function stopping the profiler and saving the statistics
+    """
+    # Imported here, as it is only needed with --cprofile
+    # pylint: disable-next=import-outside-toplevel
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    def stop() -> None:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+    return stop
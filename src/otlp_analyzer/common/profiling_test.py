@@ -0,0 +1,242 @@
+"""Tests for the stage profile."""
+
+import io
+import itertools
+import pstats
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from otlp_analyzer.common.profiling import (
+    STAGES,
+    StageProfile,
+    format_profile,
+    start_cprofile,
+)
+from otlp_analyzer.common.timestamp_index import build_index
+from otlp_analyzer.tools import check_timestamp
+
+
+class FakeClock:
+    """Replacement for time.perf_counter and time.process_time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """Let time pass."""
+        self.now += seconds
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """A clock used for both wall and CPU time."""
+    clock = FakeClock()
+    monkeypatch.setattr(time, "perf_counter", clock)
+    monkeypatch.setattr(time, "process_time", clock)
+    return clock
+
+
+class TestStageProfile:
+    """Test timing stages."""
+
+    def test_exclusive_times(self, clock: FakeClock) -> None:
+        """Test that a stage excludes the time of the stages it calls."""
+        profile = StageProfile()
+
+        def lines() -> Iterator[str]:
+            for line in ["a", "b"]:
+                clock.advance(1)
+                yield line
+
+        def decode(line: str) -> str:
+            clock.advance(2)
+            return line.upper()
+
+        decode = profile.wrap("decode", decode)
+        records = []
+        for line in profile.iterate("read", lines()):
+            clock.advance(4)
+            records.append(decode(line))
+        clock.advance(8)
+
+        assert records == ["A", "B"]
+        assert profile.times["read"].wall == 2
+        assert profile.times["decode"].cpu == 4
+        # Time outside of all stages is not counted
+        assert profile.times["walk"].wall == 0
+
+    def test_nested_iterators(self, clock: FakeClock) -> None:
+        """Test stages pulling items from each other."""
+        profile = StageProfile()
+
+        def read() -> Iterator[int]:
+            for number in range(3):
+                clock.advance(1)
+                yield number
+
+        def walk() -> Iterator[int]:
+            for number in profile.iterate("read", read()):
+                clock.advance(10)
+                yield number
+
+        assert list(profile.iterate("walk", walk())) == [0, 1, 2]
+        assert profile.times["read"].wall == 3
+        assert profile.times["walk"].wall == 30
+
+    def test_disabled(self) -> None:
+        """Test that a disabled profile leaves iterables and functions unchanged."""
+        profile = StageProfile(enabled=False)
+        items = [1, 2]
+
+        assert profile.iterate("read", items) is items
+        assert profile.wrap("decode", len) is len
+
+    def test_close(self) -> None:
+        """Test that closing the timed iterator closes the iterator it wraps."""
+        closed = []
+
+        def items() -> Iterator[int]:
+            try:
+                yield from range(10)
+            finally:
+                closed.append(True)
+
+        iterator = iter(StageProfile().iterate("walk", items()))
+        assert next(iterator) == 0
+        iterator.close()  # type: ignore[attr-defined]
+
+        assert closed == [True]
+
+    def test_error(self, clock: FakeClock) -> None:
+        """Test that a stage ends when its function raises."""
+        profile = StageProfile()
+
+        def fail() -> None:
+            clock.advance(1)
+            raise ValueError("invalid")
+
+        with pytest.raises(ValueError):
+            profile.wrap("decode", fail)()
+        clock.advance(5)
+
+        assert profile.times["decode"].wall == 1
+
+
+def test_format_profile(clock: FakeClock) -> None:
+    """Test the table of stage times and the throughput."""
+    profile = StageProfile()
+    profile.enter("read")
+    clock.advance(1)
+    profile.leave()
+    profile.enter("output")
+    clock.advance(3)
+    profile.leave()
+    profile.lines = 10
+    profile.bytes = 8_000_000
+
+    formatted = format_profile(profile, 40)
+
+    assert "  read         1.000     1.000   25.0%" in formatted
+    assert "  output       3.000     3.000   75.0%" in formatted
+    assert "  total        4.000     4.000" in formatted
+    assert "10 lines, 40 records, 8000000 bytes: 10 records/s, 2.0 MB/s" in formatted
+
+
+def test_start_cprofile(tmp_path: Path) -> None:
+    """Test saving cProfile statistics."""
+    path = tmp_path / "check.prof"
+
+    stop = start_cprofile(path)
+    sorted(range(100))
+    stop()
+
+    assert pstats.Stats(str(path)).total_calls > 0  # type: ignore[attr-defined]
+
+
+class TestProfileOptions:
+    """Test the --profile and --cprofile options of otlp-check-timestamp."""
+
+    INPUT_DATA = (
+        '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1576408200000000000"}]}]}]}\n'
+        * 3
+    )
+
+    def test_profile(self, tmp_path: Path) -> None:
+        """Test that the stage times go to stderr, leaving the output unchanged."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        build_index(path)
+        # Without the index, the skew of the out-of-range records is known too
+        arguments = ["--start", "2020-01-01", "--end", "2020-12-31", "--no-skew"]
+        arguments.append(str(path))
+
+        profiled = CliRunner().invoke(check_timestamp.main, ["--profile"] + arguments)
+        plain = CliRunner().invoke(check_timestamp.main, arguments)
+
+        assert profiled.exit_code == 1
+        assert profiled.stdout == plain.stdout
+        assert "Profile:" in profiled.stderr
+        # The index is ignored so that every line is read and decoded
+        assert f"3 lines, 3 records, {len(self.INPUT_DATA)} bytes" in profiled.stderr
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_stages(self, monkeypatch: pytest.MonkeyPatch, columnar: bool) -> None:
+        """Test that every stage is timed, with records checked in either way."""
+        if columnar:
+            pytest.importorskip("numpy")
+        ticks = itertools.count()
+        monkeypatch.setattr(time, "perf_counter", lambda: next(ticks))
+        profile = StageProfile()
+
+        check_timestamp.process_stream(
+            io.StringIO(self.INPUT_DATA),
+            1577836800000000000,
+            1609459199000000000,
+            False,
+            False,
+            columnar=columnar,
+            profile=profile,
+        )
+
+        for stage in STAGES:
+            assert profile.times[stage].wall > 0, stage
+        assert profile.lines == 3
+
+    def test_invalid_options(self, tmp_path: Path) -> None:
+        """Test that only sequential checks of a single range are profiled."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+
+        result = CliRunner().invoke(
+            check_timestamp.main,
+            ["--window", "a=2020-01-01..2020-12-31", "--profile", str(path)],
+        )
+
+        assert result.exit_code == 2
+        assert "--profile cannot be combined" in result.output
+
+    def test_cprofile(self, tmp_path: Path) -> None:
+        """Test that the statistics are saved although the check exits with 1."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        stats_path = tmp_path / "check.prof"
+
+        result = CliRunner().invoke(
+            check_timestamp.main,
+            ["--start", "2020-01-01", "--end", "2020-12-31", "-q"]
+            + ["--cprofile", str(stats_path), str(path)],
+        )
+
+        assert result.exit_code == 1
+        stats = pstats.Stats(str(stats_path))
+        assert any(
+            function == "process_stream"
+            for _, _, function in stats.stats  # type: ignore[attr-defined]
+        )
@@ -0,0 +1,248 @@
+"""Columnar batches of OTLP log record timestamps backed by NumPy arrays.
+
+Requires the optional numpy package. Batches hold the timestamps of many log
+records at once, so range checks run as a handful of vectorized comparisons
+instead of one Python call per record.
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from otlp_analyzer.common.otlp_parser import (
+    NO_RAW_DATA,
+    Line,
+    LogRecord,
+    OTLPParseError,
+    StreamProgress,
+    iter_otlp_timestamps,
+)
+from otlp_analyzer.common.profiling import StageProfile
+
+# Status codes of classify_batch, indexing STATUS_NAMES
+IN_RANGE = 0
+TOO_EARLY = 1
+TOO_LATE = 2
+ERROR = 3
+STATUS_NAMES = ("in_range", "too_early", "too_late", "error")
+
+DEFAULT_BATCH_SIZE = 65536
+
+
+@dataclass(slots=True)
+class RecordBatch:
+    """Timestamps and positions of consecutive log records."""
+
+    # int64, or object for timestamps beyond the int64 range; 0 where missing
+    time_unix_nano: Any
+    # True where timeUnixNano is missing or invalid
+    missing: Any
+    line_numbers: Any
+    record_indices: Any
+    byte_offsets: Any
+
+    def __len__(self) -> int:
+        return len(self.time_unix_nano)
+
+    def record(self, index: int) -> LogRecord:
+        """
+        Get a single log record of the batch.
+
+        Args:
+            index: Position of the record in the batch
+
+        Returns:
+            LogRecord without raw data
+        """
+        return LogRecord(
+            time_unix_nano=(
+                None if self.missing[index] else int(self.time_unix_nano[index])
+            ),
+            line_number=int(self.line_numbers[index]),
+            record_index=int(self.record_indices[index]),
+            raw_data=NO_RAW_DATA,
+            byte_offset=int(self.byte_offsets[index]),
+        )
+
+
+@dataclass(slots=True)
+class BatchClassification:
+    """Range check results of a RecordBatch."""
+
+    # int8 status code of each record
+    status: Any
+    in_range: int
+    too_early: int
+    too_late: int
+    errors: int
+
+    def indices(self, include_in_range: bool = False) -> Any:
+        """
+        Get the positions of the records to report.
+
+        Args:
+            include_in_range: Whether to include in-range records
+
+        Returns:
+            Array of record positions in batch order
+        """
+        if include_in_range:
+            return np.arange(len(self.status))
+        return np.flatnonzero(self.status != IN_RANGE)
+
+
+def classify_batch(
+    batch: RecordBatch, start_ns: int, end_ns: int
+) -> BatchClassification:
+    """
+    Check which records of a batch fall within a time range.
+
+    Uses the same rules as check_timestamp_range: both ends are inclusive and
+    records without a valid timestamp are errors.
+
+    Args:
+        batch: The records to check
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+
+    Returns:
+        Status of every record and the count per status
+    """
+    times = batch.time_unix_nano
+    status = np.zeros(len(batch), dtype=np.int8)
+    status[times < start_ns] = TOO_EARLY
+    status[times > end_ns] = TOO_LATE
+    status[batch.missing] = ERROR
+
+    counts = np.bincount(status, minlength=len(STATUS_NAMES))
+    return BatchClassification(
+        status=status,
+        in_range=int(counts[IN_RANGE]),
+        too_early=int(counts[TOO_EARLY]),
+        too_late=int(counts[TOO_LATE]),
+        errors=int(counts[ERROR]),
+    )
+
+
+def iter_record_batches(
+    stream: Iterable[Line],
+    batch_size: Optional[int] = None,
+    on_error: Optional[Callable[[int, OTLPParseError], None]] = None,
+    progress: Optional[StreamProgress] = None,
+    profile: Optional[StageProfile] = None,
+) -> Iterator[RecordBatch]:
+    """
+    Read the log record timestamps of an OTLP JSONL stream in batches.
+
+    Batches end at line boundaries, so a batch may exceed batch_size by the
+    records of its last line. Errors are reported in stream order: the
+    records preceding an invalid line are yielded before on_error is called.
+
+    Args:
+        stream: Lines of JSONL containing OTLP data (e.g. a text file)
+        batch_size: Number of records after which a batch is yielded
+                    (default: DEFAULT_BATCH_SIZE)
+        on_error: Called with the line number and error for lines that cannot
+                  be parsed (see iter_otlp_records)
+        progress: Updated with the number of lines and bytes read
+        profile: Times decoding the lines as the "decode" stage
+
+    Yields:
+        RecordBatch for every batch_size records
+
+    Raises:
+        OTLPParseError: If a line cannot be parsed and no on_error is given
+    """
+    if batch_size is None:
+        batch_size = DEFAULT_BATCH_SIZE
+    pending_errors: list[tuple[int, OTLPParseError]] = []
+    collect_error = None if on_error is None else _append_to(pending_errors)
+    builder = _BatchBuilder()
+
+    for line in iter_otlp_timestamps(
+        stream, on_error=collect_error, progress=progress, profile=profile
+    ):
+        if pending_errors:
+            yield from _flush_with_errors(builder, pending_errors, on_error)
+        builder.add(line.line_number, line.byte_offset, line.time_unix_nanos)
+        if builder.size >= batch_size:
+            yield builder.build()
+
+    yield from _flush_with_errors(builder, pending_errors, on_error)
+
+
+def _append_to(
+    errors: list[tuple[int, OTLPParseError]],
+) -> Callable[[int, OTLPParseError], None]:
+    def append(line_number: int, error: OTLPParseError) -> None:
+        errors.append((line_number, error))
+
+    return append
+
+
+def _flush_with_errors(
+    builder: "_BatchBuilder",
+    pending_errors: list[tuple[int, OTLPParseError]],
+    on_error: Optional[Callable[[int, OTLPParseError], None]],
+) -> Iterator[RecordBatch]:
+    """Yield the pending records, then report the errors that followed them."""
+    if builder.size:
+        yield builder.build()
+    if on_error is not None:
+        for line_number, error in pending_errors:
+            on_error(line_number, error)
+    pending_errors.clear()
+
+
+class _BatchBuilder:
+    """Collects the timestamps of consecutive lines into a RecordBatch."""
+
+    def __init__(self) -> None:
+        self.size = 0
+        self._times: list[Optional[int]] = []
+        self._line_numbers: list[int] = []
+        self._byte_offsets: list[int] = []
+        self._counts: list[int] = []
+
+    def _reset(self) -> None:
+        self.size = 0
+        self._times = []
+        self._line_numbers = []
+        self._byte_offsets = []
+        self._counts = []
+
+    def add(
+        self, line_number: int, byte_offset: int, times: list[Optional[int]]
+    ) -> None:
+        self._times.extend(times)
+        self._line_numbers.append(line_number)
+        self._byte_offsets.append(byte_offset)
+        self._counts.append(len(times))
+        self.size += len(times)
+
+    def build(self) -> RecordBatch:
+        times = self._times
+        missing = np.fromiter(
+            (time is None for time in times), dtype=np.bool_, count=len(times)
+        )
+        values = [0 if time is None else time for time in times]
+        try:
+            time_unix_nano = np.array(values, dtype=np.int64)
+        except OverflowError:
+            # Python ints compare exactly, at the cost of speed
+            time_unix_nano = np.array(values, dtype=object)
+
+        counts = np.array(self._counts, dtype=np.int64)
+        # Index within the line: position minus the start of the line
+        line_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        batch = RecordBatch(
+            time_unix_nano=time_unix_nano,
+            missing=missing,
+            line_numbers=np.repeat(np.array(self._line_numbers, np.int64), counts),
+            record_indices=np.arange(len(times), dtype=np.int64) - line_starts,
+            byte_offsets=np.repeat(np.array(self._byte_offsets, np.int64), counts),
+        )
+        self._reset()
+        return batch
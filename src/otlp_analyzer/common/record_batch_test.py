@@ -0,0 +1,143 @@
+"""Tests for record_batch module."""
+
+import io
+
+import pytest
+
+pytest.importorskip("numpy")
+
+# pylint: disable=wrong-import-position
+from otlp_analyzer.common.otlp_parser import OTLPParseError, StreamProgress
+from otlp_analyzer.common.record_batch import (
+    ERROR,
+    IN_RANGE,
+    TOO_EARLY,
+    TOO_LATE,
+    RecordBatch,
+    classify_batch,
+    iter_record_batches,
+)
+
+
+def make_line(*timestamps: str) -> str:
+    records = ",".join(
+        "{}" if timestamp == "" else f'{{"timeUnixNano":{timestamp}}}'
+        for timestamp in timestamps
+    )
+    return f'{{"resourceLogs":[{{"scopeLogs":[{{"logRecords":[{records}]}}]}}]}}\n'
+
+
+def read_batches(text: str, batch_size: int = 1024) -> list[RecordBatch]:
+    return list(iter_record_batches(io.StringIO(text), batch_size=batch_size))
+
+
+class TestIterRecordBatches:
+    """Test reading timestamps into columnar batches."""
+
+    def test_columns(self) -> None:
+        """Test timestamps, missing mask and record positions."""
+        first = make_line('"10"', "", "30")
+        text = first + "\n" + make_line('"bad"')
+
+        (batch,) = read_batches(text)
+
+        assert batch.time_unix_nano.tolist() == [10, 0, 30, 0]
+        assert batch.missing.tolist() == [False, True, False, True]
+        assert batch.line_numbers.tolist() == [1, 1, 1, 3]
+        assert batch.record_indices.tolist() == [0, 1, 2, 0]
+        assert batch.byte_offsets.tolist() == [
+            0,
+            0,
+            0,
+            len(first) + 1,
+        ]
+
+    def test_record(self) -> None:
+        """Test materializing a single log record."""
+        (batch,) = read_batches(make_line('"10"', "") + make_line("20"))
+
+        assert batch.record(1).time_unix_nano is None
+        record = batch.record(2)
+        assert (record.line_number, record.record_index) == (2, 0)
+        assert record.time_unix_nano == 20
+        assert record.raw_data == {}
+
+    def test_batch_size(self) -> None:
+        """Test that batches end at line boundaries after batch_size records."""
+        text = make_line("1", "2") + make_line("3", "4") + make_line("5")
+
+        batches = read_batches(text, batch_size=3)
+
+        assert [len(batch) for batch in batches] == [4, 1]
+        assert batches[1].line_numbers.tolist() == [3]
+
+    def test_errors_in_stream_order(self) -> None:
+        """Test that records before an invalid line are yielded first."""
+        events: list[object] = []
+        text = make_line("1") + "{invalid json\n" + make_line("2")
+
+        for batch in iter_record_batches(
+            io.StringIO(text), on_error=lambda n, _: events.append(n)
+        ):
+            events.append(batch.line_numbers.tolist())
+
+        assert events == [[1], 2, [3]]
+
+    def test_error_raised(self) -> None:
+        """Test that errors are raised without a callback."""
+        with pytest.raises(OTLPParseError):
+            read_batches(make_line("1") + "{invalid json\n")
+
+    def test_progress(self) -> None:
+        """Test that progress counts all lines read."""
+        progress = StreamProgress()
+        text = make_line("1") + "\n" + "{invalid json\n"
+
+        list(
+            iter_record_batches(
+                io.StringIO(text), on_error=lambda *_: None, progress=progress
+            )
+        )
+
+        assert progress.lines == 3
+
+    def test_beyond_int64(self) -> None:
+        """Test that timestamps beyond the int64 range are kept exactly."""
+        (batch,) = read_batches(make_line('"99999999999999999999"', "1"))
+
+        assert batch.record(0).time_unix_nano == 99999999999999999999
+
+
+class TestClassifyBatch:
+    """Test vectorized range checks."""
+
+    def test_classify(self) -> None:
+        """Test status codes and counts including inclusive bounds."""
+        (batch,) = read_batches(make_line("9", "10", "15", "20", "21", ""))
+
+        result = classify_batch(batch, 10, 20)
+
+        assert result.status.tolist() == [
+            TOO_EARLY,
+            IN_RANGE,
+            IN_RANGE,
+            IN_RANGE,
+            TOO_LATE,
+            ERROR,
+        ]
+        assert (result.in_range, result.too_early, result.too_late, result.errors) == (
+            3,
+            1,
+            1,
+            1,
+        )
+        assert result.indices().tolist() == [0, 4, 5]
+        assert result.indices(include_in_range=True).tolist() == list(range(6))
+
+    def test_classify_beyond_int64(self) -> None:
+        """Test range checks on timestamps beyond the int64 range."""
+        (batch,) = read_batches(make_line('"99999999999999999999"', "15", ""))
+
+        result = classify_batch(batch, 10, 20)
+
+        assert result.status.tolist() == [TOO_LATE, IN_RANGE, ERROR]
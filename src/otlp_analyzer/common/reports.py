@@ -0,0 +1,538 @@
+"""Formatting and printing check results and summaries, within report limits."""
+
+import contextlib
+import json
+from collections.abc import Callable, Generator, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, TypeVar
+
+import click
+
+from otlp_analyzer.common.otlp_parser import NO_RAW_DATA, LogRecord, OTLPParseError
+from otlp_analyzer.common.timestamp_check import CheckResult, ChunkReport, Summary
+from otlp_analyzer.common.utils import format_difference, format_timestamp
+
+if TYPE_CHECKING:
+    from otlp_analyzer.common.time_windows import WindowSet
+
+_T = TypeVar("_T")
+
+# Characters of output collected before writing them to stdout
+OUTPUT_BUFFER_SIZE = 256 * 1024
+
+# Output formats of reported records: readable text, or one line per record
+# in NDJSON or CSV for other programs
+REPORT_FORMATS = ("text", "ndjson", "csv")
+
+# First line of CSV output, naming the fields of format_result_csv
+CSV_HEADER = "line,record,timeUnixNano,status,delta_ns,error"
+
+
+class ReportLimitReached(Exception):
+    """Raised by ReportLimits.check to stop checking early."""
+
+
+@dataclass(slots=True)
+class ReportLimits:
+    """
+    How many results to print, and when to stop checking altogether.
+
+    Every result or invalid line about to be reported is passed to count(),
+    followed by check() once it has been printed, which raises
+    ReportLimitReached when the caller should stop reading its input.
+    """
+
+    max_reports: Optional[int] = None  # Print at most this many results
+    fail_after: Optional[int] = None  # Stop after this many issues
+    reported: int = 0
+    suppressed: int = 0  # Results not printed because of max_reports
+    issues: int = 0  # Records out of range or with errors, and invalid lines
+    stopped: bool = False
+
+    def count(self, issue: bool) -> bool:
+        """
+        Count a result to report.
+
+        Args:
+            issue: Whether the result is out of range or an error
+
+        Returns:
+            Whether to print the result, i.e. max_reports is not reached yet
+        """
+        if issue:
+            self.issues += 1
+        if self.max_reports is not None and self.reported >= self.max_reports:
+            self.suppressed += 1
+            return False
+        self.reported += 1
+        return True
+
+    def check(self) -> None:
+        """
+        Stop checking if fail_after issues have been counted.
+
+        Raises:
+            ReportLimitReached: If checking should stop
+        """
+        if self.fail_after is not None and self.issues >= self.fail_after:
+            self.stopped = True
+            raise ReportLimitReached(f"Stopped after {self.issues} issue(s)")
+
+
+class ReportWriter:
+    """
+    Collects lines of output and writes them to stdout in large chunks.
+
+    click.echo writes and flushes stdout on every call, which dominates the
+    time spent on many reports when stdout is a file or pipe. Lines written
+    here are echoed together once OUTPUT_BUFFER_SIZE characters have been
+    collected, or when flush() is called.
+    """
+
+    def __init__(
+        self, report_format: str = "text", buffer_size: int = OUTPUT_BUFFER_SIZE
+    ) -> None:
+        """
+        Start with an empty buffer.
+
+        Args:
+            report_format: Format of the reports written, one of REPORT_FORMATS
+            buffer_size: Characters to collect before writing them
+        """
+        self.report_format = report_format
+        self.buffer_size = buffer_size
+        self._lines: list[str] = []
+        self._size = 0
+
+    def write(self, line: str) -> None:
+        """
+        Write a line of output, like click.echo.
+
+        Args:
+            line: The text to write, without its line ending
+        """
+        self._lines.append(line)
+        self._size += len(line) + 1
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the collected lines to stdout."""
+        if self._lines:
+            text = "\n".join(self._lines)
+            self._lines.clear()
+            self._size = 0
+            click.echo(text)
+
+
+def report_mode(
+    verbose: bool, quiet: bool, limits: Optional[ReportLimits] = None
+) -> str:
+    """Get the report argument of iter_check_results for the output options."""
+    if quiet:
+        # Issues must still be seen to stop at them
+        return "none" if limits is None or limits.fail_after is None else "offenders"
+    return "all" if verbose else "offenders"
+
+
+def format_result(result: CheckResult, start_ns: int, end_ns: int) -> str:
+    """
+    Format a check result as a human-readable string.
+
+    Args:
+        result: The check result to format
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+
+    Returns:
+        Formatted string for output
+    """
+    lines = []
+    record = result.record
+
+    # Header line
+    if result.status == "in_range":
+        header = f"Line {record.line_number}, Record {record.record_index}: IN RANGE"
+        lines.append(header)
+    elif result.status == "too_early":
+        header = (
+            f"Line {record.line_number}, Record {record.record_index}: "
+            f"OUT OF RANGE (too early)"
+        )
+        lines.append(header)
+        if record.time_unix_nano is not None:
+            lines.append(
+                f"  timeUnixNano:    {format_timestamp(record.time_unix_nano)} "
+                f"({record.time_unix_nano})"
+            )
+            lines.append(
+                f"  expected range:  {format_timestamp(start_ns)} - "
+                f"{format_timestamp(end_ns)}"
+            )
+            difference = start_ns - record.time_unix_nano
+            lines.append(
+                f"  difference:      {format_difference(difference, 'before start')}"
+            )
+    elif result.status == "too_late":
+        header = (
+            f"Line {record.line_number}, Record {record.record_index}: "
+            f"OUT OF RANGE (too late)"
+        )
+        lines.append(header)
+        if record.time_unix_nano is not None:
+            lines.append(
+                f"  timeUnixNano:    {format_timestamp(record.time_unix_nano)} "
+                f"({record.time_unix_nano})"
+            )
+            lines.append(
+                f"  expected range:  {format_timestamp(start_ns)} - "
+                f"{format_timestamp(end_ns)}"
+            )
+            difference = record.time_unix_nano - end_ns
+            lines.append(
+                f"  difference:      {format_difference(difference, 'after end')}"
+            )
+    elif result.status == "error":
+        header = (
+            f"Line {record.line_number}, Record {record.record_index}: "
+            f"ERROR - {result.error_message}"
+        )
+        lines.append(header)
+
+    return "\n".join(lines)
+
+
+def format_result_ndjson(result: CheckResult, start_ns: int, end_ns: int) -> str:
+    """
+    Format a check result as a compact JSON object.
+
+    The object has the fields line, record, timeUnixNano, status
+    ("in_range", "too_early", "too_late" or "error") and delta_ns, the signed
+    distance to the range in nanoseconds (negative before start, positive
+    after end, 0 in range). Errors have null timeUnixNano and delta_ns, and
+    their message in an additional error field.
+
+    Args:
+        result: The check result to format
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+
+    Returns:
+        Formatted line for output
+    """
+    record = result.record
+    prefix = f'{{"line":{record.line_number},"record":{record.record_index}'
+    if result.status == "error" or record.time_unix_nano is None:
+        return (
+            f'{prefix},"timeUnixNano":null,"status":"error","delta_ns":null,'
+            f'"error":{json.dumps(result.error_message)}}}'
+        )
+    delta_ns = _delta_ns(record.time_unix_nano, result.status, start_ns, end_ns)
+    return (
+        f'{prefix},"timeUnixNano":{record.time_unix_nano},'
+        f'"status":"{result.status}","delta_ns":{delta_ns}}}'
+    )
+
+
+def format_result_csv(result: CheckResult, start_ns: int, end_ns: int) -> str:
+    """
+    Format a check result as a CSV row with the fields of CSV_HEADER.
+
+    The fields are those of format_result_ndjson, left empty where that has
+    null.
+
+    Args:
+        result: The check result to format
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+
+    Returns:
+        Formatted line for output
+    """
+    record = result.record
+    prefix = f"{record.line_number},{record.record_index}"
+    if result.status == "error" or record.time_unix_nano is None:
+        return f"{prefix},,error,,{_csv_quote(result.error_message)}"
+    delta_ns = _delta_ns(record.time_unix_nano, result.status, start_ns, end_ns)
+    return f"{prefix},{record.time_unix_nano},{result.status},{delta_ns},"
+
+
+def _delta_ns(time_unix_nano: int, status: str, start_ns: int, end_ns: int) -> int:
+    if status == "too_early":
+        return time_unix_nano - start_ns
+    if status == "too_late":
+        return time_unix_nano - end_ns
+    return 0
+
+
+def _csv_quote(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _format_text_result(result: CheckResult, start_ns: int, end_ns: int) -> str:
+    # Records are followed by a blank line
+    return format_result(result, start_ns, end_ns) + "\n"
+
+
+# Formats a result for output in each of REPORT_FORMATS
+RESULT_FORMATTERS: dict[str, Callable[[CheckResult, int, int], str]] = {
+    "text": _format_text_result,
+    "ndjson": format_result_ndjson,
+    "csv": format_result_csv,
+}
+
+
+def format_summary(summary: Summary) -> str:
+    """
+    Format the summary of all checks.
+
+    Args:
+        summary: Summary data structure
+
+    Returns:
+        Formatted summary string
+    """
+    lines = [
+        "---",
+        "Summary:",
+        f"  Total lines processed: {summary.total_lines}",
+        f"  Total log records: {summary.total_records}",
+        f"  In range: {summary.in_range}",
+        f"  Out of range (too early): {summary.too_early}",
+        f"  Out of range (too late): {summary.too_late}",
+        f"  Errors: {summary.errors}",
+    ]
+    return "\n".join(lines)
+
+
+def format_window_summaries(
+    summaries: Sequence[Summary], window_set: "WindowSet"
+) -> str:
+    """
+    Format the summaries of several time windows.
+
+    Args:
+        summaries: One Summary per window
+        window_set: The windows, in the order of summaries
+
+    Returns:
+        Formatted summary string
+    """
+    lines = [
+        "---",
+        "Summary:",
+        f"  Total lines processed: {summaries[0].total_lines}",
+        f"  Total log records: {summaries[0].total_records}",
+        f"  Errors: {summaries[0].errors}",
+    ]
+    for window, summary in zip(window_set.windows, summaries):
+        lines += [
+            f"  Window {window.name} ({format_timestamp(window.start_ns)} - "
+            f"{format_timestamp(window.end_ns)}):",
+            f"    In range: {summary.in_range}",
+            f"    Out of range (too early): {summary.too_early}",
+            f"    Out of range (too late): {summary.too_late}",
+        ]
+    return "\n".join(lines)
+
+
+def format_chunk_report(
+    report: ChunkReport,
+    line_offset: int,
+    start_ns: int,
+    end_ns: int,
+    report_format: str = "text",
+) -> str:
+    """
+    Format a result of check_chunk like the results of print_results.
+
+    Args:
+        report: The result to format
+        line_offset: Number of lines preceding the chunk
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+        report_format: One of REPORT_FORMATS
+
+    Returns:
+        Formatted string for output, ending with a blank line for records in
+        the text format
+    """
+    line_number, record_index, time_unix_nano, status, error_message = report
+    line_number += line_offset
+    if record_index < 0:
+        return format_error(line_number, error_message, report_format)
+
+    record = LogRecord(time_unix_nano, line_number, record_index, NO_RAW_DATA)
+    result = CheckResult(record, status, error_message)
+    return RESULT_FORMATTERS[report_format](result, start_ns, end_ns)
+
+
+def print_reports(  # pylint: disable=too-many-arguments
+    reports: Generator[_T, None, None],
+    format_report: Callable[[_T], str],
+    is_issue: Callable[[_T], bool],
+    quiet: bool,
+    limits: Optional[ReportLimits] = None,
+    *,
+    output: Optional[ReportWriter] = None,
+) -> None:
+    """
+    Print reports within the limits.
+
+    If the limits stop checking, reports is closed, so that the generator
+    stops reading its input and completes its counts. The output is flushed
+    before returning, also when an exception is raised.
+
+    Args:
+        reports: The results (or other reports) to print
+        format_report: Formats a report for output, including the blank line
+                       that follows records
+        is_issue: Whether a report is out of range or an error
+        quiet: Only count the reports for the limits, without printing them
+        limits: Limits on the reports printed and when to stop (default: none)
+        output: Where to write the reports; pass the writer of error_printer
+                to keep invalid lines in order (default: a new writer)
+    """
+    if limits is None:
+        limits = ReportLimits()
+    if output is None:
+        output = ReportWriter()
+    with contextlib.closing(reports):
+        try:
+            for report in reports:
+                if limits.count(is_issue(report)) and not quiet:
+                    output.write(format_report(report))
+                limits.check()
+        except ReportLimitReached:
+            pass
+        finally:
+            output.flush()
+
+
+def print_results(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    results: Generator[CheckResult, None, None],
+    start_ns: int,
+    end_ns: int,
+    quiet: bool,
+    limits: Optional[ReportLimits] = None,
+    *,
+    output: Optional[ReportWriter] = None,
+) -> None:
+    """Print check results in the format of the output (see print_reports)."""
+    if output is None:
+        output = ReportWriter()
+    formatter = RESULT_FORMATTERS[output.report_format]
+    print_reports(
+        results,
+        lambda result: formatter(result, start_ns, end_ns),
+        lambda result: result.status != "in_range",
+        quiet,
+        limits,
+        output=output,
+    )
+
+
+def format_error(line_number: int, message: str, report_format: str = "text") -> str:
+    """
+    Format the error of an invalid line.
+
+    In the NDJSON and CSV formats, invalid lines are errors without a record
+    index (see format_result_ndjson).
+
+    Args:
+        line_number: Number of the invalid line
+        message: The error message
+        report_format: One of REPORT_FORMATS
+
+    Returns:
+        Formatted string for output
+    """
+    if report_format == "ndjson":
+        return (
+            f'{{"line":{line_number},"record":null,"timeUnixNano":null,'
+            f'"status":"error","delta_ns":null,"error":{json.dumps(message)}}}'
+        )
+    if report_format == "csv":
+        return f"{line_number},,,error,,{_csv_quote(message)}"
+    return f"Line {line_number}: ERROR - {message}"
+
+
+def error_printer(
+    quiet: bool, limits: Optional[ReportLimits], output: ReportWriter
+) -> Optional[Callable[[int, OTLPParseError], None]]:
+    """
+    Get the on_error callback printing invalid lines within the limits.
+
+    Args:
+        quiet: Only count invalid lines for the limits, without printing them
+        limits: Limits on the reports printed and when to stop
+        output: Where to write the errors, in its format, shared with
+                print_reports so that they appear between the results of the
+                surrounding lines
+
+    Returns:
+        The callback, or None if invalid lines need neither printing nor
+        counting
+    """
+    if quiet and (limits is None or limits.fail_after is None):
+        return None
+
+    def print_limited_error(line_number: int, error: OTLPParseError) -> None:
+        if limits is None:
+            output.write(format_error(line_number, str(error), output.report_format))
+            return
+        if limits.count(True) and not quiet:
+            output.write(format_error(line_number, str(error), output.report_format))
+        limits.check()
+
+    return print_limited_error
+
+
+def print_summary(summary: Summary, quiet: bool, err: bool = False) -> None:
+    """Print the summary counts, on a single line if quiet."""
+    if quiet:
+        click.echo(
+            f"In range: {summary.in_range}, Out of range: "
+            f"{summary.too_early + summary.too_late}, Errors: {summary.errors}",
+            err=err,
+        )
+    else:
+        click.echo(format_summary(summary), err=err)
+
+
+def print_limit_notes(
+    limits: ReportLimits,
+    quiet: bool,
+    err: bool = False,
+    summary: Optional[Summary] = None,
+) -> None:
+    """
+    Tell what --max-reports left out and where --fail-fast stopped.
+
+    Checks stop only once the line, batch or --jobs chunk holding the
+    stopping issue has been counted, so the summary can count more issues
+    than were reported. The --fail-fast note says how many.
+
+    Args:
+        limits: The limits of the check
+        quiet: Whether the results were left out anyway
+        err: Print the --max-reports note on stderr, like the summary
+        summary: The summary printed after the notes (default: unknown, as
+                 for several windows)
+    """
+    if limits.suppressed and not quiet:
+        click.echo(f"... {limits.suppressed} more not shown (--max-reports)", err=err)
+    if not limits.stopped:
+        return
+    note = f"Stopped after {limits.issues} issue(s) (--fail-fast)"
+    if summary is None:
+        note += "; the summary covers all input read until then"
+    else:
+        lines = summary.total_lines
+        unreported = (
+            summary.too_early + summary.too_late + summary.errors - limits.issues
+        )
+        note += f"; the summary covers the {lines} line(s) read until then"
+        if unreported > 0:
+            note += f", with {unreported} more issue(s) from the same batch or chunk"
+    click.echo(note, err=True)
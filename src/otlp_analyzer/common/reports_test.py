@@ -0,0 +1,176 @@
+"""Tests for reports module."""
+
+import csv
+import json
+from collections.abc import Generator
+
+import pytest
+
+from otlp_analyzer.common.otlp_parser import LogRecord, OTLPParseError
+from otlp_analyzer.common.reports import (
+    CSV_HEADER,
+    ReportLimitReached,
+    ReportLimits,
+    ReportWriter,
+    error_printer,
+    format_error,
+    format_result_csv,
+    format_result_ndjson,
+    print_limit_notes,
+    print_reports,
+)
+from otlp_analyzer.common.timestamp_check import CheckResult, Summary
+
+
+class TestReportLimits:
+    """Test limiting reports and stopping early."""
+
+    def test_max_reports(self) -> None:
+        """Test that results beyond max_reports are counted but not printed."""
+        limits = ReportLimits(max_reports=2)
+
+        printed = [limits.count(issue) for issue in (True, False, True, True)]
+
+        assert printed == [True, True, False, False]
+        assert (limits.reported, limits.suppressed, limits.issues) == (2, 2, 3)
+        limits.check()  # Never stops without fail_after
+
+    def test_fail_after(self) -> None:
+        """Test that checking stops once enough issues were counted."""
+        limits = ReportLimits(fail_after=2)
+
+        for issue in (True, False):
+            limits.count(issue)
+            limits.check()
+        limits.count(True)
+
+        with pytest.raises(ReportLimitReached):
+            limits.check()
+        assert limits.stopped
+
+    def test_print_reports_closes(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that reports stop being read once the limits stop checking."""
+        read: list[int] = []
+
+        def reports() -> Generator[int, None, None]:
+            try:
+                for report in range(10):
+                    read.append(report)
+                    yield report
+            finally:
+                read.append(-1)
+
+        limits = ReportLimits(max_reports=1, fail_after=3)
+        print_reports(reports(), str, lambda report: report % 2 == 1, False, limits)
+
+        assert read == [0, 1, 2, 3, 4, 5, -1]
+        assert capsys.readouterr().out == "0\n"
+        assert (limits.suppressed, limits.stopped) == (5, True)
+
+    def test_limit_notes(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that the --fail-fast note agrees with the summary."""
+        limits = ReportLimits(max_reports=0, fail_after=1, suppressed=1, issues=1)
+        limits.stopped = True
+        summary = Summary(total_lines=44, total_records=44, in_range=33, too_early=11)
+
+        print_limit_notes(limits, False, True, summary)
+
+        assert capsys.readouterr().err == (
+            "... 1 more not shown (--max-reports)\n"
+            "Stopped after 1 issue(s) (--fail-fast); the summary covers the 44 "
+            "line(s) read until then, with 10 more issue(s) from the same batch or "
+            "chunk\n"
+        )
+
+
+class TestReportWriter:
+    """Test buffering output."""
+
+    def test_buffer(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that lines are written once the buffer is full, or on flush."""
+        writer = ReportWriter(buffer_size=8)
+
+        writer.write("abc")
+        assert capsys.readouterr().out == ""
+        writer.write("def")
+        assert capsys.readouterr().out == "abc\ndef\n"
+        writer.write("")
+        writer.flush()
+        writer.flush()
+        assert capsys.readouterr().out == "\n"
+
+    def test_errors_in_order(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that errors and reports sharing a writer keep their order."""
+        output = ReportWriter()
+        on_error = error_printer(False, None, output)
+        assert on_error is not None
+
+        def reports() -> Generator[int, None, None]:
+            yield 1
+            on_error(2, OTLPParseError("Invalid JSON"))
+            yield 3
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            print_reports(reports(), str, bool, False, output=output)
+
+        # Flushed despite the interruption
+        assert capsys.readouterr().out == "1\nLine 2: ERROR - Invalid JSON\n3\n"
+
+    def test_quiet(self) -> None:
+        """Test that invalid lines are only handled when they count for limits."""
+        output = ReportWriter()
+
+        assert error_printer(True, None, output) is None
+        assert error_printer(True, ReportLimits(max_reports=1), output) is None
+        assert error_printer(True, ReportLimits(fail_after=1), output) is not None
+
+
+class TestMachineFormats:
+    """Test the NDJSON and CSV formats."""
+
+    START_NS = 1577836800000000000
+    END_NS = 1609459199999000000
+    RESULTS = [
+        CheckResult(LogRecord(1576408200000000000, 1, 0, {}), "too_early"),
+        CheckResult(LogRecord(1592224245000000000, 1, 1, {}), "in_range"),
+        CheckResult(LogRecord(1615819530123000000, 2, 0, {}), "too_late"),
+        CheckResult(LogRecord(None, 3, 0, {}), "error", 'Missing "timeUnixNano"'),
+    ]
+    EXPECTED: list[list[object]] = [
+        [1, 0, 1576408200000000000, "too_early", -1428600000000000, None],
+        [1, 1, 1592224245000000000, "in_range", 0, None],
+        [2, 0, 1615819530123000000, "too_late", 6360330124000000, None],
+        [3, 0, None, "error", None, 'Missing "timeUnixNano"'],
+        [4, None, None, "error", None, "Invalid JSON"],
+    ]
+
+    def test_ndjson(self) -> None:
+        """Test the fields of results and invalid lines."""
+        lines = [
+            format_result_ndjson(result, self.START_NS, self.END_NS)
+            for result in self.RESULTS
+        ] + [format_error(4, "Invalid JSON", "ndjson")]
+
+        fields = CSV_HEADER.split(",")
+        assert [json.loads(line) for line in lines] == [
+            {
+                name: value
+                for name, value in zip(fields, expected)
+                if name != "error" or value is not None
+            }
+            for expected in self.EXPECTED
+        ]
+
+    def test_csv(self) -> None:
+        """Test that rows read back with the csv module, with quoted messages."""
+        lines = [
+            format_result_csv(result, self.START_NS, self.END_NS)
+            for result in self.RESULTS
+        ] + [format_error(4, "Invalid JSON", "csv")]
+
+        rows = list(csv.reader([CSV_HEADER, *lines]))
+        assert rows[1:] == [
+            ["" if value is None else str(value) for value in expected]
+            for expected in self.EXPECTED
+        ]
@@ -0,0 +1,259 @@
+"""Checking a JSONL file with its sidecar timestamp extract or index."""
+
+import importlib.util
+import mmap
+from collections.abc import Callable, Generator
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Optional
+
+from otlp_analyzer.common.otlp_parser import OTLPParseError, parse_otlp_line
+from otlp_analyzer.common.reports import (
+    ReportLimits,
+    ReportWriter,
+    error_printer,
+    print_results,
+    report_mode,
+)
+from otlp_analyzer.common.timestamp_check import (
+    CheckResult,
+    Summary,
+    check_timestamp_range,
+    iter_indexed_results,
+)
+
+if TYPE_CHECKING:
+    from otlp_analyzer.common.skew_histogram import SkewHistogram
+    from otlp_analyzer.common.timestamp_extract import TimestampExtract
+    from otlp_analyzer.common.timestamp_index import TimestampIndex
+
+
+def process_with_sidecar(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    path: Path,
+    start_ns: int,
+    end_ns: int,
+    verbose: bool,
+    quiet: bool,
+    limits: Optional[ReportLimits],
+    report_format: str,
+    skew: Optional["SkewHistogram"] = None,
+) -> Optional[tuple[Summary, bool]]:
+    """Check a file with its extract or index, or return None if it has none."""
+    extract = _open_extract(path)
+    if extract is not None:
+        with extract:
+            return process_extracted_file(
+                path,
+                extract,
+                start_ns,
+                end_ns,
+                verbose,
+                quiet,
+                report_format=report_format,
+                limits=limits,
+                skew=skew,
+            )
+
+    # pylint: disable-next=import-outside-toplevel
+    from otlp_analyzer.common.timestamp_index import open_index
+
+    index = open_index(path)
+    if index is not None:
+        with index:
+            return process_indexed_file(
+                path,
+                index,
+                start_ns,
+                end_ns,
+                verbose,
+                quiet,
+                report_format=report_format,
+                limits=limits,
+                skew=skew,
+            )
+    return None
+
+
+def _open_extract(path: Path) -> Optional["TimestampExtract"]:
+    """Open the up-to-date extract of a file, if NumPy is installed."""
+    # Importing NumPy takes longer than checking a small file, so look for
+    # the extract (see timestamp_extract.extract_path_for) first
+    if not path.with_name(path.name + ".tscol").is_file():
+        return None
+    if importlib.util.find_spec("numpy") is None:
+        return None
+    # pylint: disable-next=import-outside-toplevel
+    from otlp_analyzer.common.timestamp_extract import open_extract
+
+    return open_extract(path)
+
+
+def process_extracted_file(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    path: Path,
+    extract: "TimestampExtract",
+    start_ns: int,
+    end_ns: int,
+    verbose: bool,
+    quiet: bool,
+    *,
+    limits: Optional[ReportLimits] = None,
+    report_format: str = "text",
+    skew: Optional["SkewHistogram"] = None,
+) -> tuple[Summary, bool]:
+    """
+    Check the timestamps of a JSONL file with its sorted timestamp extract.
+
+    The counts are found by binary search in the extract. Reported records
+    come from the extract as well; the file is only read to report invalid
+    lines, which are decoded again for their error message.
+
+    Args:
+        path: Path of the JSONL file
+        extract: Up-to-date extract of the file (see
+                 timestamp_extract.open_extract)
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+        verbose: Show all records (including in-range)
+        quiet: Only show summary
+        limits: Limits on the results printed (see reports.ReportLimits); the
+                summary is complete even if they stop checking early
+        report_format: Output format of the results (see reports.REPORT_FORMATS)
+        skew: Updated with the distance of every out-of-range record to the
+              range (see skew_histogram)
+
+    Returns:
+        Tuple of (Summary, has_issues)
+    """
+    in_range, too_early, too_late = extract.count(start_ns, end_ns)
+    summary = Summary(
+        total_lines=extract.lines,
+        total_records=extract.records + extract.missing,
+        in_range=in_range,
+        too_early=too_early,
+        too_late=too_late,
+        errors=extract.missing + extract.invalid,
+    )
+    if skew is not None:
+        extract.add_skew(skew, start_ns, end_ns)
+
+    report = report_mode(verbose, quiet, limits)
+    if report != "none":
+        output = ReportWriter(report_format)
+        with open(path, "rb") as file:
+            results = _iter_extract_results(
+                file,
+                extract,
+                start_ns,
+                end_ns,
+                report == "all",
+                error_printer(quiet, limits, output),
+            )
+            print_results(results, start_ns, end_ns, quiet, limits, output=output)
+
+    return summary, summary.has_issues()
+
+
+def _iter_extract_results(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    file: BinaryIO,
+    extract: "TimestampExtract",
+    start_ns: int,
+    end_ns: int,
+    include_in_range: bool,
+    on_error: Optional[Callable[[int, OTLPParseError], None]],
+) -> Generator[CheckResult, None, None]:
+    """Yield the results to report, passing invalid lines to on_error in line order."""
+    if on_error is None:
+        yield from (
+            check_timestamp_range(record, start_ns, end_ns)
+            for record in extract.iter_records(start_ns, end_ns, include_in_range)
+        )
+        return
+
+    invalid_lines = extract.iter_invalid_lines()
+    pending = next(invalid_lines, None)
+    for record in extract.iter_records(start_ns, end_ns, include_in_range):
+        while pending is not None and pending[0] < record.line_number:
+            _decode_invalid_line(file, on_error, *pending)
+            pending = next(invalid_lines, None)
+        yield check_timestamp_range(record, start_ns, end_ns)
+
+    while pending is not None:
+        _decode_invalid_line(file, on_error, *pending)
+        pending = next(invalid_lines, None)
+
+
+def _decode_invalid_line(
+    file: BinaryIO,
+    on_error: Callable[[int, OTLPParseError], None],
+    line_number: int,
+    offset: int,
+    length: int,
+) -> None:
+    """Decode an invalid line again to pass its error to on_error."""
+    file.seek(offset)
+    try:
+        parse_otlp_line(file.read(length), line_number, timestamps_only=True)
+    except OTLPParseError as e:
+        on_error(line_number, e)
+
+
+def process_indexed_file(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    path: Path,
+    index: "TimestampIndex",
+    start_ns: int,
+    end_ns: int,
+    verbose: bool,
+    quiet: bool,
+    *,
+    limits: Optional[ReportLimits] = None,
+    report_format: str = "text",
+    skew: Optional["SkewHistogram"] = None,
+) -> tuple[Summary, bool]:
+    """
+    Check the timestamps of a JSONL file with the help of its index.
+
+    Lines whose timestamps all fall on the same side of (or inside) the time
+    range are counted from their index entry. Only lines that straddle a
+    boundary, or that have records to report or to add to skew, are read and
+    decoded.
+
+    Args:
+        path: Path of the JSONL file
+        index: Up-to-date index of the file (see timestamp_index.open_index)
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+        verbose: Show all records (including in-range)
+        quiet: Only show summary
+        limits: Limits on the results printed and when to stop reading (see
+                reports.ReportLimits)
+        report_format: Output format of the results (see reports.REPORT_FORMATS)
+        skew: Updated with the distance of every out-of-range record to the
+              range (see skew_histogram)
+
+    Returns:
+        Tuple of (Summary, has_issues)
+    """
+    summary = Summary()
+    output = ReportWriter(report_format)
+    with open(path, "rb") as file:
+        try:
+            source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            source = None
+        results = iter_indexed_results(
+            source,
+            index,
+            start_ns,
+            end_ns,
+            summary,
+            report=report_mode(verbose, quiet, limits),
+            on_error=error_printer(quiet, limits, output),
+            skew=skew,
+        )
+        try:
+            print_results(results, start_ns, end_ns, quiet, limits, output=output)
+        finally:
+            if source is not None:
+                source.close()
+
+    return summary, summary.has_issues()
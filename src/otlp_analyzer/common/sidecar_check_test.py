@@ -0,0 +1,60 @@
+"""Tests for sidecar_check module."""
+
+from pathlib import Path
+
+import pytest
+
+from otlp_analyzer.common.sidecar_check import process_with_sidecar
+from otlp_analyzer.common.timestamp_check import Summary
+from otlp_analyzer.common.timestamp_index import build_index
+
+
+class TestProcessWithSidecar:
+    """Test choosing the sidecar of a file."""
+
+    INPUT_DATA = (
+        '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"},{"timeUnixNano":"1576408200000000000"}]}]}]}\n'
+        "{invalid json\n"
+    )
+    START_NS = 1577836800000000000  # 2020-01-01
+    END_NS = 1609459199999000000  # 2020-12-31 23:59:59.999
+
+    def test_no_sidecar(self, tmp_path: Path) -> None:
+        """Test that files without a sidecar are left to the caller."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+
+        result = process_with_sidecar(
+            path, self.START_NS, self.END_NS, False, True, None, "text"
+        )
+
+        assert result is None
+
+    def test_index(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test checking a file with its index."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        build_index(path)
+
+        result = process_with_sidecar(
+            path, self.START_NS, self.END_NS, False, False, None, "text"
+        )
+
+        assert result == (Summary(2, 2, 1, 1, 0, 1), True)
+        assert "Line 1, Record 1: OUT OF RANGE (too early)" in capsys.readouterr().out
+
+    def test_extract(self, tmp_path: Path) -> None:
+        """Test checking a file with its extract."""
+        pytest.importorskip("numpy")
+        # pylint: disable-next=import-outside-toplevel
+        from otlp_analyzer.common.timestamp_extract import build_extract
+
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        build_extract(path)
+
+        result = process_with_sidecar(
+            path, self.START_NS, self.END_NS, False, True, None, "text"
+        )
+
+        assert result == (Summary(2, 2, 1, 1, 0, 1), True)
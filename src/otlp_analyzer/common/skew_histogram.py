@@ -0,0 +1,231 @@
+"""Fixed-memory histograms of how far out-of-range records lie outside the range.
+
+Distances are counted in log-linear buckets, as in HdrHistogram: values below
+32 ns have a bucket each, and every larger power of two is split into 16
+buckets of equal width. A bucket thus spans at most 1/16 (6.25%) of its
+values, BUCKETS counters cover every distance between 64-bit timestamps (the
+top bucket also counts all larger values), and adding a value takes a few
+integer operations however many were added before.
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+# Every power of two is split into 2**SUB_BUCKET_BITS buckets
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Bits of the largest distance: between any two uint64 or int64 timestamps
+MAX_VALUE_BITS = 65
+BUCKETS = (MAX_VALUE_BITS - SUB_BUCKET_BITS + 1) * SUB_BUCKETS
+TOP_BUCKET = BUCKETS - 1
+
+# Percentiles shown by format_skew, and the width of its bars
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+CHART_WIDTH = 40
+
+_DURATION_UNITS = (
+    (86400 * 10**9, "d"),
+    (3600 * 10**9, "h"),
+    (60 * 10**9, "m"),
+    (10**9, "s"),
+    (10**6, "ms"),
+    (10**3, "us"),
+)
+
+
+def bucket_index(value: int) -> int:
+    """Get the bucket counting a non-negative value."""
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return value
+    return min((shift << SUB_BUCKET_BITS) + (value >> shift), TOP_BUCKET)
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """Get the lowest and highest value counted by a bucket."""
+    if index < 2 * SUB_BUCKETS:
+        return index, index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    top = index - (shift << SUB_BUCKET_BITS)
+    return top << shift, ((top + 1) << shift) - 1
+
+
+class LogHistogram:
+    """Counts of non-negative values in log-linear buckets (see module docstring)."""
+
+    __slots__ = ("counts", "total", "min_value", "max_value")
+
+    def __init__(self) -> None:
+        self.counts = [0] * BUCKETS
+        self.total = 0
+        self.min_value = 0  # Exact extremes, valid if total > 0
+        self.max_value = 0
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LogHistogram):
+            return NotImplemented
+        return (self.counts, self.total, self.min_value, self.max_value) == (
+            other.counts,
+            other.total,
+            other.min_value,
+            other.max_value,
+        )
+
+    def add(self, value: int) -> None:
+        """Count a value."""
+        # bucket_index, inlined as this runs for every out-of-range record
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        self.counts[
+            (
+                value
+                if shift <= 0
+                else min((shift << SUB_BUCKET_BITS) + (value >> shift), TOP_BUCKET)
+            )
+        ] += 1
+        if not self.total or value < self.min_value:
+            self.min_value = value
+        self.max_value = max(self.max_value, value)
+        self.total += 1
+
+    def add_many(self, values: Iterable[int]) -> None:
+        """Count several values, e.g. those of a batch of records."""
+        values = list(values)
+        if not values:
+            return
+        counts = self.counts
+        for value in values:
+            shift = value.bit_length() - SUB_BUCKET_BITS - 1
+            counts[
+                (
+                    value
+                    if shift <= 0
+                    else min((shift << SUB_BUCKET_BITS) + (value >> shift), TOP_BUCKET)
+                )
+            ] += 1
+        lowest = min(values)
+        if not self.total or lowest < self.min_value:
+            self.min_value = lowest
+        self.max_value = max(self.max_value, *values)
+        self.total += len(values)
+
+    def merge(self, other: "LogHistogram") -> None:
+        """Add the counts of another histogram."""
+        if not other.total:
+            return
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        if not self.total or other.min_value < self.min_value:
+            self.min_value = other.min_value
+        self.max_value = max(self.max_value, other.max_value)
+        self.total += other.total
+
+    def percentile(self, percent: float) -> int:
+        """
+        Get a value that percent of the counted values do not exceed.
+
+        Args:
+            percent: Between 0 and 100
+
+        Returns:
+            The highest value of the bucket holding the percentile (at most
+            6.25% above the exact percentile), or 0 if nothing was counted
+        """
+        if not self.total:
+            return 0
+        # Rank of the percentile among the sorted values, from 1
+        rank = max(1, -(-self.total * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                # The top bucket has no upper bound
+                if index == TOP_BUCKET:
+                    return self.max_value
+                return min(bucket_bounds(index)[1], self.max_value)
+        return self.max_value
+
+    def octaves(self) -> Iterator[tuple[int, int, int]]:
+        """
+        Get the counts per power of two, from the lowest to the highest value.
+
+        Yields:
+            (lowest, highest, count) of each power of two in between, with 0
+            counted together with 1 and values above MAX_VALUE_BITS bits
+            counted in the highest power of two
+        """
+        if not self.total:
+            return
+        top_bits = min(max(self.max_value.bit_length(), 1), MAX_VALUE_BITS)
+        octave_counts = [0] * (top_bits + 1)
+        for index, count in enumerate(self.counts):
+            if count:
+                # Buckets never span more than one power of two
+                octave_counts[max(bucket_bounds(index)[0].bit_length(), 1)] += count
+        for bits in range(
+            min(max(self.min_value.bit_length(), 1), top_bits), top_bits + 1
+        ):
+            lowest = 1 << (bits - 1) if bits > 1 else 0
+            highest = (1 << bits) - 1
+            if bits == MAX_VALUE_BITS:
+                highest = max(highest, self.max_value)
+            yield lowest, highest, octave_counts[bits]
+
+
+@dataclass(slots=True)
+class SkewHistogram:
+    """How far records lie before the start and after the end of a time range."""
+
+    too_early: LogHistogram = field(default_factory=LogHistogram)  # start - t
+    too_late: LogHistogram = field(default_factory=LogHistogram)  # t - end
+
+    def merge(self, other: "SkewHistogram") -> None:
+        """Add the counts of another skew histogram."""
+        self.too_early.merge(other.too_early)
+        self.too_late.merge(other.too_late)
+
+
+def format_skew(skew: SkewHistogram) -> str:
+    """
+    Format the percentiles and a chart of both histograms.
+
+    Args:
+        skew: The histograms
+
+    Returns:
+        Text of several lines, for the sides with out-of-range records
+    """
+    lines = ["---", "Skew of out-of-range records:"]
+    for name, histogram in (
+        ("Too early (before start)", skew.too_early),
+        ("Too late (after end)", skew.too_late),
+    ):
+        if not histogram.total:
+            continue
+        lines.append(f"  {name}: {histogram.total}")
+        lines.append(
+            "    "
+            + ", ".join(
+                f"p{percent:g}: {format_duration(histogram.percentile(percent))}"
+                for percent in PERCENTILES
+            )
+            + f", max: {format_duration(histogram.max_value)}"
+        )
+        octaves = list(histogram.octaves())
+        largest = max(count for _, _, count in octaves)
+        for lowest, highest, count in octaves:
+            bars = "#" * -(-count * CHART_WIDTH // largest)
+            lines.append(
+                f"    {format_duration(lowest):>7} - {format_duration(highest):>7} "
+                f"|{bars:<{CHART_WIDTH}} {count}"
+            )
+    return "\n".join(lines)
+
+
+def format_duration(duration_ns: int) -> str:
+    """Format a duration with three significant digits in a fitting unit, e.g. 4.27h."""
+    for unit_ns, unit in _DURATION_UNITS:
+        if duration_ns >= unit_ns:
+            value = duration_ns / unit_ns
+            # 999.5 and more would be rounded to 1e+03
+            return f"{value:.3g}{unit}" if value < 999.5 else f"{value:.0f}{unit}"
+    return f"{duration_ns}ns"
@@ -0,0 +1,137 @@
+"""Tests for skew_histogram module."""
+
+import random
+
+import pytest
+
+from otlp_analyzer.common.skew_histogram import (
+    BUCKETS,
+    LogHistogram,
+    SkewHistogram,
+    bucket_bounds,
+    bucket_index,
+    format_duration,
+    format_skew,
+)
+
+
+class TestBuckets:
+    """Test the bucket layout."""
+
+    def test_bounds(self) -> None:
+        """Test that every value lies within its bucket, which is at most 1/16 wide."""
+        values = list(range(100)) + [2**64 - 1, 2**65 - 1]
+        values += [random.Random(1).getrandbits(bits) for bits in range(1, 66)]
+
+        for value in values:
+            lowest, highest = bucket_bounds(bucket_index(value))
+            assert lowest <= value <= highest
+            assert highest - lowest <= lowest // 16
+
+        assert bucket_index(2**65 - 1) == BUCKETS - 1
+
+    def test_contiguous(self) -> None:
+        """Test that the buckets follow each other without gaps."""
+        for index in range(1, BUCKETS):
+            assert bucket_bounds(index)[0] == bucket_bounds(index - 1)[1] + 1
+
+
+class TestLogHistogram:
+    """Test counting values."""
+
+    def test_percentile(self) -> None:
+        """Test that percentiles are at most one bucket above the exact ones."""
+        generator = random.Random(1)
+        values = sorted(int(generator.lognormvariate(30, 2)) for _ in range(10000))
+        histogram = LogHistogram()
+
+        histogram.add_many(values)
+
+        for percent in (1.0, 50.0, 90.0, 99.9):
+            exact = values[int(len(values) * percent / 100) - 1]
+            assert exact <= histogram.percentile(percent) <= exact * 1.0625
+        assert histogram.percentile(100.0) == histogram.max_value == values[-1]
+        assert histogram.min_value == values[0]
+
+    def test_empty(self) -> None:
+        """Test that an empty histogram has no percentiles and octaves."""
+        histogram = LogHistogram()
+
+        assert histogram.percentile(50.0) == 0
+        assert not list(histogram.octaves())
+
+    def test_merge(self) -> None:
+        """Test that merging equals adding all values to one histogram."""
+        first, second, both = LogHistogram(), LogHistogram(), LogHistogram()
+        first.add_many([5, 1000])
+        second.add_many([3, 10**12])
+        both.add_many([5, 1000, 3, 10**12])
+
+        first.merge(second)
+        first.merge(LogHistogram())
+
+        assert first == both
+
+    def test_octaves(self) -> None:
+        """Test the counts per power of two between the extremes."""
+        histogram = LogHistogram()
+        histogram.add_many([0, 1, 5, 6, 7, 40])
+
+        assert list(histogram.octaves()) == [
+            (0, 1, 2),
+            (2, 3, 0),
+            (4, 7, 3),
+            (8, 15, 0),
+            (16, 31, 0),
+            (32, 63, 1),
+        ]
+
+    def test_clamp(self) -> None:
+        """Test that values above the largest distance go to the top bucket."""
+        histogram = LogHistogram()
+
+        histogram.add(2**70)
+        histogram.add_many([5, 2**65, 2**100])
+
+        assert bucket_index(2**70) == BUCKETS - 1
+        assert histogram.counts[BUCKETS - 1] == 3
+        assert histogram.percentile(50.0) == histogram.max_value == 2**100
+        assert list(histogram.octaves())[-2:] == [
+            (2**63, 2**64 - 1, 0),
+            (2**64, 2**100, 3),
+        ]
+
+
+class TestFormat:
+    """Test formatting the histograms."""
+
+    @pytest.mark.parametrize(
+        ("duration_ns", "expected"),
+        [
+            (0, "0ns"),
+            (999, "999ns"),
+            (1500, "1.5us"),
+            (999_600_000, "1000ms"),
+            (90 * 10**9, "1.5m"),
+            (4 * 3600 * 10**9, "4h"),
+            (1000 * 86400 * 10**9, "1000d"),
+        ],
+    )
+    def test_format_duration(self, duration_ns: int, expected: str) -> None:
+        """Test three significant digits in the largest fitting unit."""
+        assert format_duration(duration_ns) == expected
+
+    def test_format_skew(self) -> None:
+        """Test the percentiles (bucket tops) and chart of the side with records."""
+        skew = SkewHistogram()
+        skew.too_late.add_many([3 * 10**9] * 3 + [10**10])
+
+        assert format_skew(skew) == (
+            "---\n"
+            "Skew of out-of-range records:\n"
+            "  Too late (after end): 4\n"
+            "    p50: 3.09s, p90: 10s, p99: 10s, p99.9: 10s, max: 10s\n"
+            f"      2.15s -   4.29s |{'#' * 40} 3\n"
+            f"      4.29s -   8.59s |{' ' * 40} 0\n"
+            f"      8.59s -   17.2s |{'#' * 14:<40} 1"
+        )
@@ -0,0 +1,384 @@
+"""Checking log record timestamps against several time windows at once.
+
+The start and end of all windows split the time axis into segments in which
+every window has the same verdict (too early, in range or too late). A
+record is classified against all windows by finding its segment with a
+single binary search, and counting records per segment is enough to get
+the summary of every window.
+"""
+
+import importlib.util
+from bisect import bisect_right
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from otlp_analyzer.common.otlp_parser import (
+    Line,
+    LogRecord,
+    OTLPParseError,
+    StreamProgress,
+    iter_otlp_records,
+)
+from otlp_analyzer.common.timestamp_check import Summary
+from otlp_analyzer.common.timestamp_parser import TimestampParseError, parse_timestamp
+from otlp_analyzer.common.utils import format_difference, format_timestamp
+
+
+class WindowParseError(Exception):
+    """Raised when a time window cannot be parsed."""
+
+
+@dataclass(frozen=True, slots=True)
+class TimeWindow:
+    """A named time range; both ends are inclusive."""
+
+    name: str
+    start_ns: int
+    end_ns: int
+
+
+@dataclass(slots=True)
+class WindowResult:
+    """Result of checking a single log record against all windows."""
+
+    record: LogRecord
+    # Status of the record in each window ("in_range", "too_early" or
+    # "too_late"); empty if the record has no valid timestamp
+    statuses: tuple[str, ...]
+
+
+def parse_window(spec: str) -> TimeWindow:
+    """
+    Parse a time window given as NAME=START..END.
+
+    START and END accept every format of parse_timestamp.
+
+    Args:
+        spec: The window specification
+
+    Returns:
+        The parsed window
+
+    Raises:
+        WindowParseError: If the specification is malformed or START is not
+                          before END
+    """
+    name, separator, time_range = spec.partition("=")
+    start, dots, end = time_range.partition("..")
+    name = name.strip()
+    if not separator or not dots or not name:
+        raise WindowParseError(f"Invalid window '{spec}', expected NAME=START..END")
+    try:
+        window = TimeWindow(name, parse_timestamp(start), parse_timestamp(end))
+    except TimestampParseError as e:
+        raise WindowParseError(f"Invalid window '{spec}': {e}") from e
+    if window.start_ns >= window.end_ns:
+        raise WindowParseError(f"Invalid window '{spec}': start must be before end")
+    return window
+
+
+def read_window_file(path: Path) -> list[TimeWindow]:
+    """
+    Read time windows from a file with one NAME=START..END per line.
+
+    Blank lines and lines starting with # are ignored.
+
+    Args:
+        path: Path of the window file
+
+    Returns:
+        The windows in file order
+
+    Raises:
+        WindowParseError: If a line cannot be parsed
+    """
+    windows = []
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                windows.append(parse_window(line))
+            except WindowParseError as e:
+                raise WindowParseError(f"{path}:{line_number}: {e}") from e
+    return windows
+
+
+class WindowSet:
+    """Time windows with their boundaries sorted for classification by bisection."""
+
+    def __init__(self, windows: Sequence[TimeWindow]) -> None:
+        """
+        Prepare the segments of a set of windows.
+
+        Args:
+            windows: The windows, with distinct names
+
+        Raises:
+            WindowParseError: If there are no windows or names repeat
+        """
+        if not windows:
+            raise WindowParseError("No time windows given")
+        names = [window.name for window in windows]
+        for name in names:
+            if names.count(name) > 1:
+                raise WindowParseError(f"Duplicate window name '{name}'")
+
+        self.windows = tuple(windows)
+        # Segment i holds the times t with boundaries[i - 1] <= t < boundaries[i]
+        self.boundaries = sorted(
+            {window.start_ns for window in windows}
+            | {window.end_ns + 1 for window in windows}
+        )
+        starts = [self.boundaries[0] - 1, *self.boundaries]
+        self.segment_statuses = [
+            tuple(_status(window, start) for window in windows) for start in starts
+        ]
+        # Whether records in the segment are out of range in some window
+        self.segment_offends = [
+            any(status != "in_range" for status in statuses)
+            for statuses in self.segment_statuses
+        ]
+
+    def __len__(self) -> int:
+        return len(self.windows)
+
+    def segment(self, time_unix_nano: int) -> int:
+        """
+        Find the segment of a timestamp.
+
+        Args:
+            time_unix_nano: Timestamp in nanoseconds
+
+        Returns:
+            Index into segment_statuses
+        """
+        return bisect_right(self.boundaries, time_unix_nano)
+
+
+def _status(window: TimeWindow, time_unix_nano: int) -> str:
+    if time_unix_nano < window.start_ns:
+        return "too_early"
+    if time_unix_nano > window.end_ns:
+        return "too_late"
+    return "in_range"
+
+
+@dataclass(slots=True)
+class WindowCounts:
+    """Number of records per segment of a WindowSet."""
+
+    window_set: WindowSet
+    segments: list[int] = field(init=False)
+    total_lines: int = 0
+    missing: int = 0  # Records without a valid timestamp
+    invalid_lines: int = 0
+
+    def __post_init__(self) -> None:
+        self.segments = [0] * (len(self.window_set.boundaries) + 1)
+
+    def summaries(self) -> list[Summary]:
+        """
+        Get the summary of every window.
+
+        Returns:
+            One Summary per window, in window order
+        """
+        records = sum(self.segments) + self.missing
+        summaries = [
+            Summary(
+                total_lines=self.total_lines,
+                total_records=records,
+                errors=self.missing + self.invalid_lines,
+            )
+            for _ in self.window_set.windows
+        ]
+        for count, statuses in zip(self.segments, self.window_set.segment_statuses):
+            for summary, status in zip(summaries, statuses):
+                setattr(summary, status, getattr(summary, status) + count)
+        return summaries
+
+
+def iter_window_results(  # pylint: disable=too-many-arguments
+    input_stream: Iterable[Line],
+    counts: WindowCounts,
+    *,
+    report: str = "offenders",
+    on_error: Optional[Callable[[int, OTLPParseError], None]] = None,
+    progress: Optional[StreamProgress] = None,
+    columnar: Optional[bool] = None,
+    batch_size: Optional[int] = None,
+) -> Generator[WindowResult, None, None]:
+    """
+    Check a JSONL stream against all windows, yielding the results to report.
+
+    Every record is counted in its segment, so the summaries of all windows
+    (see WindowCounts.summaries) are complete once the iterator is exhausted.
+    Counts can be shared by several streams to get their combined summaries.
+
+    Args:
+        input_stream: Lines of JSONL to check
+        counts: Counts to update
+        report: Which results to yield: "offenders" (records out of range in
+                some window or without timestamp), "all" or "none"
+        on_error: Called with the line number and error of invalid lines
+        progress: Updated with the number of lines and bytes read
+        columnar: Classify records in NumPy batches instead of one by one
+                  (default: whenever NumPy is installed)
+        batch_size: Records per batch for columnar checks (see
+                    timestamp_check.iter_check_results)
+
+    Yields:
+        WindowResult of the records selected by report, in stream order
+    """
+    if columnar is None:
+        columnar = importlib.util.find_spec("numpy") is not None
+    if progress is None:
+        progress = StreamProgress()
+
+    def count_error(line_number: int, error: OTLPParseError) -> None:
+        counts.invalid_lines += 1
+        if on_error is not None:
+            on_error(line_number, error)
+
+    lines_before = progress.lines
+    try:
+        if columnar:
+            yield from _check_batches(
+                input_stream, counts, report, count_error, progress, batch_size
+            )
+        else:
+            yield from _check_records(
+                input_stream, counts, report, count_error, progress
+            )
+    finally:
+        # Also when closed early
+        counts.total_lines += progress.lines - lines_before
+
+
+def _check_records(
+    input_stream: Iterable[Line],
+    counts: WindowCounts,
+    report: str,
+    on_error: Callable[[int, OTLPParseError], None],
+    progress: StreamProgress,
+) -> Iterator[WindowResult]:
+    """Classify records one by one (see iter_window_results)."""
+    window_set = counts.window_set
+    segments = counts.segments
+    for record in iter_otlp_records(
+        input_stream, timestamps_only=True, on_error=on_error, progress=progress
+    ):
+        if record.time_unix_nano is None:
+            counts.missing += 1
+            if report != "none":
+                yield WindowResult(record, ())
+            continue
+
+        segment = window_set.segment(record.time_unix_nano)
+        segments[segment] += 1
+        if report == "all" or (
+            report == "offenders" and window_set.segment_offends[segment]
+        ):
+            yield WindowResult(record, window_set.segment_statuses[segment])
+
+
+def _check_batches(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    input_stream: Iterable[Line],
+    counts: WindowCounts,
+    report: str,
+    on_error: Callable[[int, OTLPParseError], None],
+    progress: StreamProgress,
+    batch_size: Optional[int],
+) -> Iterator[WindowResult]:
+    """Classify records with vectorized binary searches (see iter_window_results)."""
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    from otlp_analyzer.common.record_batch import iter_record_batches
+
+    window_set = counts.window_set
+    # object arrays compare exactly beyond the int64 range
+    boundaries = np.array(window_set.boundaries)
+    offends = np.array(window_set.segment_offends)
+    for batch in iter_record_batches(
+        input_stream, batch_size, on_error=on_error, progress=progress
+    ):
+        segments = np.searchsorted(boundaries, batch.time_unix_nano, side="right")
+        _count_segments(counts, segments, batch.missing)
+
+        if report == "all":
+            indices = np.arange(len(batch))
+        elif report == "offenders":
+            indices = np.flatnonzero(offends[segments] | batch.missing)
+        else:
+            continue
+        for index in indices.tolist():
+            yield _batch_result(batch.record(index), window_set, int(segments[index]))
+
+
+def _count_segments(counts: WindowCounts, segments: Any, missing: Any) -> None:
+    """Add the records of a batch to the counts of their segments."""
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    present = segments[~missing]
+    for segment, count in enumerate(
+        np.bincount(present, minlength=len(counts.segments)).tolist()
+    ):
+        counts.segments[segment] += count
+    counts.missing += len(segments) - len(present)
+
+
+def _batch_result(
+    record: LogRecord, window_set: WindowSet, segment: int
+) -> WindowResult:
+    if record.time_unix_nano is None:
+        return WindowResult(record, ())
+    return WindowResult(record, window_set.segment_statuses[segment])
+
+
+def format_window_result(result: WindowResult, window_set: WindowSet) -> str:
+    """
+    Format the result of a record in all windows as a human-readable string.
+
+    Args:
+        result: The result to format
+        window_set: The windows the record was checked against
+
+    Returns:
+        Formatted string for output
+    """
+    record = result.record
+    prefix = f"Line {record.line_number}, Record {record.record_index}"
+    if record.time_unix_nano is None:
+        return f"{prefix}: ERROR - Missing or invalid timeUnixNano field"
+
+    offending = sum(status != "in_range" for status in result.statuses)
+    if offending:
+        verdict = f"OUT OF RANGE in {offending} of {len(window_set)} windows"
+    else:
+        verdict = "IN RANGE"
+    lines = [
+        f"{prefix}: {verdict}",
+        f"  timeUnixNano:    {format_timestamp(record.time_unix_nano)} "
+        f"({record.time_unix_nano})",
+    ]
+    for window, status in zip(window_set.windows, result.statuses):
+        label = f"{window.name}:"
+        if status == "too_early":
+            difference = format_difference(
+                window.start_ns - record.time_unix_nano, "before start"
+            )
+            lines.append(f"  {label:<16} too early ({difference})")
+        elif status == "too_late":
+            difference = format_difference(
+                record.time_unix_nano - window.end_ns, "after end"
+            )
+            lines.append(f"  {label:<16} too late ({difference})")
+        else:
+            lines.append(f"  {label:<16} in range")
+    return "\n".join(lines)
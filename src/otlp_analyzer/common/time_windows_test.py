@@ -0,0 +1,217 @@
+"""Tests for time_windows module."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from otlp_analyzer.common.otlp_parser import LogRecord
+from otlp_analyzer.common.time_windows import (
+    TimeWindow,
+    WindowCounts,
+    WindowParseError,
+    WindowResult,
+    WindowSet,
+    format_window_result,
+    iter_window_results,
+    parse_window,
+    read_window_file,
+)
+from otlp_analyzer.common.timestamp_check import (
+    Summary,
+    check_timestamp_range,
+    iter_check_results,
+)
+
+INPUT_DATA = (
+    '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"},{"timeUnixNano":"1576408200000000000"},{}]}]}]}\n'
+    "{invalid json\n"
+    '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1615819530123000000"},{"timeUnixNano":"1609459199999000000"}]}]}]}\n'
+)
+WINDOWS = [
+    TimeWindow("year", 1577836800000000000, 1609459199999000000),
+    TimeWindow("june", 1590969600000000000, 1593561599999999999),
+    TimeWindow("late", 1609459199999000000, 1640995199999999999),
+]
+
+
+class TestParseWindow:
+    """Test parsing window specifications."""
+
+    def test_parse(self) -> None:
+        """Test parsing a name with a start and an end."""
+        window = parse_window("q1=2020-01-01..2020-03-31T23:59:59Z")
+
+        assert window == TimeWindow("q1", 1577836800000000000, 1585699199000000000)
+
+    @pytest.mark.parametrize(
+        "spec",
+        ["2020-01-01..2020-12-31", "=1..2", "a=1", "a=x..2", "a=2..1", "a=1..1"],
+    )
+    def test_invalid(self, spec: str) -> None:
+        """Test that malformed windows and empty ranges are errors."""
+        with pytest.raises(WindowParseError):
+            parse_window(spec)
+
+    def test_read_window_file(self, tmp_path: Path) -> None:
+        """Test reading windows, skipping comments and blank lines."""
+        path = tmp_path / "windows.txt"
+        path.write_text("# Windows\na=1..2\n\n  b=3..4  \n")
+
+        assert read_window_file(path) == [
+            TimeWindow("a", 1000000000, 2000000000),
+            TimeWindow("b", 3000000000, 4000000000),
+        ]
+
+    def test_read_invalid_window_file(self, tmp_path: Path) -> None:
+        """Test that errors name the line of the window file."""
+        path = tmp_path / "windows.txt"
+        path.write_text("a=1..2\nb=3\n")
+
+        with pytest.raises(WindowParseError, match=r"windows.txt:2: "):
+            read_window_file(path)
+
+
+class TestWindowSet:
+    """Test classifying timestamps by segment."""
+
+    @pytest.mark.parametrize(
+        "time_unix_nano",
+        [
+            0,
+            WINDOWS[0].start_ns - 1,
+            WINDOWS[0].start_ns,
+            WINDOWS[1].end_ns,
+            WINDOWS[1].end_ns + 1,
+            WINDOWS[2].start_ns,
+            WINDOWS[0].end_ns + 1,
+            WINDOWS[2].end_ns,
+            WINDOWS[2].end_ns + 1,
+            2**70,
+        ],
+    )
+    def test_statuses(self, time_unix_nano: int) -> None:
+        """Test that segments have the status of each window, at the boundaries."""
+        window_set = WindowSet(WINDOWS)
+        record = LogRecord(time_unix_nano, 1, 0, {})
+
+        statuses = window_set.segment_statuses[window_set.segment(time_unix_nano)]
+
+        assert statuses == tuple(
+            check_timestamp_range(record, window.start_ns, window.end_ns).status
+            for window in WINDOWS
+        )
+
+    @pytest.mark.parametrize("windows", [[], [WINDOWS[0], WINDOWS[0]]])
+    def test_invalid(self, windows: list[TimeWindow]) -> None:
+        """Test that no windows and repeated names are errors."""
+        with pytest.raises(WindowParseError):
+            WindowSet(windows)
+
+
+class TestIterWindowResults:
+    """Test checking streams against several windows."""
+
+    def expected_summaries(self) -> list[Summary]:
+        """Check each window separately."""
+        summaries = []
+        for window in WINDOWS:
+            summary = Summary()
+            results = iter_check_results(
+                io.StringIO(INPUT_DATA),
+                window.start_ns,
+                window.end_ns,
+                summary,
+                report="none",
+            )
+            assert not list(results)
+            summaries.append(summary)
+        return summaries
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_summaries(self, columnar: bool) -> None:
+        """Test that one pass gives the summary of checking each window."""
+        if columnar:
+            pytest.importorskip("numpy")
+        counts = WindowCounts(WindowSet(WINDOWS))
+        errors: list[int] = []
+
+        results = list(
+            iter_window_results(
+                io.StringIO(INPUT_DATA),
+                counts,
+                on_error=lambda line_number, _: errors.append(line_number),
+                columnar=columnar,
+            )
+        )
+
+        assert counts.summaries() == self.expected_summaries()
+        assert errors == [2]
+        assert [
+            (result.record.line_number, result.record.record_index, result.statuses)
+            for result in results
+        ] == [
+            (1, 0, ("in_range", "in_range", "too_early")),
+            (1, 1, ("too_early", "too_early", "too_early")),
+            (1, 2, ()),
+            (3, 0, ("too_late", "too_late", "in_range")),
+            (3, 1, ("in_range", "too_late", "in_range")),
+        ]
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_report_all(self, columnar: bool) -> None:
+        """Test that all records are yielded, and none without reports."""
+        if columnar:
+            pytest.importorskip("numpy")
+        window_set = WindowSet(WINDOWS[:1])
+
+        for report, expected in (("all", 5), ("offenders", 3), ("none", 0)):
+            results = iter_window_results(
+                io.StringIO(INPUT_DATA),
+                WindowCounts(window_set),
+                report=report,
+                columnar=columnar,
+            )
+            assert len(list(results)) == expected
+
+    def test_several_streams(self) -> None:
+        """Test that counts shared by several streams add up."""
+        counts = WindowCounts(WindowSet(WINDOWS))
+
+        for _ in range(2):
+            list(iter_window_results(io.StringIO(INPUT_DATA), counts, report="none"))
+
+        summary = counts.summaries()[0]
+        assert (summary.total_lines, summary.total_records, summary.errors) == (
+            6,
+            10,
+            4,
+        )
+
+
+class TestFormatWindowResult:
+    """Test formatting results for several windows."""
+
+    def test_format(self) -> None:
+        """Test the verdict and the status in every window."""
+        window_set = WindowSet(WINDOWS)
+        result = WindowResult(
+            LogRecord(1609459199999000000, 5, 1, {}),
+            ("in_range", "too_late", "in_range"),
+        )
+
+        assert format_window_result(result, window_set) == (
+            "Line 5, Record 1: OUT OF RANGE in 1 of 3 windows\n"
+            "  timeUnixNano:    2020-12-31T23:59:59.999Z (1609459199999000000)\n"
+            "  year:            in range\n"
+            "  june:            too late (183 days, 23:59:59.999 after end)\n"
+            "  late:            in range"
+        )
+
+    def test_format_missing_timestamp(self) -> None:
+        """Test records without a timestamp."""
+        result = WindowResult(LogRecord(None, 2, 0, {}), ())
+
+        assert format_window_result(result, WindowSet(WINDOWS)) == (
+            "Line 2, Record 0: ERROR - Missing or invalid timeUnixNano field"
+        )
@@ -0,0 +1,675 @@
+"""Checking whether OTLP log record timestamps fall within a time range.
+
+The checks behind otlp-check-timestamp, without any output: results are
+yielded for the caller to report and counted in a Summary.
+"""
+
+import functools
+import importlib.util
+import io
+import itertools
+import mmap
+from collections.abc import Callable, Generator, Iterable, Iterator
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from otlp_analyzer.common.file_chunks import iter_range_lines
+from otlp_analyzer.common.otlp_parser import (
+    Line,
+    LogRecord,
+    OTLPParseError,
+    StreamProgress,
+    iter_otlp_records,
+    parse_otlp_line,
+)
+from otlp_analyzer.common.profiling import StageProfile
+
+if TYPE_CHECKING:
+    from otlp_analyzer.common.record_batch import BatchClassification, RecordBatch
+    from otlp_analyzer.common.skew_histogram import SkewHistogram
+    from otlp_analyzer.common.timestamp_index import TimestampIndex
+
+
+@dataclass(slots=True)
+class CheckResult:
+    """Result of checking a single log record."""
+
+    record: LogRecord
+    status: str  # "in_range", "too_early", "too_late", "error"
+    error_message: str = ""
+
+
+@dataclass(slots=True)
+class Summary:
+    """Summary of all checks performed."""
+
+    total_lines: int = 0
+    total_records: int = 0
+    in_range: int = 0
+    too_early: int = 0
+    too_late: int = 0
+    errors: int = 0
+
+    def has_issues(self) -> bool:
+        """Whether any records were out of range or had errors."""
+        return self.too_early + self.too_late + self.errors > 0
+
+
+def check_timestamp_range(record: LogRecord, start_ns: int, end_ns: int) -> CheckResult:
+    """
+    Check if a log record's timestamp falls within the specified range.
+
+    Args:
+        record: The log record to check
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+
+    Returns:
+        CheckResult indicating the status
+    """
+    if record.time_unix_nano is None:
+        return CheckResult(
+            record=record,
+            status="error",
+            error_message="Missing or invalid timeUnixNano field",
+        )
+
+    if record.time_unix_nano < start_ns:
+        return CheckResult(record=record, status="too_early")
+    if record.time_unix_nano > end_ns:
+        return CheckResult(record=record, status="too_late")
+    return CheckResult(record=record, status="in_range")
+
+
+def iter_check_results(  # pylint: disable=too-many-arguments
+    input_stream: Iterable[Line],
+    start_ns: int,
+    end_ns: int,
+    summary: Summary,
+    *,
+    report: str = "offenders",
+    on_error: Optional[Callable[[int, OTLPParseError], None]] = None,
+    progress: Optional[StreamProgress] = None,
+    columnar: Optional[bool] = None,
+    columnar_after: int = 0,
+    batch_size: Optional[int] = None,
+    profile: Optional[StageProfile] = None,
+    skew: Optional["SkewHistogram"] = None,
+) -> Generator[CheckResult, None, None]:
+    """
+    Check the timestamps of a JSONL stream, yielding the results to report.
+
+    All records and invalid lines are counted in the summary, which is
+    complete once the iterator is exhausted. If the iterator is closed early
+    (or on_error raises), the summary covers the lines read so far; with
+    columnar checks, that includes the rest of the current batch.
+
+    Args:
+        input_stream: Lines of JSONL to check
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+        summary: Summary to update
+        report: Which results to yield: "offenders" (records not in range),
+                "all" or "none" (only update the summary)
+        on_error: Called with the line number and error of invalid lines
+        progress: Updated with the number of lines and bytes read
+        columnar: Check records in NumPy batches instead of one by one
+                  (default: whenever NumPy is installed)
+        columnar_after: With columnar checks, check the records of this many
+                        bytes at the start of the stream one by one, so that
+                        short streams do not import NumPy
+        batch_size: Records per batch for columnar checks (see
+                    record_batch.iter_record_batches); smaller batches read
+                    less ahead of the yielded results
+        profile: Times reading lines, decoding them and walking their records
+                 (or building batches) as the "read", "decode" and "walk"
+                 stages
+        skew: Updated with the distance of every out-of-range record to the
+              range, like the summary
+
+    Yields:
+        CheckResult of the records selected by report, in stream order
+    """
+    if columnar is None:
+        columnar = importlib.util.find_spec("numpy") is not None
+    if progress is None:
+        progress = StreamProgress()
+    if profile is None:
+        profile = StageProfile(enabled=False)
+    input_stream = profile.iterate("read", input_stream)
+
+    def count_error(line_number: int, error: OTLPParseError) -> None:
+        summary.errors += 1
+        if on_error is not None:
+            on_error(line_number, error)
+
+    try:
+        if columnar and columnar_after:
+            lines = iter(input_stream)
+            yield from _check_records(
+                _iter_head(lines, progress, columnar_after),
+                start_ns,
+                end_ns,
+                summary,
+                report,
+                count_error,
+                progress,
+                profile,
+                skew,
+            )
+            first = next(lines, None)
+            if first is None:
+                return
+            input_stream = itertools.chain([first], lines)
+        if columnar:
+            yield from _check_batches(
+                input_stream,
+                start_ns,
+                end_ns,
+                summary,
+                report,
+                count_error,
+                progress,
+                batch_size,
+                profile,
+                skew,
+            )
+        else:
+            yield from _check_records(
+                input_stream,
+                start_ns,
+                end_ns,
+                summary,
+                report,
+                count_error,
+                progress,
+                profile,
+                skew,
+            )
+    finally:
+        # Also when closed early
+        summary.total_lines = progress.lines
+
+
+def _iter_head(
+    lines: Iterator[Line], progress: StreamProgress, size: int
+) -> Iterator[Line]:
+    """Yield lines until size more bytes of the stream have been read."""
+    end = progress.byte_offset + size
+    while progress.byte_offset < end:
+        line = next(lines, None)
+        if line is None:
+            return
+        yield line
+
+
+def _check_records(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    input_stream: Iterable[Line],
+    start_ns: int,
+    end_ns: int,
+    summary: Summary,
+    report: str,
+    on_error: Callable[[int, OTLPParseError], None],
+    progress: StreamProgress,
+    profile: StageProfile,
+    skew: Optional["SkewHistogram"],
+) -> Iterator[CheckResult]:
+    """Check records one by one (see iter_check_results)."""
+    records = iter_otlp_records(
+        input_stream,
+        timestamps_only=True,
+        on_error=on_error,
+        progress=progress,
+        profile=profile,
+    )
+    for record in profile.iterate("walk", records):
+        result = check_timestamp_range(record, start_ns, end_ns)
+        count_result(summary, result)
+        if skew is not None:
+            add_skew(skew, result, start_ns, end_ns)
+        if report == "all" or (report == "offenders" and result.status != "in_range"):
+            yield result
+
+
+def count_result(summary: Summary, result: CheckResult) -> None:
+    """Add a check result to the summary."""
+    summary.total_records += 1
+    if result.status == "in_range":
+        summary.in_range += 1
+    elif result.status == "too_early":
+        summary.too_early += 1
+    elif result.status == "too_late":
+        summary.too_late += 1
+    elif result.status == "error":
+        summary.errors += 1
+
+
+def add_skew(
+    skew: "SkewHistogram", result: CheckResult, start_ns: int, end_ns: int
+) -> None:
+    """Add the distance of an out-of-range record to the range to skew."""
+    time_unix_nano = result.record.time_unix_nano
+    if time_unix_nano is None:
+        return
+    if result.status == "too_early":
+        skew.too_early.add(start_ns - time_unix_nano)
+    elif result.status == "too_late":
+        skew.too_late.add(time_unix_nano - end_ns)
+
+
+def _check_batches(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    input_stream: Iterable[Line],
+    start_ns: int,
+    end_ns: int,
+    summary: Summary,
+    report: str,
+    on_error: Callable[[int, OTLPParseError], None],
+    progress: StreamProgress,
+    batch_size: Optional[int],
+    profile: StageProfile,
+    skew: Optional["SkewHistogram"],
+) -> Iterator[CheckResult]:
+    """
+    Check records with vectorized range checks (see iter_check_results).
+
+    Classifies whole batches of records at once and only creates a
+    CheckResult for the records that are yielded.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from otlp_analyzer.common.record_batch import classify_batch, iter_record_batches
+
+    batches = iter_record_batches(
+        input_stream, batch_size, on_error=on_error, progress=progress, profile=profile
+    )
+    for batch in profile.iterate("walk", batches):
+        classification = classify_batch(batch, start_ns, end_ns)
+        summary.total_records += len(batch)
+        summary.in_range += classification.in_range
+        summary.too_early += classification.too_early
+        summary.too_late += classification.too_late
+        summary.errors += classification.errors
+        if skew is not None and classification.too_early + classification.too_late:
+            _add_batch_skew(skew, batch, classification, start_ns, end_ns)
+
+        if report == "none":
+            continue
+        for index in classification.indices(include_in_range=report == "all"):
+            yield check_timestamp_range(batch.record(index), start_ns, end_ns)
+
+
+def _add_batch_skew(
+    skew: "SkewHistogram",
+    batch: "RecordBatch",
+    classification: "BatchClassification",
+    start_ns: int,
+    end_ns: int,
+) -> None:
+    """Add the distances of the out-of-range records of a batch to the range."""
+    # pylint: disable-next=import-outside-toplevel
+    from otlp_analyzer.common.record_batch import TOO_EARLY, TOO_LATE
+
+    status = classification.status
+    # tolist gives Python ints, which cannot overflow
+    early = batch.time_unix_nano[status == TOO_EARLY].tolist()
+    skew.too_early.add_many(start_ns - time_unix_nano for time_unix_nano in early)
+    late = batch.time_unix_nano[status == TOO_LATE].tolist()
+    skew.too_late.add_many(time_unix_nano - end_ns for time_unix_nano in late)
+
+
+@dataclass(slots=True)
+class CheckerResult:
+    """Everything a TimestampChecker found in the data fed to it."""
+
+    summary: Summary = field(default_factory=Summary)
+    # The records selected by report, in order
+    results: list[CheckResult] = field(default_factory=list)
+    # Line number and error of invalid lines
+    errors: list[tuple[int, OTLPParseError]] = field(default_factory=list)
+    # Lines and bytes read
+    progress: StreamProgress = field(default_factory=StreamProgress)
+    # Distances of the out-of-range records to the range, if counted
+    skew: Optional["SkewHistogram"] = None
+
+
+# Smaller pieces fed to a TimestampChecker are checked record by record, as
+# setting up NumPy batches takes longer than checking a few dozen records
+FEED_COLUMNAR_MIN_SIZE = 32 * 1024
+
+
+@functools.cache
+def _has_numpy() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+class TimestampChecker:  # pylint: disable=too-many-instance-attributes
+    """
+    Reusable timestamp check for programs embedding the analyzer.
+
+    Data is fed as bytes in pieces of any size, such as the buffers received
+    by a service; lines split between pieces are joined. result() returns
+    what was found and resets the checker, so a single checker serves any
+    number of inputs without repeating its setup. Line numbers count from
+    the start of each input.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        start_ns: int,
+        end_ns: int,
+        *,
+        report: str = "offenders",
+        columnar: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        count_skew: bool = False,
+    ) -> None:
+        """
+        Prepare checking a time range.
+
+        Args:
+            start_ns: Start of time range in nanoseconds
+            end_ns: End of time range in nanoseconds
+            report: Which results to collect (see iter_check_results)
+            columnar: Check records in NumPy batches instead of one by one
+                      (default: whenever NumPy is installed, for streams and
+                      for pieces of at least FEED_COLUMNAR_MIN_SIZE bytes)
+            batch_size: Records per batch for columnar checks (see
+                        iter_check_results)
+            count_skew: Count the distances of out-of-range records to the
+                        range in the skew of the results
+        """
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.report = report
+        self.columnar = columnar
+        self.batch_size = batch_size
+        self.count_skew = count_skew
+        # Incomplete last line of the data fed so far
+        self._pending = bytearray()
+        self._found = self._new_result()
+
+    @property
+    def summary(self) -> Summary:
+        """The counts of the current input so far."""
+        return self._found.summary
+
+    @property
+    def progress(self) -> StreamProgress:
+        """The lines and bytes of the current input read so far."""
+        return self._found.progress
+
+    @property
+    def skew(self) -> Optional["SkewHistogram"]:
+        """The distances of the out-of-range records of the current input so far."""
+        return self._found.skew
+
+    def check_stream(
+        self,
+        input_stream: Iterable[Line],
+        *,
+        on_error: Optional[Callable[[int, OTLPParseError], None]] = None,
+        profile: Optional[StageProfile] = None,
+        columnar_after: int = 0,
+    ) -> Generator[CheckResult, None, None]:
+        """
+        Check a stream of lines, yielding the results to report.
+
+        The lines are counted in summary (and the distances of out-of-range
+        records in skew, if counted), after any data fed before.
+
+        Args:
+            input_stream: Lines of JSONL to check
+            on_error: Called with the line number and error of invalid lines
+            profile: Times the stages of the check (see iter_check_results)
+            columnar_after: Bytes at the start of the stream to check record
+                            by record (see iter_check_results)
+
+        Returns:
+            Iterator over the CheckResult of the records selected by report
+        """
+        return iter_check_results(
+            input_stream,
+            self.start_ns,
+            self.end_ns,
+            self.summary,
+            report=self.report,
+            on_error=on_error,
+            progress=self.progress,
+            columnar=_has_numpy() if self.columnar is None else self.columnar,
+            columnar_after=columnar_after,
+            batch_size=self.batch_size,
+            profile=profile,
+            skew=self.skew,
+        )
+
+    def feed(self, data: bytes) -> None:
+        """
+        Check the complete lines of a piece of data.
+
+        Args:
+            data: UTF-8 encoded JSONL; an incomplete last line is kept until
+                  the next feed or result
+        """
+        end = data.rfind(b"\n") + 1
+        if end:
+            if self._pending:
+                self._pending += data[:end]
+                self._check(bytes(self._pending))
+                self._pending.clear()
+            else:
+                self._check(data[:end])
+        self._pending += data[end:]
+
+    def result(self) -> CheckerResult:
+        """
+        Finish the input, including a last line without line ending.
+
+        Returns:
+            The summary, results and invalid lines of all data fed since the
+            last call; the checker then starts over with the next input
+        """
+        if self._pending:
+            self._check(bytes(self._pending))
+            self._pending.clear()
+        result = self._found
+        self._found = self._new_result()
+        return result
+
+    def _new_result(self) -> CheckerResult:
+        if not self.count_skew:
+            return CheckerResult()
+        # pylint: disable-next=import-outside-toplevel
+        from otlp_analyzer.common.skew_histogram import SkewHistogram
+
+        return CheckerResult(skew=SkewHistogram())
+
+    def _check(self, data: bytes) -> None:
+        columnar = self.columnar
+        if columnar is None:
+            columnar = len(data) >= FEED_COLUMNAR_MIN_SIZE and _has_numpy()
+        self._found.results.extend(
+            iter_check_results(
+                io.BytesIO(data),
+                self.start_ns,
+                self.end_ns,
+                self.summary,
+                report=self.report,
+                on_error=self._add_error,
+                progress=self.progress,
+                columnar=columnar,
+                batch_size=self.batch_size,
+                skew=self.skew,
+            )
+        )
+
+    def _add_error(self, line_number: int, error: OTLPParseError) -> None:
+        self._found.errors.append((line_number, error))
+
+
+def iter_indexed_results(  # pylint: disable=too-many-arguments,too-many-locals
+    source: Optional[mmap.mmap],
+    index: "TimestampIndex",
+    start_ns: int,
+    end_ns: int,
+    summary: Summary,
+    *,
+    report: str,
+    on_error: Optional[Callable[[int, OTLPParseError], None]],
+    skew: Optional["SkewHistogram"] = None,
+) -> Generator[CheckResult, None, None]:
+    """
+    Check the lines of an indexed file, yielding the results to report.
+
+    Lines whose timestamps all fall on the same side of (or inside) the time
+    range and that have nothing to report are counted from their index
+    entry. Only the other lines are sliced from the file and decoded, and
+    with skew, also the lines with out-of-range records.
+
+    Args:
+        source: The memory-mapped file, or None if it is empty
+        index: Up-to-date index of the file (see timestamp_index.open_index)
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+        summary: Summary to update
+        report: Which results to yield (see iter_check_results)
+        on_error: Called with the line number and error of invalid lines
+        skew: Updated with the distance of every out-of-range record to the
+              range (see skew_histogram)
+
+    Yields:
+        CheckResult of the records selected by report, in file order
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from otlp_analyzer.common.timestamp_index import INVALID_LINE, line_counts
+
+    line_number = 0
+    try:
+        for line_number, entry in enumerate(index.iter_entries(), start=1):
+            offset, length, _, _, record_count, _, flags = entry
+            counts = line_counts(entry, start_ns, end_ns)
+            if (
+                skew is not None
+                and counts is not None
+                and (counts.too_early or counts.too_late)
+            ):
+                # The distances to the range are only known from the records
+                counts = None
+            if counts is not None and (
+                report == "none"
+                or (report == "offenders" and counts.in_range == record_count)
+            ):
+                # Nothing to report: count the line without reading it
+                summary.total_records += record_count
+                summary.in_range += counts.in_range
+                summary.too_early += counts.too_early
+                summary.too_late += counts.too_late
+                summary.errors += counts.errors
+                continue
+
+            if report == "none" and flags & INVALID_LINE:
+                summary.errors += 1
+                continue
+
+            assert source is not None
+            try:
+                records = parse_otlp_line(
+                    source[offset : offset + length], line_number, timestamps_only=True
+                )
+            except OTLPParseError as e:
+                summary.errors += 1
+                if on_error is not None:
+                    on_error(line_number, e)
+                continue
+
+            for record in records:
+                record.byte_offset = offset
+                result = check_timestamp_range(record, start_ns, end_ns)
+                count_result(summary, result)
+                if skew is not None:
+                    add_skew(skew, result, start_ns, end_ns)
+                if report == "all" or (
+                    report == "offenders" and result.status != "in_range"
+                ):
+                    yield result
+    finally:
+        # The lines read so far if closed early
+        summary.total_lines = line_number
+
+
+def add_summary(total: Summary, part: Summary) -> None:
+    """Add the counts of part to total."""
+    for count in fields(Summary):
+        setattr(
+            total, count.name, getattr(total, count.name) + getattr(part, count.name)
+        )
+
+
+@dataclass(slots=True)
+class ChunkTask:
+    """A byte range of a file to check in a worker process."""
+
+    path: Path
+    start: int
+    end: int
+    start_ns: int
+    end_ns: int
+    report: str  # See iter_check_results
+    count_skew: bool = False
+
+
+# A result to print: (line number, record index, timeUnixNano, status, error
+# message), with record index -1 for lines that cannot be parsed
+ChunkReport = tuple[int, int, Optional[int], str, str]
+
+
+def check_chunk(
+    task: ChunkTask,
+) -> tuple[Summary, list[ChunkReport], Optional["SkewHistogram"]]:
+    """
+    Check a byte range of a file.
+
+    Args:
+        task: The range to check
+
+    Returns:
+        Summary of the range, the results to print, with line numbers
+        counted from the start of the range, and the skew of its out-of-range
+        records if task.count_skew is set
+    """
+    summary = Summary()
+    reports: list[ChunkReport] = []
+    skew: Optional["SkewHistogram"] = None
+    if task.count_skew:
+        # pylint: disable-next=import-outside-toplevel
+        from otlp_analyzer.common.skew_histogram import SkewHistogram
+
+        skew = SkewHistogram()
+
+    def report_error(line_number: int, error: OTLPParseError) -> None:
+        reports.append((line_number, -1, None, "error", str(error)))
+
+    for result in iter_check_results(
+        iter_range_lines(task.path, task.start, task.end),
+        task.start_ns,
+        task.end_ns,
+        summary,
+        report=task.report,
+        on_error=None if task.report == "none" else report_error,
+        progress=StreamProgress(byte_offset=task.start),
+        skew=skew,
+    ):
+        reports.append(to_chunk_report(result))
+
+    return summary, reports, skew
+
+
+def to_chunk_report(result: CheckResult) -> ChunkReport:
+    """Reduce a check result to the fields of a ChunkReport."""
+    record = result.record
+    return (
+        record.line_number,
+        record.record_index,
+        record.time_unix_nano,
+        result.status,
+        result.error_message,
+    )
@@ -0,0 +1,120 @@
+"""Tests for timestamp_check module."""
+
+import io
+
+import pytest
+
+from otlp_analyzer.common.timestamp_check import (
+    CheckerResult,
+    Summary,
+    TimestampChecker,
+    add_summary,
+)
+
+
+class TestAddSummary:
+    """Test adding up summaries."""
+
+    def test_add_summary(self) -> None:
+        """Test that every count is added."""
+        total = Summary(1, 2, 3, 4, 5, 6)
+
+        add_summary(total, Summary(10, 20, 30, 40, 50, 60))
+
+        assert total == Summary(11, 22, 33, 44, 55, 66)
+
+
+class TestTimestampChecker:
+    """Test checking data fed in pieces."""
+
+    DATA = (
+        b'{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"},{"timeUnixNano":"1576408200000000000"}]}]}]}\n'
+        b"{invalid json\n"
+        b'{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1615819530123000000"}]}]}]}'
+    )
+    START_NS = 1577836800000000000  # 2020-01-01
+    END_NS = 1609459199999000000  # 2020-12-31 23:59:59.999
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    @pytest.mark.parametrize("piece_size", [1, 7, 1000])
+    def test_pieces(self, columnar: bool, piece_size: int) -> None:
+        """Test that lines split between pieces are joined."""
+        if columnar:
+            pytest.importorskip("numpy")
+        checker = TimestampChecker(self.START_NS, self.END_NS, columnar=columnar)
+
+        for start in range(0, len(self.DATA), piece_size):
+            checker.feed(self.DATA[start : start + piece_size])
+        result = checker.result()
+
+        assert result.summary == Summary(3, 3, 1, 1, 1, 1)
+        assert [
+            (found.record.line_number, found.record.record_index, found.status)
+            for found in result.results
+        ] == [(1, 1, "too_early"), (3, 0, "too_late")]
+        assert [line_number for line_number, _ in result.errors] == [2]
+        assert result.progress.byte_offset == len(self.DATA)
+
+    def test_reuse(self) -> None:
+        """Test that every input is counted from its own first line."""
+        checker = TimestampChecker(self.START_NS, self.END_NS, report="all")
+        checker.feed(self.DATA)
+        first = checker.result()
+
+        checker.feed(self.DATA[: self.DATA.index(b"\n") + 1])
+        second = checker.result()
+
+        assert first.summary.total_lines == 3
+        assert second.summary == Summary(1, 2, 1, 1, 0, 0)
+        assert [found.record.line_number for found in second.results] == [1, 1]
+        assert checker.result() == CheckerResult()
+
+    def test_check_stream(self) -> None:
+        """Test checking lines, counted after the data fed before."""
+        checker = TimestampChecker(self.START_NS, self.END_NS)
+        checker.feed(b"\n")
+
+        results = list(checker.check_stream(io.BytesIO(self.DATA)))
+
+        assert [found.record.line_number for found in results] == [2, 4]
+        assert checker.summary.total_lines == 4
+        found = checker.result()
+        assert found.summary.errors == 1
+        assert found.skew is None
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_skew(self, columnar: bool) -> None:
+        """Test that the distances of out-of-range records are counted."""
+        if columnar:
+            pytest.importorskip("numpy")
+        checker = TimestampChecker(
+            self.START_NS,
+            self.END_NS,
+            report="none",
+            columnar=columnar,
+            count_skew=True,
+        )
+
+        checker.feed(self.DATA)
+        skew = checker.result().skew
+
+        assert skew is not None
+        assert (skew.too_early.total, skew.too_late.total) == (1, 1)
+        assert skew.too_early.max_value == 1428600 * 10**9
+        assert skew.too_late.max_value == 6360330124000000
+
+    @pytest.mark.parametrize("columnar_after", [1, 130, 1000])
+    def test_columnar_after(self, columnar_after: int) -> None:
+        """Test that records are checked one by one up to a byte offset."""
+        pytest.importorskip("numpy")
+        records = TimestampChecker(self.START_NS, self.END_NS, columnar=False)
+        expected = list(records.check_stream(io.BytesIO(self.DATA)))
+        checker = TimestampChecker(self.START_NS, self.END_NS, columnar=True)
+
+        results = list(
+            checker.check_stream(io.BytesIO(self.DATA), columnar_after=columnar_after)
+        )
+
+        assert results == expected
+        assert checker.summary == records.summary
+        assert checker.result().progress.byte_offset == len(self.DATA)
@@ -0,0 +1,382 @@
+"""Sorted column files of all log record timestamps of a JSONL file.
+
+Requires the optional numpy package. An extract holds the timeUnixNano of
+every log record of its source file in ascending order, next to the line,
+record index and byte offset of each record. The records of any time range
+form a contiguous slice of the extract, found with two binary searches, so
+range checks are answered without reading the source file.
+
+File layout (little endian): a header of magic, source size, source mtime,
+source digest and the counts of lines, records with a timestamp, records
+without one and invalid lines, followed by int64 columns: time, line,
+record index and byte offset of the timestamped records in time order;
+line, record index and byte offset of the records without a timestamp; and
+line, byte offset and length of the invalid lines, all in file order.
+"""
+
+import hashlib
+import os
+import struct
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, cast
+
+import numpy as np
+
+from otlp_analyzer.common.compression import file_compression
+from otlp_analyzer.common.file_chunks import iter_range_lines
+from otlp_analyzer.common.otlp_parser import (
+    NO_RAW_DATA,
+    LogRecord,
+    OTLPParseError,
+    parse_otlp_timestamps,
+)
+
+if TYPE_CHECKING:
+    from otlp_analyzer.common.skew_histogram import SkewHistogram
+
+EXTRACT_SUFFIX = ".tscol"
+
+_MAGIC = b"OTSCOL01"
+_HEADER = struct.Struct("<8sQq32sQQQQ")
+_DIGEST_SIZE = 32
+# Bytes hashed at the start and at the end of the source file
+SAMPLE_SIZE = 1024 * 1024
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+# Timestamps converted to Python ints at a time by add_skew
+_SKEW_BLOCK_SIZE = 1024 * 1024
+
+
+class TimestampExtractError(Exception):
+    """Raised when an extract cannot be built or read."""
+
+
+def extract_path_for(path: Path) -> Path:
+    """
+    Get the path of the sorted timestamp extract of a file.
+
+    Args:
+        path: Path of the JSONL file
+
+    Returns:
+        The path with EXTRACT_SUFFIX appended
+    """
+    return path.with_name(path.name + EXTRACT_SUFFIX)
+
+
+def source_digest(path: Path) -> bytes:
+    """
+    Hash the start and the end of a file.
+
+    Together with size and modification time, this detects files that were
+    rewritten in place without reading all of them.
+
+    Args:
+        path: Path of the file
+
+    Returns:
+        BLAKE2b digest of the first and last SAMPLE_SIZE bytes
+    """
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    with open(path, "rb") as file:
+        digest.update(file.read(SAMPLE_SIZE))
+        file.seek(max(SAMPLE_SIZE, os.fstat(file.fileno()).st_size - SAMPLE_SIZE))
+        digest.update(file.read(SAMPLE_SIZE))
+    return digest.digest()
+
+
+def build_extract(path: Path, extract_path: Optional[Path] = None) -> int:
+    """
+    Write the sorted timestamp extract of a JSONL file.
+
+    The extract is written to a temporary file that replaces extract_path
+    once complete, so readers never see a partial extract.
+
+    Args:
+        path: Path of the uncompressed JSONL file
+        extract_path: Where to write the extract (default: extract_path_for(path))
+
+    Returns:
+        Number of log records extracted
+
+    Raises:
+        TimestampExtractError: If the file is compressed or has timestamps
+                               beyond the int64 range
+    """
+    if file_compression(path) is not None:
+        raise TimestampExtractError(f"Cannot extract compressed file {path}")
+    if extract_path is None:
+        extract_path = extract_path_for(path)
+
+    stat = path.stat()
+    digest = source_digest(path)
+    columns, lines = _read_columns(path)
+    records, missing, invalid = len(columns[0]), len(columns[4]), len(columns[7])
+
+    # A stable sort keeps records with equal timestamps in file order
+    order = np.argsort(columns[0], kind="stable")
+    for position in range(4):
+        columns[position] = columns[position][order]
+
+    temporary_path = extract_path.with_name(extract_path.name + ".tmp")
+    with open(temporary_path, "wb") as extract:
+        extract.write(
+            _HEADER.pack(
+                _MAGIC,
+                stat.st_size,
+                stat.st_mtime_ns,
+                digest,
+                lines,
+                records,
+                missing,
+                invalid,
+            )
+        )
+        for column in columns:
+            extract.write(column.astype("<i8", copy=False).tobytes())
+    os.replace(temporary_path, extract_path)
+    return records + missing
+
+
+def _read_columns(path: Path) -> tuple[list[Any], int]:
+    """
+    Collect the timestamps and positions of the records of a file.
+
+    Args:
+        path: Path of the JSONL file
+
+    Returns:
+        The columns of the extract in file order (see the module docstring)
+        as int64 arrays, and the number of lines
+
+    Raises:
+        TimestampExtractError: If a timestamp is beyond the int64 range
+    """
+    columns = [array("q") for _ in range(10)]
+    records, missing, invalid = columns[:4], columns[4:7], columns[7:]
+
+    line_number = 0
+    offset = 0
+    for line_number, line in enumerate(iter_range_lines(path), start=1):
+        try:
+            timestamps = parse_otlp_timestamps(line)
+        except OTLPParseError:
+            _append_row(invalid, line_number, offset, len(line))
+            offset += len(line)
+            continue
+
+        for record_index, timestamp in enumerate(timestamps):
+            if timestamp is None:
+                _append_row(missing, line_number, record_index, offset)
+            elif _INT64_MIN <= timestamp <= _INT64_MAX:
+                _append_row(records, timestamp, line_number, record_index, offset)
+            else:
+                raise TimestampExtractError(
+                    f"Line {line_number}: timeUnixNano {timestamp} is beyond "
+                    "the int64 range"
+                )
+        offset += len(line)
+
+    return [np.frombuffer(column, dtype=np.int64) for column in columns], line_number
+
+
+def _append_row(columns: list["array[int]"], *values: int) -> None:
+    for column, value in zip(columns, values):
+        column.append(value)
+
+
+class TimestampExtract:
+    """A memory-mapped sorted timestamp extract of a JSONL file."""
+
+    def __init__(self, extract_path: Path) -> None:
+        """
+        Open an extract file.
+
+        Args:
+            extract_path: Path of the extract
+
+        Raises:
+            TimestampExtractError: If the file is not a complete extract
+        """
+        with open(extract_path, "rb") as file:
+            header = file.read(_HEADER.size)
+            size = os.fstat(file.fileno()).st_size
+        try:
+            magic, *source, lines, records, missing, invalid = _HEADER.unpack(header)
+        except struct.error as e:
+            raise TimestampExtractError(f"Truncated extract {extract_path}") from e
+        values = 4 * records + 3 * missing + 3 * invalid
+        if magic != _MAGIC or size != _HEADER.size + 8 * values:
+            raise TimestampExtractError(f"Invalid extract {extract_path}")
+
+        # Size, modification time and digest of the source file
+        self._source = cast(tuple[int, int, bytes], tuple(source))
+        self.lines: int = lines
+        self.records: int = records
+        self.missing: int = missing
+        self.invalid: int = invalid
+
+        data: Any = np.zeros(0, dtype=np.int64)
+        if values:
+            data = np.memmap(
+                extract_path, dtype="<i8", mode="r", offset=_HEADER.size, shape=values
+            )
+        bounds = np.cumsum([0] + [records] * 4 + [missing] * 3 + [invalid] * 3)
+        self._columns: list[Any] = [
+            data[start:end] for start, end in zip(bounds, bounds[1:])
+        ]
+
+    def __enter__(self) -> "TimestampExtract":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory-mapped columns."""
+        self._columns = []
+
+    @property
+    def times(self) -> Any:
+        """timeUnixNano of the timestamped records, ascending."""
+        return self._columns[0]
+
+    def matches(self, path: Path) -> bool:
+        """
+        Check whether the extract is up to date with its source file.
+
+        Args:
+            path: Path of the source file
+
+        Returns:
+            True if size, modification time and digest of the file are
+            unchanged (see source_digest)
+        """
+        stat = path.stat()
+        if (stat.st_size, stat.st_mtime_ns) != self._source[:2]:
+            return False
+        return source_digest(path) == self._source[2]
+
+    def count(self, start_ns: int, end_ns: int) -> tuple[int, int, int]:
+        """
+        Count the timestamped records before, inside and after a time range.
+
+        Both ends of the range are inclusive, as in check_timestamp_range.
+
+        Args:
+            start_ns: Start of time range in nanoseconds
+            end_ns: End of time range in nanoseconds
+
+        Returns:
+            Tuple of (in range, too early, too late)
+        """
+        low, high = self._bounds(start_ns, end_ns)
+        return high - low, low, self.records - high
+
+    def add_skew(self, skew: "SkewHistogram", start_ns: int, end_ns: int) -> None:
+        """
+        Add the distances of the records outside a time range to the range.
+
+        Args:
+            skew: Histograms to update (see skew_histogram)
+            start_ns: Start of time range in nanoseconds
+            end_ns: End of time range in nanoseconds
+        """
+        low, high = self._bounds(start_ns, end_ns)
+        # In blocks, as the Python ints of tolist (which cannot overflow)
+        # take several times the memory of the column
+        for block in range(0, low, _SKEW_BLOCK_SIZE):
+            early = self.times[block : min(block + _SKEW_BLOCK_SIZE, low)].tolist()
+            skew.too_early.add_many(
+                start_ns - time_unix_nano for time_unix_nano in early
+            )
+        for block in range(high, self.records, _SKEW_BLOCK_SIZE):
+            late = self.times[block : block + _SKEW_BLOCK_SIZE].tolist()
+            skew.too_late.add_many(time_unix_nano - end_ns for time_unix_nano in late)
+
+    def iter_records(
+        self, start_ns: int, end_ns: int, include_in_range: bool = False
+    ) -> Iterator[LogRecord]:
+        """
+        Get the records to report for a time range, in file order.
+
+        Args:
+            start_ns: Start of time range in nanoseconds
+            end_ns: End of time range in nanoseconds
+            include_in_range: Whether to include in-range records
+
+        Yields:
+            LogRecord without raw data of every record outside the range
+            (or of every record) and of every record without a timestamp
+        """
+        low, high = self._bounds(start_ns, end_ns)
+        if include_in_range:
+            selected: Any = slice(None)
+        else:
+            selected = np.r_[0:low, high : self.records]
+
+        times = self.times[selected]
+        # The records without timestamp follow the selected ones
+        lines, indices, offsets = (
+            np.concatenate([column[selected], missing])
+            for column, missing in zip(self._columns[1:4], self._columns[4:7])
+        )
+        for position in np.lexsort((indices, lines)):
+            yield LogRecord(
+                time_unix_nano=(
+                    int(times[position]) if position < len(times) else None
+                ),
+                line_number=int(lines[position]),
+                record_index=int(indices[position]),
+                raw_data=NO_RAW_DATA,
+                byte_offset=int(offsets[position]),
+            )
+
+    def iter_invalid_lines(self) -> Iterator[tuple[int, int, int]]:
+        """
+        Get the lines that could not be parsed.
+
+        Yields:
+            Tuples of (line number, byte offset, length) in file order
+        """
+        lines, offsets, lengths = self._columns[7:]
+        for line, offset, length in zip(
+            lines.tolist(), offsets.tolist(), lengths.tolist()
+        ):
+            yield line, offset, length
+
+    def _bounds(self, start_ns: int, end_ns: int) -> tuple[int, int]:
+        """Positions of the first in-range and the first too-late record."""
+        # All extracted timestamps fit int64, so clamping keeps the order
+        start_ns = min(max(start_ns, _INT64_MIN), _INT64_MAX)
+        end_ns = min(max(end_ns, _INT64_MIN), _INT64_MAX)
+        low = int(np.searchsorted(self.times, np.int64(start_ns), side="left"))
+        high = int(np.searchsorted(self.times, np.int64(end_ns), side="right"))
+        return low, max(low, high)
+
+
+def open_extract(path: Path) -> Optional[TimestampExtract]:
+    """
+    Open the sorted timestamp extract of a file if it exists and is up to date.
+
+    Args:
+        path: Path of the JSONL file
+
+    Returns:
+        The extract, or None if there is no usable extract
+    """
+    extract_path = extract_path_for(path)
+    if not extract_path.is_file():
+        return None
+    try:
+        extract = TimestampExtract(extract_path)
+    except TimestampExtractError:
+        return None
+    if not extract.matches(path):
+        extract.close()
+        return None
+    return extract
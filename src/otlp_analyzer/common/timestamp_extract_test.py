@@ -0,0 +1,208 @@
+"""Tests for timestamp_extract module."""
+
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+# pylint: disable=wrong-import-position
+from otlp_analyzer.common import timestamp_extract
+from otlp_analyzer.common.skew_histogram import SkewHistogram
+from otlp_analyzer.common.timestamp_extract import (
+    TimestampExtract,
+    TimestampExtractError,
+    build_extract,
+    extract_path_for,
+    open_extract,
+)
+
+LINES = (
+    '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"300"},{"timeUnixNano":"100"},{}]}]}]}\n',
+    "{invalid json\n",
+    "\n",
+    '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"200"},{"timeUnixNano":"100"}]}]}]}\n',
+    '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{}]}]}]}',
+)
+
+
+@pytest.fixture(name="path")
+def fixture_path(tmp_path: Path) -> Path:
+    """Write LINES to a JSONL file."""
+    path = tmp_path / "logs.jsonl"
+    path.write_text("".join(LINES))
+    return path
+
+
+def record_tuples(
+    extract: TimestampExtract, start_ns: int, end_ns: int, include_in_range: bool
+) -> list[tuple[int, int, object, int]]:
+    """Get the reported records as (line, record index, time, byte offset)."""
+    return [
+        (r.line_number, r.record_index, r.time_unix_nano, r.byte_offset)
+        for r in extract.iter_records(start_ns, end_ns, include_in_range)
+    ]
+
+
+class TestBuildExtract:
+    """Test writing and reading extracts."""
+
+    def test_columns(self, path: Path) -> None:
+        """Test that timestamps are sorted and positions kept."""
+        assert build_extract(path) == 6
+
+        with TimestampExtract(extract_path_for(path)) as extract:
+            assert (extract.lines, extract.records) == (5, 4)
+            assert (extract.missing, extract.invalid) == (2, 1)
+            assert extract.times.tolist() == [100, 100, 200, 300]
+            assert list(extract.iter_invalid_lines()) == [
+                (2, len(LINES[0]), len(LINES[1]))
+            ]
+            line_4 = sum(len(line) for line in LINES[:3])
+            line_5 = line_4 + len(LINES[3])
+            assert record_tuples(extract, 0, 1000, include_in_range=True) == [
+                (1, 0, 300, 0),
+                (1, 1, 100, 0),
+                (1, 2, None, 0),
+                (4, 0, 200, line_4),
+                (4, 1, 100, line_4),
+                (5, 0, None, line_5),
+            ]
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        """Test extracting a file without lines."""
+        path = tmp_path / "empty.jsonl"
+        path.write_bytes(b"")
+
+        assert build_extract(path) == 0
+        with TimestampExtract(extract_path_for(path)) as extract:
+            assert extract.count(0, 10) == (0, 0, 0)
+            assert not list(extract.iter_records(0, 10, include_in_range=True))
+
+    def test_compressed_file(self, tmp_path: Path) -> None:
+        """Test that compressed files are rejected."""
+        path = tmp_path / "logs.jsonl.gz"
+        path.write_bytes(gzip.compress("".join(LINES).encode()))
+
+        with pytest.raises(TimestampExtractError, match="compressed"):
+            build_extract(path)
+
+    def test_timestamp_beyond_int64(self, tmp_path: Path) -> None:
+        """Test that timestamps beyond the int64 range are rejected."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"99999999999999999999"}]}]}]}\n'
+        )
+
+        with pytest.raises(TimestampExtractError, match="Line 1"):
+            build_extract(path)
+        assert not extract_path_for(path).exists()
+
+
+class TestQueries:
+    """Test range queries."""
+
+    @pytest.mark.parametrize(
+        ("start_ns", "end_ns", "expected"),
+        [
+            (100, 300, (4, 0, 0)),
+            (101, 299, (1, 2, 1)),
+            (200, 200, (1, 2, 1)),
+            (0, 99, (0, 0, 4)),
+            (301, 400, (0, 4, 0)),
+            (-(2**70), 2**70, (4, 0, 0)),
+        ],
+    )
+    def test_count(
+        self, path: Path, start_ns: int, end_ns: int, expected: tuple[int, int, int]
+    ) -> None:
+        """Test counting records with inclusive range ends."""
+        build_extract(path)
+
+        with TimestampExtract(extract_path_for(path)) as extract:
+            assert extract.count(start_ns, end_ns) == expected
+
+    def test_add_skew(self, path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the distances of records outside the range are added."""
+        build_extract(path)
+        monkeypatch.setattr(timestamp_extract, "_SKEW_BLOCK_SIZE", 1)
+        skew = SkewHistogram()
+
+        with TimestampExtract(extract_path_for(path)) as extract:
+            extract.add_skew(skew, 150, 250)
+
+        assert (skew.too_early.total, skew.too_early.max_value) == (2, 50)
+        assert (skew.too_late.total, skew.too_late.max_value) == (1, 50)
+
+    def test_offenders_in_file_order(self, path: Path) -> None:
+        """Test that records outside the range and without timestamp are reported."""
+        build_extract(path)
+
+        with TimestampExtract(extract_path_for(path)) as extract:
+            reported = record_tuples(extract, 150, 250, include_in_range=False)
+
+        assert [record[:2] for record in reported] == [
+            (1, 0),
+            (1, 1),
+            (1, 2),
+            (4, 1),
+            (5, 0),
+        ]
+
+
+class TestOpenExtract:
+    """Test finding usable extracts."""
+
+    def test_up_to_date(self, path: Path) -> None:
+        """Test opening the extract of an unchanged file."""
+        build_extract(path)
+
+        extract = open_extract(path)
+
+        assert extract is not None
+        with extract:
+            assert extract.records == 4
+
+    def test_missing(self, path: Path) -> None:
+        """Test files without extract."""
+        assert open_extract(path) is None
+
+    def test_modified_time(self, path: Path) -> None:
+        """Test that the extract of a touched file is ignored."""
+        build_extract(path)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        assert open_extract(path) is None
+
+    def test_modified_content(self, path: Path) -> None:
+        """Test that content changes keeping size and mtime are detected."""
+        build_extract(path)
+        stat = path.stat()
+        path.write_text("".join(LINES).replace("300", "400"))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert open_extract(path) is None
+
+    def test_digest_samples(self, path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the end of the file is hashed as well as its start."""
+        monkeypatch.setattr(timestamp_extract, "SAMPLE_SIZE", 16)
+        build_extract(path)
+        stat = path.stat()
+        path.write_text("".join(LINES)[:-4] + "{}]}")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert open_extract(path) is None
+
+    @pytest.mark.parametrize(
+        "content", [b"", b"OTSCOL", b"NOTANEXT" + bytes(80), b"OTSCOL01" + bytes(81)]
+    )
+    def test_invalid(self, path: Path, content: bytes) -> None:
+        """Test that damaged extract files are ignored."""
+        extract_path_for(path).write_bytes(content)
+
+        assert open_extract(path) is None
+        with pytest.raises(TimestampExtractError):
+            TimestampExtract(extract_path_for(path))
@@ -0,0 +1,262 @@
+"""Sidecar index files summarizing the timestamps of each line of a JSONL file.
+
+An index stores, for every line of its source file, the byte range of the
+line and the minimum, maximum and number of its timeUnixNano values. Range
+checks use it to count lines that lie entirely inside (or outside) a time
+range without decoding them.
+
+File layout (little endian): a header of magic, source size, source mtime
+and line count, followed by one fixed-size entry per line.
+"""
+
+import mmap
+import os
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from otlp_analyzer.common.compression import file_compression
+from otlp_analyzer.common.file_chunks import iter_range_lines
+from otlp_analyzer.common.otlp_parser import OTLPParseError, parse_otlp_timestamps
+
+INDEX_SUFFIX = ".tsidx"
+
+_MAGIC = b"OTSIDX01"
+_HEADER = struct.Struct("<8sQqQ")
+# byte offset, length, min, max, records, records without timestamp, flags
+_ENTRY = struct.Struct("<QIqqIIB")
+
+# Entry flags
+INVALID_LINE = 1  # The line cannot be parsed
+OUT_OF_BOUNDS = 2  # A timestamp does not fit int64; min and max are clamped
+
+_ENTRIES_PER_BLOCK = 65536
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+class TimestampIndexError(Exception):
+    """Raised when an index cannot be built or read."""
+
+
+@dataclass(slots=True)
+class LineCounts:
+    """Range check counts of a line, as far as they follow from its entry."""
+
+    in_range: int
+    too_early: int
+    too_late: int
+    errors: int
+
+
+def index_path_for(path: Path) -> Path:
+    """
+    Get the path of the sidecar index of a file.
+
+    Args:
+        path: Path of the JSONL file
+
+    Returns:
+        The path with INDEX_SUFFIX appended
+    """
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def build_index(path: Path, index_path: Optional[Path] = None) -> int:
+    """
+    Write the timestamp index of a JSONL file.
+
+    The index is written to a temporary file that replaces index_path once
+    complete, so readers never see a partial index.
+
+    Args:
+        path: Path of the uncompressed JSONL file
+        index_path: Where to write the index (default: index_path_for(path))
+
+    Returns:
+        Number of lines indexed
+
+    Raises:
+        TimestampIndexError: If the file is compressed
+    """
+    if file_compression(path) is not None:
+        raise TimestampIndexError(f"Cannot index compressed file {path}")
+    if index_path is None:
+        index_path = index_path_for(path)
+
+    stat = path.stat()
+    temporary_path = index_path.with_name(index_path.name + ".tmp")
+    lines = 0
+    with open(temporary_path, "wb") as index:
+        index.write(_HEADER.pack(_MAGIC, 0, 0, 0))
+        offset = 0
+        for line in iter_range_lines(path):
+            index.write(_index_entry(line, offset))
+            offset += len(line)
+            lines += 1
+        index.seek(0)
+        index.write(_HEADER.pack(_MAGIC, stat.st_size, stat.st_mtime_ns, lines))
+    os.replace(temporary_path, index_path)
+    return lines
+
+
+def _index_entry(line: bytes, offset: int) -> bytes:
+    """
+    Summarize the timestamps of a line as an index entry.
+
+    Args:
+        line: The line, including its line ending
+        offset: Byte offset of the line in the file
+
+    Returns:
+        The packed entry
+    """
+    try:
+        timestamps = parse_otlp_timestamps(line)
+    except OTLPParseError:
+        return _ENTRY.pack(offset, len(line), 0, 0, 0, 0, INVALID_LINE)
+
+    valid = [timestamp for timestamp in timestamps if timestamp is not None]
+    if not valid:
+        return _ENTRY.pack(offset, len(line), 0, 0, len(timestamps), len(timestamps), 0)
+
+    minimum = min(valid)
+    maximum = max(valid)
+    flags = 0
+    if minimum < _INT64_MIN or maximum > _INT64_MAX:
+        flags = OUT_OF_BOUNDS
+        minimum = max(min(minimum, _INT64_MAX), _INT64_MIN)
+        maximum = max(min(maximum, _INT64_MAX), _INT64_MIN)
+    missing = len(timestamps) - len(valid)
+    return _ENTRY.pack(
+        offset, len(line), minimum, maximum, len(timestamps), missing, flags
+    )
+
+
+class TimestampIndex:
+    """A memory-mapped timestamp index of a JSONL file."""
+
+    def __init__(self, index_path: Path) -> None:
+        """
+        Open an index file.
+
+        Args:
+            index_path: Path of the index
+
+        Raises:
+            TimestampIndexError: If the file is not a complete index
+        """
+        with open(index_path, "rb") as file:
+            try:
+                self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise TimestampIndexError(f"Empty index {index_path}") from e
+
+        try:
+            magic, size, mtime_ns, lines = _HEADER.unpack_from(self._mapping)
+        except struct.error as e:
+            self.close()
+            raise TimestampIndexError(f"Truncated index {index_path}") from e
+        if magic != _MAGIC or len(self._mapping) != _HEADER.size + lines * _ENTRY.size:
+            self.close()
+            raise TimestampIndexError(f"Invalid index {index_path}")
+
+        self.source_size: int = size
+        self.source_mtime_ns: int = mtime_ns
+        self.lines: int = lines
+
+    def __enter__(self) -> "TimestampIndex":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the index file."""
+        self._mapping.close()
+
+    def matches(self, path: Path) -> bool:
+        """
+        Check whether the index is up to date with its source file.
+
+        Args:
+            path: Path of the source file
+
+        Returns:
+            True if size and modification time of the file are unchanged
+        """
+        stat = path.stat()
+        return (stat.st_size, stat.st_mtime_ns) == (
+            self.source_size,
+            self.source_mtime_ns,
+        )
+
+    def iter_entries(self) -> Iterator[tuple[int, int, int, int, int, int, int]]:
+        """
+        Iterate over the line entries in line order.
+
+        Yields:
+            Tuples of (byte offset, length, min, max, records, records
+            without timestamp, flags); min and max are 0 for lines without
+            valid timestamps
+        """
+        # Unpack copied blocks, as unpacking a view of the mapping would keep
+        # it from being closed
+        block_size = _ENTRY.size * _ENTRIES_PER_BLOCK
+        for start in range(_HEADER.size, len(self._mapping), block_size):
+            yield from _ENTRY.iter_unpack(self._mapping[start : start + block_size])
+
+
+def open_index(path: Path) -> Optional[TimestampIndex]:
+    """
+    Open the sidecar index of a file if it exists and is up to date.
+
+    Args:
+        path: Path of the JSONL file
+
+    Returns:
+        The index, or None if there is no usable index
+    """
+    index_path = index_path_for(path)
+    if not index_path.is_file():
+        return None
+    try:
+        index = TimestampIndex(index_path)
+    except TimestampIndexError:
+        return None
+    if not index.matches(path):
+        index.close()
+        return None
+    return index
+
+
+def line_counts(
+    entry: tuple[int, int, int, int, int, int, int], start_ns: int, end_ns: int
+) -> Optional[LineCounts]:
+    """
+    Get the range check counts of a line from its index entry.
+
+    Args:
+        entry: The entry of the line (see TimestampIndex.iter_entries)
+        start_ns: Start of time range in nanoseconds
+        end_ns: End of time range in nanoseconds
+
+    Returns:
+        The counts, or None if the line straddles a range boundary (or
+        cannot be parsed) and has to be decoded to count its records
+    """
+    _offset, _length, minimum, maximum, records, missing, flags = entry
+    if flags:
+        return None
+
+    valid = records - missing
+    if valid == 0 or (start_ns <= minimum and maximum <= end_ns):
+        return LineCounts(valid, 0, 0, missing)
+    if maximum < start_ns:
+        return LineCounts(0, valid, 0, missing)
+    if minimum > end_ns:
+        return LineCounts(0, 0, valid, missing)
+    return None
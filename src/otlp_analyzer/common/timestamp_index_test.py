@@ -0,0 +1,160 @@
+"""Tests for timestamp_index module."""
+
+import gzip
+import os
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from otlp_analyzer.common.timestamp_index import (
+    INVALID_LINE,
+    OUT_OF_BOUNDS,
+    LineCounts,
+    TimestampIndex,
+    TimestampIndexError,
+    build_index,
+    index_path_for,
+    line_counts,
+    open_index,
+)
+
+LINES = (
+    '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"300"},{"timeUnixNano":"100"},{}]}]}]}\n',
+    "{invalid json\n",
+    "\n",
+    '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"99999999999999999999"}]}]}]}\n',
+    '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{}]}]}]}',
+)
+
+
+@pytest.fixture(name="path")
+def fixture_path(tmp_path: Path) -> Path:
+    """Write LINES to a JSONL file."""
+    path = tmp_path / "logs.jsonl"
+    path.write_text("".join(LINES))
+    return path
+
+
+class TestBuildIndex:
+    """Test writing and reading indexes."""
+
+    def test_entries(self, path: Path) -> None:
+        """Test that every line gets an entry with its byte range and timestamps."""
+        assert build_index(path) == len(LINES)
+
+        with TimestampIndex(index_path_for(path)) as index:
+            entries = list(index.iter_entries())
+
+        offsets = [0]
+        for line in LINES:
+            offsets.append(offsets[-1] + len(line))
+        assert [entry[:2] for entry in entries] == [
+            (offsets[i], len(line)) for i, line in enumerate(LINES)
+        ]
+        assert [entry[2:] for entry in entries] == [
+            (100, 300, 3, 1, 0),
+            (0, 0, 0, 0, INVALID_LINE),
+            (0, 0, 0, 0, 0),
+            (2**63 - 1, 2**63 - 1, 1, 0, OUT_OF_BOUNDS),
+            (0, 0, 1, 1, 0),
+        ]
+
+    def test_custom_index_path(self, path: Path, tmp_path: Path) -> None:
+        """Test writing the index somewhere else."""
+        index_path = tmp_path / "other.idx"
+
+        build_index(path, index_path)
+
+        with TimestampIndex(index_path) as index:
+            assert index.lines == len(LINES)
+        assert not index_path_for(path).exists()
+        assert not (tmp_path / "other.idx.tmp").exists()
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        """Test indexing a file without lines."""
+        path = tmp_path / "empty.jsonl"
+        path.write_bytes(b"")
+
+        assert build_index(path) == 0
+        with TimestampIndex(index_path_for(path)) as index:
+            assert not list(index.iter_entries())
+
+    def test_compressed_file(self, tmp_path: Path) -> None:
+        """Test that compressed files are rejected."""
+        path = tmp_path / "logs.jsonl.gz"
+        path.write_bytes(gzip.compress("".join(LINES).encode()))
+
+        with pytest.raises(TimestampIndexError, match="compressed"):
+            build_index(path)
+
+
+class TestOpenIndex:
+    """Test finding usable indexes."""
+
+    def test_up_to_date(self, path: Path) -> None:
+        """Test opening the index of an unchanged file."""
+        build_index(path)
+
+        index = open_index(path)
+
+        assert index is not None
+        with index:
+            assert index.lines == len(LINES)
+
+    def test_missing(self, path: Path) -> None:
+        """Test files without index."""
+        assert open_index(path) is None
+
+    def test_stale(self, path: Path) -> None:
+        """Test that the index of a modified file is ignored."""
+        build_index(path)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        assert open_index(path) is None
+
+    @pytest.mark.parametrize(
+        "content", [b"", b"OTSIDX", b"NOTANIDX" + bytes(24), b"OTSIDX01" + bytes(25)]
+    )
+    def test_invalid(self, path: Path, content: bytes) -> None:
+        """Test that damaged index files are ignored."""
+        index_path_for(path).write_bytes(content)
+
+        assert open_index(path) is None
+        with pytest.raises(TimestampIndexError):
+            TimestampIndex(index_path_for(path))
+
+
+class TestLineCounts:
+    """Test counting lines from their entries."""
+
+    @pytest.mark.parametrize(
+        ("minimum", "maximum", "expected"),
+        [
+            (100, 200, LineCounts(3, 0, 0, 1)),
+            (10, 20, LineCounts(0, 3, 0, 1)),
+            (300, 400, LineCounts(0, 0, 3, 1)),
+            (100, 100, LineCounts(3, 0, 0, 1)),
+            (50, 150, None),
+            (150, 250, None),
+            (50, 250, None),
+        ],
+    )
+    def test_ranges(
+        self, minimum: int, maximum: int, expected: Optional[LineCounts]
+    ) -> None:
+        """Test lines inside, before, after and across the range [100, 200]."""
+        entry = (0, 10, minimum, maximum, 4, 1, 0)
+
+        assert line_counts(entry, 100, 200) == expected
+
+    def test_without_timestamps(self) -> None:
+        """Test that records without timestamps are errors."""
+        assert line_counts((0, 10, 0, 0, 2, 2, 0), 100, 200) == LineCounts(0, 0, 0, 2)
+        assert line_counts((0, 1, 0, 0, 0, 0, 0), 100, 200) == LineCounts(0, 0, 0, 0)
+
+    @pytest.mark.parametrize("flags", [INVALID_LINE, OUT_OF_BOUNDS])
+    def test_flagged(self, flags: int) -> None:
+        """Test that flagged lines have to be decoded."""
+        assert line_counts((0, 10, 150, 150, 1, 0, flags), 100, 200) is None
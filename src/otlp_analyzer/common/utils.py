@@ -1,28 +1,41 @@
 """Utility functions for formatting timestamps and time differences."""
 
-from datetime import datetime, timezone
+import functools
+import time
 
 
 def format_timestamp(timestamp_ns: int) -> str:
     """
     Format a timestamp in nanoseconds as an ISO 8601 string.
 
+    The timestamp is truncated to milliseconds using integer arithmetic only,
+    so the result is exact for every nanosecond timestamp. Reported records
+    tend to come in runs from the same few seconds, so the date and time of
+    recently formatted seconds are cached.
+
     Args:
         timestamp_ns: Timestamp in nanoseconds since Unix epoch
 
     Returns:
         ISO 8601 formatted string (e.g., "2020-01-01T00:00:00.000Z")
     """
-    timestamp_s = timestamp_ns / 1e9
-    dt = datetime.fromtimestamp(timestamp_s, tz=timezone.utc)
-    # Format with milliseconds
-    return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    milliseconds = nanoseconds // 1_000_000
+    return f"{_format_second(seconds)}.{milliseconds:03d}Z"
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_second(seconds: int) -> str:
+    """Format the date and time of a whole second since Unix epoch."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
 
 
 def format_difference(difference_ns: int, reference: str = "") -> str:
     """
     Format a time difference in nanoseconds as a human-readable string.
 
+    The difference is truncated to milliseconds using integer arithmetic only.
+
     Args:
         difference_ns: Time difference in nanoseconds (can be negative)
         reference: Reference point (e.g., "before start", "after end")
@@ -30,26 +43,18 @@ def format_difference(difference_ns: int, reference: str = "") -> str:
     Returns:
         Human-readable duration string
     """
-    abs_diff_ns = abs(difference_ns)
-
-    # Convert to seconds and extract components
-    total_seconds = abs_diff_ns / 1e9
-    days = int(total_seconds // 86400)
-    remaining_seconds = total_seconds % 86400
-    hours = int(remaining_seconds // 3600)
-    remaining_seconds %= 3600
-    minutes = int(remaining_seconds // 60)
-    seconds = remaining_seconds % 60
-
-    # Format the duration
-    parts = []
+    # Split into components
+    milliseconds = abs(difference_ns) // 1_000_000
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+
+    # Format the duration (printf-style formatting is faster than format specs)
+    # pylint: disable-next=consider-using-f-string
+    duration = "%02d:%02d:%02d.%03d" % (hours, minutes, seconds, milliseconds)
     if days > 0:
-        parts.append(f"{days} day{'s' if days != 1 else ''}")
-
-    time_str = f"{hours:02d}:{minutes:02d}:{seconds:06.3f}"
-    parts.append(time_str)
-
-    duration = ", ".join(parts)
+        duration = f"{days} day{'s' if days != 1 else ''}, {duration}"
 
     # Add reference if provided
     if reference:
@@ -1,5 +1,10 @@
 """Tests for utils module."""
 
+import random
+from datetime import datetime, timezone
+
+import pytest
+
 from otlp_analyzer.common.utils import format_difference, format_timestamp
 
 
@@ -27,6 +32,36 @@ class TestFormatTimestamp:
         result = format_timestamp(timestamp_ns)
         assert result == "2020-12-31T23:59:59.999Z"
 
+    @pytest.mark.parametrize(
+        ("timestamp_ns", "expected"),
+        [
+            (1609459199999999999, "2020-12-31T23:59:59.999Z"),
+            (1592224245000999999, "2020-06-15T12:30:45.000Z"),
+            (0, "1970-01-01T00:00:00.000Z"),
+            (-1, "1969-12-31T23:59:59.999Z"),
+            (2**64 - 1, "2554-07-21T23:34:33.709Z"),
+        ],
+    )
+    def test_truncate_nanoseconds(self, timestamp_ns: int, expected: str) -> None:
+        """Test that nanoseconds are truncated exactly, without float rounding."""
+        assert format_timestamp(timestamp_ns) == expected
+
+    def test_matches_datetime(self) -> None:
+        """Test random timestamps against datetime, also when cached."""
+        generator = random.Random(42)
+        for _ in range(1000):
+            timestamp_ns = generator.randrange(2**63)
+            seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+            expected = (
+                datetime.fromtimestamp(seconds, tz=timezone.utc).strftime(
+                    "%Y-%m-%dT%H:%M:%S"
+                )
+                + f".{nanoseconds // 1_000_000:03d}Z"
+            )
+
+            assert format_timestamp(timestamp_ns) == expected
+            assert format_timestamp(timestamp_ns) == expected
+
 
 class TestFormatDifference:
     """Test time difference formatting."""
@@ -89,3 +124,11 @@ class TestFormatDifference:
         result = format_difference(diff_ns)
         assert "73 days" in result
         assert "14:25:30.123" in result
+
+    def test_format_exact(self) -> None:
+        """Test the whole string, truncated to milliseconds."""
+        assert format_difference(59_999_999_999) == "00:00:59.999"
+        assert format_difference(-(2 * 86400 + 1) * 10**9 - 1, "after end") == (
+            "2 days, 00:00:01.000 after end"
+        )
+        assert format_difference(2**64 - 1) == "213503 days, 23:34:33.709"
@@ -0,0 +1,90 @@
+"""Checking stdin or several files against several time windows at once."""
+
+import sys
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from otlp_analyzer.common.binary_input import binary_lines
+from otlp_analyzer.common.file_chunks import iter_range_lines
+from otlp_analyzer.common.otlp_parser import Line
+from otlp_analyzer.common.reports import (
+    ReportLimits,
+    ReportWriter,
+    error_printer,
+    print_reports,
+    report_mode,
+)
+from otlp_analyzer.common.time_windows import (
+    WindowCounts,
+    WindowSet,
+    format_window_result,
+    iter_window_results,
+)
+from otlp_analyzer.common.timestamp_check import Summary
+
+
+def process_windows(  # pylint: disable=too-many-arguments
+    paths: Sequence[Path],
+    window_set: WindowSet,
+    verbose: bool,
+    quiet: bool,
+    *,
+    limits: Optional[ReportLimits] = None,
+    batch_size: Optional[int] = None,
+) -> tuple[list[Summary], bool]:
+    """
+    Check the timestamps of stdin or several files against several time windows.
+
+    Every line is parsed once: each record is classified against all windows
+    by a binary search over their sorted boundaries (see time_windows).
+    Records are reported if they are out of range in any window, or always
+    when verbose. Sidecar indexes and extracts are not used.
+
+    Args:
+        paths: Paths of the JSONL files (stdin if empty)
+        window_set: The windows to check against
+        verbose: Show all records (including in-range)
+        quiet: Only show summaries
+        limits: Limits on the results printed and when to stop reading (see
+                reports.ReportLimits)
+        batch_size: Records per batch of columnar checks (see
+                    record_batch.iter_record_batches)
+
+    Returns:
+        Tuple of (summaries, has_issues) with one Summary per window, for all
+        files together
+    """
+    counts = WindowCounts(window_set)
+    streams: list[tuple[Optional[Path], Iterable[Line]]] = (
+        [(path, iter_range_lines(path)) for path in paths]
+        if paths
+        else [(None, binary_lines(sys.stdin))]
+    )
+    for path, stream in streams:
+        if len(paths) > 1 and not quiet:
+            click.echo(f"==> {path} <==")
+        output = ReportWriter()
+        results = iter_window_results(
+            stream,
+            counts,
+            report=report_mode(verbose, quiet, limits),
+            on_error=error_printer(quiet, limits, output),
+            batch_size=batch_size,
+        )
+        print_reports(
+            results,
+            lambda result: format_window_result(result, window_set) + "\n",
+            lambda result: not result.statuses
+            or any(status != "in_range" for status in result.statuses),
+            quiet,
+            limits,
+            output=output,
+        )
+        if limits is not None and limits.stopped:
+            break
+
+    summaries = counts.summaries()
+    return summaries, any(summary.has_issues() for summary in summaries)
@@ -0,0 +1,78 @@
+"""Tests for window_check module."""
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from otlp_analyzer.common.reports import format_window_summaries
+from otlp_analyzer.common.time_windows import WindowSet, parse_window
+from otlp_analyzer.common.timestamp_check import Summary
+from otlp_analyzer.common.window_check import process_windows
+
+
+class TestProcessWindows:
+    """Test checking against several time windows."""
+
+    INPUT_DATA = (
+        '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"},{"timeUnixNano":"1576408200000000000"}]}]}]}\n'
+        "{invalid json\n"
+    )
+
+    def test_report(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test reporting the status in every window and per-window summaries."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        window_set = WindowSet(
+            [
+                parse_window("june=2020-06-01..2020-06-30"),
+                parse_window("year=2020-01-01..2020-12-31"),
+            ]
+        )
+
+        summaries, has_issues = process_windows([path], window_set, False, False)
+
+        assert has_issues
+        records, error = capsys.readouterr().out.split("\n\n")
+        assert records == (
+            "Line 1, Record 1: OUT OF RANGE in 2 of 2 windows\n"
+            "  timeUnixNano:    2019-12-15T11:10:00.000Z (1576408200000000000)\n"
+            "  june:            too early (168 days, 12:50:00.000 before start)\n"
+            "  year:            too early (16 days, 12:50:00.000 before start)"
+        )
+        assert error.startswith("Line 2: ERROR - Invalid JSON")
+        assert format_window_summaries(summaries, window_set) == (
+            "---\n"
+            "Summary:\n"
+            "  Total lines processed: 2\n"
+            "  Total log records: 2\n"
+            "  Errors: 1\n"
+            "  Window june (2020-06-01T00:00:00.000Z - 2020-06-30T00:00:00.000Z):\n"
+            "    In range: 1\n"
+            "    Out of range (too early): 1\n"
+            "    Out of range (too late): 0\n"
+            "  Window year (2020-01-01T00:00:00.000Z - 2020-12-31T00:00:00.000Z):\n"
+            "    In range: 1\n"
+            "    Out of range (too early): 1\n"
+            "    Out of range (too late): 0"
+        )
+
+    def test_quiet_input_files(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test one summary per window for several files together."""
+        paths = [tmp_path / "a.jsonl", tmp_path / "b.jsonl.gz"]
+        paths[0].write_text(self.INPUT_DATA)
+        paths[1].write_bytes(gzip.compress(self.INPUT_DATA.encode()))
+        window_set = WindowSet(
+            [
+                parse_window("a=2019-01-01..2019-12-31"),
+                parse_window("b=2020-01-01..2020-12-31"),
+            ]
+        )
+
+        summaries, has_issues = process_windows(paths, window_set, False, True)
+
+        assert has_issues
+        assert not capsys.readouterr().out
+        assert summaries == [Summary(4, 4, 2, 0, 2, 2), Summary(4, 4, 2, 2, 0, 2)]
@@ -0,0 +1,149 @@
+"""CLI tool running several analyses of OTLP logs over a single read of the input."""
+
+import sys
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+import click
+
+from otlp_analyzer.common.analyzers import (
+    ANALYZERS,
+    AnalysisOptions,
+    Analyzer,
+    AnalyzerError,
+    analyze_stream,
+    create_analyzers,
+)
+from otlp_analyzer.common.binary_input import binary_lines
+from otlp_analyzer.common.compression import CompressionError
+from otlp_analyzer.common.file_chunks import iter_range_lines
+from otlp_analyzer.common.json_backend import (
+    BACKEND_NAMES,
+    JSONBackendError,
+    set_default_backend,
+)
+from otlp_analyzer.common.otlp_parser import Line, StreamProgress
+from otlp_analyzer.common.timestamp_parser import TimestampParseError, parse_timestamp
+
+
+def analyzer_options(command: Callable[..., Any]) -> Callable[..., Any]:
+    """Add a flag enabling each registered analyzer, e.g. --check-timestamp."""
+    for name in reversed(ANALYZERS):
+        command = click.option(
+            f"--{name}",
+            is_flag=True,
+            help=ANALYZERS[name].help,
+        )(command)
+    return command
+
+
+def analyze_files(
+    paths: Sequence[Path], analyzers: Sequence[Analyzer]
+) -> StreamProgress:
+    """
+    Analyze stdin or several files as one stream.
+
+    Args:
+        paths: Paths of the JSONL files (stdin if empty)
+        analyzers: The analyzers, finished once all input is read
+
+    Returns:
+        The progress, counting the lines and bytes of all files
+    """
+    streams: Iterable[Iterable[Line]] = (
+        (iter_range_lines(path) for path in paths)
+        if paths
+        else [binary_lines(sys.stdin)]
+    )
+    return analyze_stream((line for stream in streams for line in stream), analyzers)
+
+
+@click.command()
+@analyzer_options
+@click.option(
+    "--start",
+    help="Start of the time range of --check-timestamp",
+)
+@click.option(
+    "--end",
+    help="End of the time range of --check-timestamp",
+)
+@click.option(
+    "--json-backend",
+    type=click.Choice(["auto", *BACKEND_NAMES]),
+    default="auto",
+    show_default=True,
+    help="JSON decoder to use (auto picks the fastest installed one)",
+)
+@click.argument(
+    "input_files",
+    nargs=-1,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+def main(
+    start: Optional[str],
+    end: Optional[str],
+    json_backend: str,
+    input_files: tuple[Path, ...],
+    **enabled: bool,
+) -> None:
+    """
+    Run several analyses of OTLP logs, decoding each line only once.
+
+    Reads JSONL from the INPUT_FILES (or stdin) and prints a report of every
+    enabled analysis. Line numbers count across all INPUT_FILES. Exits with
+    status 1 if any analysis found issues (records out of range, invalid
+    lines or schema violations).
+
+    Examples:
+
+        otlp analyze --stats --schema logs.jsonl
+
+        otlp analyze --check-timestamp --start 2020-01-01 --end 2020-12-31
+        --stats logs-*.jsonl.gz
+    """
+    names = [name for name in ANALYZERS if enabled[name.replace("-", "_")]]
+    if not names:
+        click.echo(
+            "Error: enable at least one analysis: "
+            + ", ".join(f"--{name}" for name in ANALYZERS),
+            err=True,
+        )
+        sys.exit(2)
+
+    try:
+        analyzers = create_analyzers(names, _parse_options(start, end))
+        set_default_backend(json_backend)
+    except (AnalyzerError, JSONBackendError, TimestampParseError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(2)
+
+    try:
+        analyze_files(input_files, analyzers)
+    except CompressionError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(2)
+
+    for analyzer in analyzers:
+        click.echo(analyzer.format_report())
+    sys.exit(1 if any(analyzer.has_issues() for analyzer in analyzers) else 0)
+
+
+def _parse_options(start: Optional[str], end: Optional[str]) -> AnalysisOptions:
+    """
+    Parse the options shared by the analyzers.
+
+    Raises:
+        AnalyzerError: If the time range is empty
+        TimestampParseError: If --start or --end cannot be parsed
+    """
+    start_ns = None if start is None else parse_timestamp(start)
+    end_ns = None if end is None else parse_timestamp(end)
+    if start_ns is not None and end_ns is not None and start_ns >= end_ns:
+        raise AnalyzerError("start time must be before end time")
+    return AnalysisOptions(start_ns, end_ns)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,71 @@
+"""Tests for analyze tool."""
+
+import gzip
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from otlp_analyzer.tools.analyze import main
+
+LINE = '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000","severityText":"INFO"}]}]}]}\n'
+
+
+class TestMain:
+    """Test the command line interface."""
+
+    def test_all_analyzers(self, tmp_path: Path) -> None:
+        """Test printing the report of every enabled analysis."""
+        paths = [tmp_path / "a.jsonl", tmp_path / "b.jsonl.gz"]
+        paths[0].write_text(LINE)
+        paths[1].write_bytes(gzip.compress(LINE.encode() * 2))
+
+        result = CliRunner().invoke(
+            main,
+            ["--check-timestamp", "--start", "2020-01-01", "--end", "2020-12-31"]
+            + ["--stats", "--schema", *map(str, paths)],
+        )
+
+        assert result.exit_code == 0
+        reports = result.output.split("---\n")
+        assert reports[1].startswith("Summary:\n  Total lines processed: 3\n")
+        assert "  In range: 3\n" in reports[1]
+        assert reports[2].startswith("Statistics:\n  Total lines processed: 3\n")
+        assert "    INFO: 3\n" in reports[2]
+        assert reports[3].startswith("Schema:\n")
+        assert "Invalid log records: 0" in reports[3]
+
+    def test_stdin_with_issues(self) -> None:
+        """Test reading stdin, and exiting with 1 if any analysis found issues."""
+        result = CliRunner().invoke(
+            main, ["--schema"], input=LINE + '{"resourceLogs":[{"scopeLogs":3}]}\n{\n'
+        )
+
+        assert result.exit_code == 1
+        assert "  Invalid lines: 1\n" in result.output
+        assert "    Line 3: " in result.output
+
+    def test_no_analyzer(self) -> None:
+        """Test that at least one analysis must be enabled."""
+        result = CliRunner().invoke(main, [], input=LINE)
+
+        assert result.exit_code == 2
+        assert "--check-timestamp, --stats, --schema" in result.output
+
+    def test_invalid_range(self) -> None:
+        """Test that the timestamp check requires a valid time range."""
+        runner = CliRunner()
+
+        missing = runner.invoke(main, ["--check-timestamp"], input=LINE)
+        empty = runner.invoke(
+            main,
+            ["--check-timestamp", "--start", "2021-01-01", "--end", "2020-01-01"],
+            input=LINE,
+        )
+        invalid = runner.invoke(
+            main, ["--check-timestamp", "--start", "x", "--end", "y"], input=LINE
+        )
+
+        assert missing.exit_code == empty.exit_code == invalid.exit_code == 2
+        assert "requires --start and --end" in missing.output
+        assert "start time must be before end time" in empty.output
+        assert "Error: " in invalid.output
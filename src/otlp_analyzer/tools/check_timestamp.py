@@ -1,228 +1,456 @@
 """CLI tool to check if OTLP log record timestamps fall within a time range."""
 
+import functools
+import os
 import sys
-from dataclasses import dataclass
-from typing import TextIO
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, NoReturn, Optional, Union
 
 import click
 
-from otlp_analyzer.common.otlp_parser import LogRecord, OTLPParseError, parse_otlp_line
-from otlp_analyzer.common.timestamp_parser import TimestampParseError, parse_timestamp
-from otlp_analyzer.common.utils import format_difference, format_timestamp
-
+from otlp_analyzer.common.binary_input import binary_lines
+from otlp_analyzer.common.compression import CompressionError, file_compression
+from otlp_analyzer.common.file_chunks import iter_range_lines, split_line_ranges
+from otlp_analyzer.common.json_backend import (
+    BACKEND_NAMES,
+    JSONBackendError,
+    default_backend,
+    set_default_backend,
+)
+from otlp_analyzer.common.otlp_parser import Line
+from otlp_analyzer.common.profiling import StageProfile, format_profile, start_cprofile
+from otlp_analyzer.common.reports import (
+    CSV_HEADER,
+    REPORT_FORMATS,
+    ReportLimits,
+    ReportWriter,
+    error_printer,
+    format_chunk_report,
+    format_window_summaries,
+    print_limit_notes,
+    print_reports,
+    print_results,
+    print_summary,
+    report_mode,
+)
 
-@dataclass
-class CheckResult:
-    """Result of checking a single log record."""
+# Re-exported, as they were defined here before moving to reports
+# pylint: disable-next=useless-import-alias
+from otlp_analyzer.common.reports import (  # pylint: disable=unused-import
+    format_result as format_result,
+    format_summary as format_summary,
+)
+from otlp_analyzer.common.timestamp_check import (
+    ChunkTask,
+    Summary,
+    TimestampChecker,
+    add_summary,
+    check_chunk,
+)
+from otlp_analyzer.common.sidecar_check import process_with_sidecar
+from otlp_analyzer.common.timestamp_parser import TimestampParseError, parse_timestamp
 
-    record: LogRecord
-    status: str  # "in_range", "too_early", "too_late", "error"
-    error_message: str = ""
+if TYPE_CHECKING:
+    from otlp_analyzer.common.skew_histogram import SkewHistogram
+    from otlp_analyzer.common.time_windows import WindowSet
 
+# Target size of the byte ranges checked by worker processes
+CHUNK_SIZE = 64 * 1024 * 1024
 
-@dataclass
-class Summary:
-    """Summary of all checks performed."""
+# Records per batch when --fail-fast should stop soon after the first issue
+FAIL_FAST_BATCH_SIZE = 1024
 
-    total_lines: int = 0
-    total_records: int = 0
-    in_range: int = 0
-    too_early: int = 0
-    too_late: int = 0
-    errors: int = 0
+# The start of every input is checked record by record, so that smaller
+# inputs do not import NumPy for columnar checks, which would take longer
+# than it saves
+COLUMNAR_MIN_SIZE = 4 * 1024 * 1024
 
 
-def check_timestamp_range(record: LogRecord, start_ns: int, end_ns: int) -> CheckResult:
+def process_stream(  # pylint: disable=too-many-arguments
+    input_stream: Iterable[Line],
+    start_ns: int,
+    end_ns: int,
+    verbose: bool,
+    quiet: bool,
+    *,
+    columnar: Optional[bool] = None,
+    limits: Optional[ReportLimits] = None,
+    report_format: str = "text",
+    profile: Optional[StageProfile] = None,
+    skew: Optional["SkewHistogram"] = None,
+) -> tuple[Summary, bool]:
     """
-    Check if a log record's timestamp falls within the specified range.
+    Process JSONL input stream and check timestamps.
+
+    If the limits stop checking early, the summary covers the lines read.
 
     Args:
-        record: The log record to check
+        input_stream: Input stream to read JSONL from (text, or bytes for speed)
         start_ns: Start of time range in nanoseconds
         end_ns: End of time range in nanoseconds
+        verbose: Show all records (including in-range)
+        quiet: Only show summary
+        columnar: Check records in NumPy batches instead of one by one
+                  (default: after the first COLUMNAR_MIN_SIZE bytes, if
+                  NumPy is installed)
+        limits: Limits on the results printed and when to stop reading (see
+                reports.ReportLimits)
+        report_format: Output format of the results (see reports.REPORT_FORMATS)
+        profile: Times the stages of the check and counts the lines and bytes
+                 read (see profiling.STAGES)
+        skew: Updated with the distance of every out-of-range record to the
+              range
 
     Returns:
-        CheckResult indicating the status
+        Tuple of (Summary, has_issues) where has_issues is True if any
+        records were out of range or had errors
     """
-    if record.time_unix_nano is None:
-        return CheckResult(
-            record=record,
-            status="error",
-            error_message="Missing or invalid timeUnixNano field",
-        )
-
-    if record.time_unix_nano < start_ns:
-        return CheckResult(record=record, status="too_early")
-    if record.time_unix_nano > end_ns:
-        return CheckResult(record=record, status="too_late")
-    return CheckResult(record=record, status="in_range")
-
-
-def format_result(result: CheckResult, start_ns: int, end_ns: int) -> str:
+    if profile is None:
+        profile = StageProfile(enabled=False)
+    output = ReportWriter(report_format)
+    checker = TimestampChecker(
+        start_ns,
+        end_ns,
+        report=report_mode(verbose, quiet, limits),
+        columnar=columnar,
+        batch_size=_batch_size(limits),
+        count_skew=skew is not None,
+    )
+
+    # Check each record
+    results = checker.check_stream(
+        input_stream,
+        on_error=error_printer(quiet, limits, output),
+        profile=profile,
+        columnar_after=COLUMNAR_MIN_SIZE if columnar is None else 0,
+    )
+    profile.wrap("output", print_results)(
+        profile.iterate("check", results),
+        start_ns,
+        end_ns,
+        quiet,
+        limits,
+        output=output,
+    )
+    profile.lines += checker.progress.lines
+    profile.bytes += checker.progress.byte_offset
+    if skew is not None and checker.skew is not None:
+        skew.merge(checker.skew)
+
+    return checker.summary, checker.summary.has_issues()
+
+
+def process_files(  # pylint: disable=too-many-arguments
+    paths: Sequence[Path],
+    start_ns: int,
+    end_ns: int,
+    verbose: bool,
+    quiet: bool,
+    *,
+    jobs: int = 1,
+    use_index: bool = True,
+    limits: Optional[ReportLimits] = None,
+    report_format: str = "text",
+    profile: Optional[StageProfile] = None,
+    skew: Optional["SkewHistogram"] = None,
+) -> tuple[Summary, bool]:
     """
-    Format a check result as a human-readable string.
+    Check the timestamps of several JSONL files one after another.
+
+    Line numbers are counted per file. With more than one file, the output
+    of each file is preceded by a "==> path <==" header.
 
     Args:
-        result: The check result to format
+        paths: Paths of the JSONL files
         start_ns: Start of time range in nanoseconds
         end_ns: End of time range in nanoseconds
+        verbose: Show all records (including in-range)
+        quiet: Only show summary
+        jobs: Number of processes to use for each file (see process_file)
+        use_index: Use up-to-date sidecar indexes (see process_file)
+        limits: Limits on the results printed and when to stop reading (see
+                reports.ReportLimits), shared by all files
+        report_format: Output format of the results (see reports.REPORT_FORMATS)
+        profile: Times the stages of checking all files (see process_stream)
+        skew: Updated with the out-of-range records of all files (see
+              process_file)
 
     Returns:
-        Formatted string for output
+        Tuple of (Summary, has_issues) for all files together
     """
-    lines = []
-    record = result.record
-
-    # Header line
-    if result.status == "in_range":
-        header = f"Line {record.line_number}, Record {record.record_index}: IN RANGE"
-        lines.append(header)
-    elif result.status == "too_early":
-        header = (
-            f"Line {record.line_number}, Record {record.record_index}: "
-            f"OUT OF RANGE (too early)"
-        )
-        lines.append(header)
-        if record.time_unix_nano is not None:
-            lines.append(
-                f"  timeUnixNano:    {format_timestamp(record.time_unix_nano)} "
-                f"({record.time_unix_nano})"
-            )
-            lines.append(
-                f"  expected range:  {format_timestamp(start_ns)} - "
-                f"{format_timestamp(end_ns)}"
-            )
-            difference = start_ns - record.time_unix_nano
-            lines.append(
-                f"  difference:      {format_difference(difference, 'before start')}"
-            )
-    elif result.status == "too_late":
-        header = (
-            f"Line {record.line_number}, Record {record.record_index}: "
-            f"OUT OF RANGE (too late)"
-        )
-        lines.append(header)
-        if record.time_unix_nano is not None:
-            lines.append(
-                f"  timeUnixNano:    {format_timestamp(record.time_unix_nano)} "
-                f"({record.time_unix_nano})"
-            )
-            lines.append(
-                f"  expected range:  {format_timestamp(start_ns)} - "
-                f"{format_timestamp(end_ns)}"
-            )
-            difference = record.time_unix_nano - end_ns
-            lines.append(
-                f"  difference:      {format_difference(difference, 'after end')}"
-            )
-    elif result.status == "error":
-        header = (
-            f"Line {record.line_number}, Record {record.record_index}: "
-            f"ERROR - {result.error_message}"
+    summary = Summary()
+    for path in paths:
+        if len(paths) > 1 and not quiet:
+            click.echo(f"==> {path} <==")
+        part, _ = process_file(
+            path,
+            start_ns,
+            end_ns,
+            verbose,
+            quiet,
+            jobs=jobs,
+            use_index=use_index,
+            limits=limits,
+            report_format=report_format,
+            profile=profile,
+            skew=skew,
         )
-        lines.append(header)
+        add_summary(summary, part)
+        if limits is not None and limits.stopped:
+            break
 
-    return "\n".join(lines)
+    return summary, summary.has_issues()
 
 
-def format_summary(summary: Summary) -> str:
-    """
-    Format the summary of all checks.
-
-    Args:
-        summary: Summary data structure
-
-    Returns:
-        Formatted summary string
-    """
-    lines = [
-        "---",
-        "Summary:",
-        f"  Total lines processed: {summary.total_lines}",
-        f"  Total log records: {summary.total_records}",
-        f"  In range: {summary.in_range}",
-        f"  Out of range (too early): {summary.too_early}",
-        f"  Out of range (too late): {summary.too_late}",
-        f"  Errors: {summary.errors}",
-    ]
-    return "\n".join(lines)
-
-
-def process_stream(
-    input_stream: TextIO,
+def process_file(  # pylint: disable=too-many-arguments,too-many-locals
+    path: Path,
     start_ns: int,
     end_ns: int,
     verbose: bool,
     quiet: bool,
+    *,
+    jobs: int = 1,
+    use_index: bool = True,
+    limits: Optional[ReportLimits] = None,
+    report_format: str = "text",
+    profile: Optional[StageProfile] = None,
+    skew: Optional["SkewHistogram"] = None,
 ) -> tuple[Summary, bool]:
     """
-    Process JSONL input stream and check timestamps.
+    Check the timestamps of a JSONL file, optionally using several processes.
+
+    Regular files are memory-mapped (see iter_range_lines). If the file has
+    an up-to-date sorted timestamp extract (see timestamp_extract), the file
+    is only read to report the errors of invalid lines. If it has an
+    up-to-date sidecar index (see timestamp_index), only the lines the index
+    cannot account for are decoded. Otherwise, with more than one job,
+    the file is split into byte ranges of whole lines that are checked in a
+    process pool. The summary and output are the same as for process_stream:
+    results are printed in line order, with line numbers counted from the
+    start of the file.
 
     Args:
-        input_stream: Input stream to read JSONL from
+        path: Path of the JSONL file
         start_ns: Start of time range in nanoseconds
         end_ns: End of time range in nanoseconds
         verbose: Show all records (including in-range)
         quiet: Only show summary
+        jobs: Number of processes to use
+        use_index: Use the sidecar extract or index of the file if it is up
+                   to date
+        limits: Limits on the results printed and when to stop reading (see
+                reports.ReportLimits)
+        report_format: Output format of the results (see reports.REPORT_FORMATS)
+        profile: Times the stages of a sequential check (see process_stream);
+                 checks using a sidecar or several processes are not timed
+        skew: Updated with the distance of every out-of-range record to the
+              range (see skew_histogram), merged from the chunks with
+              several processes
 
     Returns:
-        Tuple of (Summary, has_issues) where has_issues is True if any
-        records were out of range or had errors
+        Tuple of (Summary, has_issues)
     """
-    summary = Summary()
-    has_issues = False
+    if use_index and path.is_file():
+        checked = process_with_sidecar(
+            path, start_ns, end_ns, verbose, quiet, limits, report_format, skew
+        )
+        if checked is not None:
+            return checked
+
+    # Pipes, other special files and compressed files can only be read
+    # sequentially
+    if jobs <= 1 or not path.is_file() or file_compression(path) is not None:
+        return process_stream(
+            iter_range_lines(path),
+            start_ns,
+            end_ns,
+            verbose,
+            quiet,
+            limits=limits,
+            report_format=report_format,
+            profile=profile,
+            skew=skew,
+        )
+
+    # More chunks than jobs keeps the workers busy and bounds the memory used
+    # for the reports of a single chunk
+    chunks = max(jobs * 4, path.stat().st_size // CHUNK_SIZE)
+    tasks = [
+        ChunkTask(
+            path,
+            start,
+            end,
+            start_ns,
+            end_ns,
+            report_mode(verbose, quiet, limits),
+            count_skew=skew is not None,
+        )
+        for start, end in split_line_ranges(path, chunks)
+    ]
 
-    for line_number, line in enumerate(input_stream, start=1):
-        summary.total_lines += 1
+    # Imported here, as multiprocessing slows down the start of every check
+    # pylint: disable-next=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor
+
+    summary = Summary()
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=set_default_backend,
+        initargs=(default_backend().name,),
+    ) as executor:
+        # map yields the chunks in file order, as soon as each one is done
+        for part, reports, part_skew in executor.map(check_chunk, tasks):
+            print_reports(
+                (report for report in reports),
+                functools.partial(
+                    format_chunk_report,
+                    line_offset=summary.total_lines,
+                    start_ns=start_ns,
+                    end_ns=end_ns,
+                    report_format=report_format,
+                ),
+                lambda report: report[3] != "in_range",  # The status
+                quiet,
+                limits,
+            )
+            # The summary covers whole chunks, even if stopped within one
+            add_summary(summary, part)
+            if skew is not None and part_skew is not None:
+                skew.merge(part_skew)
+            if limits is not None and limits.stopped:
+                executor.shutdown(cancel_futures=True)
+                break
+
+    return summary, summary.has_issues()
+
+
+def _batch_size(limits: Optional[ReportLimits]) -> Optional[int]:
+    """Get the batch size of columnar checks for the limits."""
+    if limits is None or limits.fail_after is None:
+        return None
+    return FAIL_FAST_BATCH_SIZE
+
+
+def _follow_error(
+    follow: bool, checkpoint: Optional[Path], jobs: int, input_files: Sequence[Path]
+) -> Optional[str]:
+    """Check the options of follow mode, returning the error message if invalid."""
+    if not follow:
+        return "--checkpoint requires --follow" if checkpoint is not None else None
+    if len(input_files) != 1:
+        return "--follow requires exactly one INPUT_FILE"
+    if jobs != 1:
+        return "--follow cannot be combined with --jobs"
+    if file_compression(input_files[0]) is not None:
+        return "--follow cannot read compressed files"
+    return None
+
+
+def _ranges_error(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    ranges: Union[tuple[int, int], "WindowSet"],
+    jobs: int,
+    follow: bool,
+    report_format: str,
+    profile: bool,
+    emit_partial: Optional[Path],
+    report_options: bool,
+    input_files: Sequence[Path],
+) -> Optional[str]:
+    """Check how the options combine, returning the error message if invalid.
+
+    report_options tells whether -v, --max-reports or --fail-fast was given.
+    """
+    windows = not isinstance(ranges, tuple)
+    # Windows, --jobs and --follow each check the input in their own way
+    other_mode = windows or jobs != 1 or follow
+    if windows and (jobs != 1 or follow):
+        return "windows cannot be combined with --jobs or --follow"
+    if profile and other_mode:
+        return "--profile cannot be combined with --jobs, --follow or windows"
+    if emit_partial is not None and (other_mode or profile or report_options):
+        return (
+            "--emit-partial cannot be combined with --jobs, --follow, --profile, "
+            "-v, --max-reports, --fail-fast or windows"
+        )
+    if report_format != "text" and (
+        windows or emit_partial is not None or len(input_files) > 1
+    ):
+        return (
+            f"--format {report_format} takes a single time range and at most one "
+            "INPUT_FILE, without --emit-partial"
+        )
+    return None
+
+
+def _parse_ranges(
+    start: Optional[str],
+    end: Optional[str],
+    window: Sequence[str],
+    window_file: Optional[Path],
+) -> Union[tuple[int, int], "WindowSet"]:
+    """Parse --start and --end, or the windows; print the error and exit if invalid."""
+    if window or window_file is not None:
+        if start is not None or end is not None:
+            click.echo("Error: --start/--end cannot be combined with windows", err=True)
+            sys.exit(2)
+        # pylint: disable-next=import-outside-toplevel
+        from otlp_analyzer.common.time_windows import (
+            TimeWindow,
+            WindowParseError,
+            WindowSet,
+            parse_window,
+            read_window_file,
+        )
 
-        # Parse the line
         try:
-            records = parse_otlp_line(line, line_number)
-        except OTLPParseError as e:
-            if not quiet:
-                click.echo(f"Line {line_number}: ERROR - {e}")
-            summary.errors += 1
-            has_issues = True
-            continue
-
-        # Check each record
-        for record in records:
-            summary.total_records += 1
-            result = check_timestamp_range(record, start_ns, end_ns)
-
-            # Update summary
-            if result.status == "in_range":
-                summary.in_range += 1
-            elif result.status == "too_early":
-                summary.too_early += 1
-                has_issues = True
-            elif result.status == "too_late":
-                summary.too_late += 1
-                has_issues = True
-            elif result.status == "error":
-                summary.errors += 1
-                has_issues = True
-
-            # Output based on verbosity
-            if not quiet:
-                if verbose or result.status != "in_range":
-                    click.echo(format_result(result, start_ns, end_ns))
-                    click.echo()  # Blank line between records
-
-    return summary, has_issues
+            windows: list[TimeWindow] = [parse_window(spec) for spec in window]
+            if window_file is not None:
+                windows += read_window_file(window_file)
+            return WindowSet(windows)
+        except WindowParseError as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(2)
+
+    if start is None or end is None:
+        click.echo(
+            "Error: --start and --end are required unless --window or "
+            "--window-file is given",
+            err=True,
+        )
+        sys.exit(2)
+    try:
+        start_ns = parse_timestamp(start)
+        end_ns = parse_timestamp(end)
+    except TimestampParseError as e:
+        click.echo(f"Error parsing time range: {e}", err=True)
+        sys.exit(2)
+    if start_ns >= end_ns:
+        click.echo("Error: start time must be before end time", err=True)
+        sys.exit(2)
+    return start_ns, end_ns
 
 
 @click.command()
 @click.option(
     "--start",
-    required=True,
     help="Start of time range (ISO 8601, Unix timestamp, or date string)",
 )
 @click.option(
     "--end",
-    required=True,
     help="End of time range (ISO 8601, Unix timestamp, or date string)",
 )
+@click.option(
+    "--window",
+    metavar="NAME=START..END",
+    multiple=True,
+    help="Check against this named time range instead (repeatable)",
+)
+@click.option(
+    "--window-file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Read --window values from this file, one per line",
+)
 @click.option(
     "-v",
     "--verbose",
@@ -235,45 +463,332 @@ def process_stream(
     is_flag=True,
     help="Only show summary counts",
 )
-def main(start: str, end: str, verbose: bool, quiet: bool) -> None:
+@click.option(
+    "--format",
+    "report_format",
+    type=click.Choice(REPORT_FORMATS),
+    default="text",
+    show_default=True,
+    help="Output format of the records: text, or one NDJSON object or CSV row "
+    "per record for other programs (the summary then goes to stderr)",
+)
+@click.option(
+    "--max-reports",
+    type=click.IntRange(min=0),
+    metavar="N",
+    help="Print at most N records and invalid lines, but keep counting",
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    help="Stop reading at the first issue (or after --max-reports issues)",
+)
+@click.option(
+    "--json-backend",
+    type=click.Choice(["auto", *BACKEND_NAMES]),
+    default="auto",
+    show_default=True,
+    help="JSON decoder to use (auto picks the fastest installed one)",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Number of processes checking each file in parallel (0: one per CPU)",
+)
+@click.option(
+    "--no-index",
+    is_flag=True,
+    help="Ignore sidecar timestamp indexes and extracts (see otlp-index-timestamps)",
+)
+@click.option(
+    "-f",
+    "--follow",
+    is_flag=True,
+    help="Keep checking lines appended to INPUT_FILE until interrupted",
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Save the --follow position and summary to this file and resume from it",
+)
+@click.option(
+    "--poll-interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    show_default=True,
+    help="Seconds between checks for new lines with --follow",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print the time spent reading, decoding, walking, checking and writing "
+    "to stderr (implies --no-index)",
+)
+@click.option(
+    "--no-skew",
+    is_flag=True,
+    help="Do not print the percentiles and chart of how far out-of-range "
+    "records lie outside the range",
+)
+@click.option(
+    "--cprofile",
+    type=click.Path(dir_okay=False, path_type=Path),
+    metavar="FILE",
+    help="Save cProfile statistics of the whole run to FILE (see pstats)",
+)
+@click.option(
+    "--emit-partial",
+    type=click.Path(dir_okay=False, path_type=Path),
+    metavar="FILE",
+    help="Save the summary and all offenders to FILE instead of printing the "
+    "offenders, for otlp merge-summaries",
+)
+@click.argument(
+    "input_files",
+    nargs=-1,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+def main(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    start: Optional[str],
+    end: Optional[str],
+    window: tuple[str, ...],
+    window_file: Optional[Path],
+    verbose: bool,
+    quiet: bool,
+    report_format: str,
+    max_reports: Optional[int],
+    fail_fast: bool,
+    json_backend: str,
+    jobs: int,
+    no_index: bool,
+    follow: bool,
+    checkpoint: Optional[Path],
+    poll_interval: float,
+    profile: bool,
+    no_skew: bool,
+    cprofile: Optional[Path],
+    emit_partial: Optional[Path],
+    input_files: tuple[Path, ...],
+) -> None:
     """
     Check if OTLP log record timestamps fall within a time range.
 
-    Reads JSONL from stdin and validates that timeUnixNano fields are within
-    the specified start and end times (inclusive).
+    Reads JSONL from the INPUT_FILES (or stdin) and validates that timeUnixNano
+    fields are within the specified start and end times (inclusive). gzip,
+    bzip2 and zstd compressed input is decompressed automatically. Files
+    with an up-to-date index (see otlp-index-timestamps) are checked
+    without decoding the lines that lie entirely inside or outside the range;
+    files with an up-to-date sorted extract are checked without reading them.
 
     Examples:
 
         cat logs.jsonl | otlp-check-timestamp --start 2020-01-01 --end 2020-12-31
 
         otlp-check-timestamp --start 1577836800 --end 1609459199 < logs.jsonl
+
+        otlp-check-timestamp --start 2020-01-01 --end 2020-12-31 logs-*.jsonl.gz
+
+        otlp-check-timestamp --start 2020-01-01 --end 2020-12-31 -j 8 logs.jsonl
+
+        otlp-check-timestamp --start 2020-01-01 --end 2020-12-31 --fail-fast -q
+        logs.jsonl
+
+        otlp-check-timestamp --start 2020-01-01 --end 2020-12-31 --format ndjson
+        logs.jsonl
+
+        otlp-check-timestamp --start 2020-01-01 --end 2020-12-31 -f --checkpoint
+        logs.ckpt logs.jsonl
+
+        otlp-check-timestamp --start 2020-01-01 --end 2020-12-31 -q --profile
+        logs.jsonl
+
+        otlp-check-timestamp --start 2020-01-01 --end 2020-12-31 --emit-partial
+        shard-17.json logs-17-*.jsonl.gz
     """
-    # Parse time range arguments
+    if cprofile is not None:
+        # Also saves the statistics when exiting with sys.exit
+        click.get_current_context().call_on_close(start_cprofile(cprofile))
+
+    ranges = _parse_ranges(start, end, window, window_file)
+    options_error = (
+        _ranges_error(
+            ranges,
+            jobs,
+            follow,
+            report_format,
+            profile,
+            emit_partial,
+            verbose or fail_fast or max_reports is not None,
+            input_files,
+        )
+        or ("--jobs requires INPUT_FILES" if jobs != 1 and not input_files else None)
+        or _follow_error(follow, checkpoint, jobs, input_files)
+    )
+    if options_error:
+        click.echo(f"Error: {options_error}", err=True)
+        sys.exit(2)
+
+    # Select JSON decoder
     try:
-        start_ns = parse_timestamp(start)
-        end_ns = parse_timestamp(end)
-    except TimestampParseError as e:
-        click.echo(f"Error parsing time range: {e}", err=True)
+        set_default_backend(json_backend)
+    except JSONBackendError as e:
+        click.echo(f"Error: {e}", err=True)
         sys.exit(2)
 
-    # Validate time range
-    if start_ns >= end_ns:
-        click.echo("Error: start time must be before end time", err=True)
+    limits = ReportLimits(max_reports, (max_reports or 1) if fail_fast else None)
+    if not isinstance(ranges, tuple):
+        _check_windows(input_files, ranges, verbose, quiet, limits)
+    start_ns, end_ns = ranges
+    stage_profile = StageProfile(enabled=profile)
+    skew = None if no_skew or quiet else _new_skew()
+    if report_format == "csv" and not quiet:
+        click.echo(CSV_HEADER)
+
+    # Process input (decompressing it if necessary)
+    try:
+        if follow:
+            # pylint: disable-next=import-outside-toplevel
+            from otlp_analyzer.common.follow import CheckpointError
+
+            # pylint: disable-next=import-outside-toplevel
+            from otlp_analyzer.common.follow_check import process_follow
+
+            try:
+                summary, has_issues = process_follow(
+                    input_files[0],
+                    start_ns,
+                    end_ns,
+                    verbose,
+                    quiet,
+                    checkpoint_path=checkpoint,
+                    poll_interval=poll_interval,
+                    limits=limits,
+                    report_format=report_format,
+                )
+            except CheckpointError as e:
+                click.echo(f"Error: {e}", err=True)
+                sys.exit(2)
+        elif emit_partial is not None:
+            # pylint: disable-next=import-outside-toplevel
+            from otlp_analyzer.common.partial_results import process_partial
+
+            summary, has_issues = process_partial(
+                input_files, start_ns, end_ns, emit_partial
+            )
+        elif not input_files:
+            summary, has_issues = process_stream(
+                binary_lines(sys.stdin),
+                start_ns,
+                end_ns,
+                verbose,
+                quiet,
+                limits=limits,
+                report_format=report_format,
+                profile=stage_profile,
+                skew=skew,
+            )
+        else:
+            summary, has_issues = process_files(
+                input_files,
+                start_ns,
+                end_ns,
+                verbose,
+                quiet,
+                jobs=jobs or os.cpu_count() or 1,
+                use_index=not no_index and not profile,
+                limits=limits,
+                report_format=report_format,
+                profile=stage_profile,
+                skew=skew,
+            )
+    except CompressionError as e:
+        click.echo(f"Error: {e}", err=True)
         sys.exit(2)
 
-    # Process input stream
-    summary, has_issues = process_stream(sys.stdin, start_ns, end_ns, verbose, quiet)
+    # Output summary, keeping stdout for the records in other formats
+    err = report_format != "text"
+    print_limit_notes(limits, quiet, err, summary)
+    print_summary(summary, quiet, err)
+    _print_skew(
+        skew,
+        summary,
+        err,
+        "--follow" if follow else "--emit-partial" if emit_partial else None,
+    )
+    if profile:
+        click.echo(format_profile(stage_profile, summary.total_records), err=True)
 
-    # Output summary
-    if quiet:
+    # Exit with appropriate code
+    sys.exit(1 if has_issues else 0)
+
+
+def _new_skew() -> "SkewHistogram":
+    """Create the histogram for _print_skew, importing its module only then."""
+    # pylint: disable-next=import-outside-toplevel
+    from otlp_analyzer.common.skew_histogram import SkewHistogram
+
+    return SkewHistogram()
+
+
+def _print_skew(
+    skew: Optional["SkewHistogram"],
+    summary: Summary,
+    err: bool = False,
+    unavailable_with: Optional[str] = None,
+) -> None:
+    """Print the skew of the out-of-range records, or why it is unavailable."""
+    if skew is None or not summary.too_early + summary.too_late:
+        return
+    if unavailable_with is not None:
+        # Checkpoints and partial result files only keep the summary
         click.echo(
-            f"In range: {summary.in_range}, Out of range: "
-            f"{summary.too_early + summary.too_late}, Errors: {summary.errors}"
+            f"---\nSkew of out-of-range records: not available with {unavailable_with}",
+            err=err,
         )
-    else:
-        click.echo(format_summary(summary))
+        return
+    # pylint: disable-next=import-outside-toplevel
+    from otlp_analyzer.common.skew_histogram import format_skew
 
-    # Exit with appropriate code
+    click.echo(format_skew(skew), err=err)
+
+
+def _check_windows(
+    input_files: Sequence[Path],
+    window_set: "WindowSet",
+    verbose: bool,
+    quiet: bool,
+    limits: ReportLimits,
+) -> NoReturn:
+    """Check the input against several windows, print the summaries and exit."""
+    # pylint: disable-next=import-outside-toplevel
+    from otlp_analyzer.common.window_check import process_windows
+
+    try:
+        summaries, has_issues = process_windows(
+            input_files,
+            window_set,
+            verbose,
+            quiet,
+            limits=limits,
+            batch_size=_batch_size(limits),
+        )
+    except CompressionError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(2)
+
+    print_limit_notes(limits, quiet)
+
+    if quiet:
+        for time_window, summary in zip(window_set.windows, summaries):
+            click.echo(
+                f"{time_window.name}: In range: {summary.in_range}, Out of range: "
+                f"{summary.too_early + summary.too_late}, Errors: {summary.errors}"
+            )
+    else:
+        click.echo(format_window_summaries(summaries, window_set))
     sys.exit(1 if has_issues else 0)
 
 
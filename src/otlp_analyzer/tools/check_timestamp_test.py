@@ -1,17 +1,38 @@
 """Tests for check_timestamp tool."""
 
+import gzip
 import io
-
-from otlp_analyzer.common.otlp_parser import LogRecord
-from otlp_analyzer.tools.check_timestamp import (
+import subprocess
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from otlp_analyzer.common.json_backend import default_backend, set_default_backend
+from otlp_analyzer.common.file_chunks import iter_range_lines
+from otlp_analyzer.common.otlp_parser import LogRecord, parse_otlp_line
+from otlp_analyzer.common.reports import ReportLimits
+from otlp_analyzer.common.skew_histogram import SkewHistogram
+from otlp_analyzer.common import timestamp_check
+from otlp_analyzer.common.timestamp_check import (
     CheckResult,
+    Summary,
     check_timestamp_range,
+)
+from otlp_analyzer.common.timestamp_index import build_index
+from otlp_analyzer.tools import check_timestamp
+from otlp_analyzer.tools.check_timestamp import (
     format_result,
     format_summary,
+    main,
+    process_file,
     process_stream,
-    Summary,
 )
 
+LINE_IN_RANGE = '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"}]}]}]}\n'
+
 
 class TestCheckTimestampRange:
     """Test timestamp range checking logic."""
@@ -319,3 +340,593 @@ class TestProcessStream:
         assert summary.total_lines == 0
         assert summary.total_records == 0
         assert has_issues is False
+
+    @pytest.mark.parametrize("verbose", [False, True])
+    def test_columnar_matches_per_record(
+        self, verbose: bool, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that vectorized checks produce the same summary and output."""
+        pytest.importorskip("numpy")
+        input_data = (
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"},{"timeUnixNano":"1576408200000000000"},{}]}]}]}\n'
+            "{invalid json\n"
+            "\n"
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1615819530123000000"},{"timeUnixNano":"1609459199999000000"}]}]}]}\n'
+        )
+        start_ns = 1577836800000000000
+        end_ns = 1609459199999000000
+
+        outputs = []
+        for columnar in (False, True):
+            result = process_stream(
+                io.StringIO(input_data),
+                start_ns,
+                end_ns,
+                verbose=verbose,
+                quiet=False,
+                columnar=columnar,
+            )
+            outputs.append((result, capsys.readouterr().out))
+
+        assert outputs[0] == outputs[1]
+        summary, _ = outputs[1][0]
+        assert (summary.total_lines, summary.total_records, summary.errors) == (
+            4,
+            5,
+            2,
+        )
+
+    def test_bytes_input_matches_text(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that reading bytes gives the same summary and output as text."""
+        input_data = TestProcessFile.INPUT_DATA + "\u00e9\n"
+        start_ns = 1577836800000000000
+        end_ns = 1609459199999000000
+
+        expected = process_stream(
+            io.StringIO(input_data), start_ns, end_ns, verbose=True, quiet=False
+        )
+        expected_output = capsys.readouterr().out
+        result = process_stream(
+            io.BytesIO(input_data.encode()), start_ns, end_ns, verbose=True, quiet=False
+        )
+
+        assert result == expected
+        assert capsys.readouterr().out == expected_output
+
+
+class TestProcessFile:
+    """Test checking files in parallel."""
+
+    INPUT_DATA = (
+        '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"},{"timeUnixNano":"1576408200000000000"},{}]}]}]}\n'
+        "{invalid json\n"
+        "\n"
+        '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1615819530123000000"},{"timeUnixNano":"1609459199999000000"}]}]}]}\n'
+    ) * 20
+
+    @pytest.mark.parametrize("verbose", [False, True])
+    def test_parallel_matches_sequential(
+        self,
+        verbose: bool,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that chunks are merged into the same summary and output."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        start_ns = 1577836800000000000
+        end_ns = 1609459199999000000
+
+        expected = process_stream(
+            io.StringIO(self.INPUT_DATA), start_ns, end_ns, verbose, quiet=False
+        )
+        expected_output = capsys.readouterr().out
+        # Several chunks per job even for this small file
+        monkeypatch.setattr(check_timestamp, "CHUNK_SIZE", 100)
+        result = process_file(path, start_ns, end_ns, verbose, quiet=False, jobs=2)
+
+        assert result == expected
+        assert capsys.readouterr().out == expected_output
+        assert result[0].total_lines == 80
+
+    @pytest.mark.parametrize(
+        ("verbose", "quiet"), [(False, False), (True, False), (False, True)]
+    )
+    @pytest.mark.parametrize(
+        "start_ns",
+        [
+            1577836800000000000,  # Lines straddle the start
+            1500000000000000000,  # Lines are in range or straddle the end
+        ],
+    )
+    def test_index_matches_sequential(  # pylint: disable=too-many-arguments
+        self,
+        verbose: bool,
+        quiet: bool,
+        start_ns: int,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that checking with an index gives the same summary and output."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        build_index(path)
+        end_ns = 1609459199999000000
+
+        expected = process_file(path, start_ns, end_ns, verbose, quiet, use_index=False)
+        expected_output = capsys.readouterr().out
+        result = process_file(path, start_ns, end_ns, verbose, quiet)
+
+        assert result == expected
+        assert capsys.readouterr().out == expected_output
+
+    def test_index_skips_lines(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that lines accounted for by the index are not decoded."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        build_index(path)
+        decoded: list[int] = []
+
+        def parse(
+            line: bytes, line_number: int, timestamps_only: bool = False
+        ) -> list[LogRecord]:
+            decoded.append(line_number)
+            return parse_otlp_line(line, line_number, timestamps_only)
+
+        monkeypatch.setattr(timestamp_check, "parse_otlp_line", parse)
+        summary, _ = process_file(
+            path, 1500000000000000000, 1700000000000000000, False, quiet=True
+        )
+
+        assert not decoded
+        assert summary.in_range == 80
+        assert summary.errors == 40
+
+        # Lines straddling the start have to be decoded
+        process_file(path, 1580000000000000000, 1700000000000000000, False, quiet=True)
+        assert decoded == list(range(1, 80, 4))
+
+    @pytest.mark.parametrize(
+        ("verbose", "quiet"), [(False, False), (True, False), (False, True)]
+    )
+    def test_extract_matches_sequential(
+        self,
+        verbose: bool,
+        quiet: bool,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that checking with an extract gives the same summary and output."""
+        pytest.importorskip("numpy")
+        # pylint: disable-next=import-outside-toplevel
+        from otlp_analyzer.common.timestamp_extract import build_extract
+
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        build_extract(path)
+        build_index(path)
+        start_ns = 1577836800000000000
+        end_ns = 1609459199999000000
+
+        expected = process_file(path, start_ns, end_ns, verbose, quiet, use_index=False)
+        expected_output = capsys.readouterr().out
+        path.with_name("logs.jsonl.tsidx").unlink()
+        result = process_file(path, start_ns, end_ns, verbose, quiet)
+
+        assert result == expected
+        assert capsys.readouterr().out == expected_output
+
+    @pytest.mark.parametrize("mode", ["jobs", "index", "extract"])
+    @pytest.mark.parametrize("quiet", [False, True])
+    def test_skew_matches_sequential(
+        self, mode: str, quiet: bool, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the skew of parallel and sidecar checks is complete."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        if mode == "index":
+            build_index(path)
+        elif mode == "extract":
+            pytest.importorskip("numpy")
+            # pylint: disable-next=import-outside-toplevel
+            from otlp_analyzer.common.timestamp_extract import build_extract
+
+            build_extract(path)
+        # Line 1 straddles the end, line 4 is after it as a whole
+        start_ns, end_ns = 1500000000000000000, 1590000000000000000
+        expected = SkewHistogram()
+        process_stream(
+            io.StringIO(self.INPUT_DATA), start_ns, end_ns, False, True, skew=expected
+        )
+        monkeypatch.setattr(check_timestamp, "CHUNK_SIZE", 100)
+        skew = SkewHistogram()
+
+        process_file(
+            path,
+            start_ns,
+            end_ns,
+            False,
+            quiet,
+            jobs=2 if mode == "jobs" else 1,
+            skew=skew,
+        )
+
+        assert skew == expected
+        assert skew.too_late.total == 60
+
+    def test_stale_index(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that the index of a modified file is ignored."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        build_index(path)
+        path.write_text(self.INPUT_DATA * 2)
+
+        summary, _ = process_file(path, 0, 1, False, quiet=True)
+
+        assert summary.total_lines == 160
+        capsys.readouterr()
+
+
+class TestReportLimits:
+    """Test printing fewer results and stopping at the first issues."""
+
+    START_NS = 1577836800000000000
+    END_NS = 1609459199999000000
+
+    def check(
+        self, mode: str, path: Path, limits: ReportLimits
+    ) -> tuple[Summary, bool]:
+        """Check a file in the given mode."""
+        if mode in ("records", "batches"):
+            return process_stream(
+                iter_range_lines(path),
+                self.START_NS,
+                self.END_NS,
+                False,
+                False,
+                columnar=mode == "batches",
+                limits=limits,
+            )
+        if mode == "index":
+            build_index(path)
+        elif mode == "extract":
+            pytest.importorskip("numpy")
+            # pylint: disable-next=import-outside-toplevel
+            from otlp_analyzer.common.timestamp_extract import build_extract
+
+            build_extract(path)
+        return process_file(
+            path,
+            self.START_NS,
+            self.END_NS,
+            False,
+            False,
+            jobs=2 if mode == "jobs" else 1,
+            limits=limits,
+        )
+
+    @pytest.mark.parametrize("mode", ["batches", "jobs", "index", "extract"])
+    def test_max_reports(  # pylint: disable=too-many-arguments
+        self,
+        mode: str,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that every mode prints the same first reports and counts all."""
+        if mode == "batches":
+            pytest.importorskip("numpy")
+        monkeypatch.setattr(check_timestamp, "CHUNK_SIZE", 100)
+        path = tmp_path / "logs.jsonl"
+        path.write_text(TestProcessFile.INPUT_DATA)
+        expected = self.check("records", path, ReportLimits(max_reports=3))
+        expected_output = capsys.readouterr().out
+
+        limits = ReportLimits(max_reports=3)
+        result = self.check(mode, path, limits)
+
+        assert result == expected
+        assert capsys.readouterr().out == expected_output
+        assert expected_output.count("Line ") == 3
+        assert (limits.suppressed, limits.stopped) == (80 - 3, False)
+
+    @pytest.mark.parametrize("mode", ["records", "batches", "jobs", "index"])
+    def test_fail_fast(
+        self,
+        mode: str,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that reading stops soon after the first issues."""
+        if mode == "batches":
+            pytest.importorskip("numpy")
+        monkeypatch.setattr(check_timestamp, "CHUNK_SIZE", 100)
+        monkeypatch.setattr(check_timestamp, "FAIL_FAST_BATCH_SIZE", 4)
+        path = tmp_path / "logs.jsonl"
+        path.write_text(TestProcessFile.INPUT_DATA)
+        limits = ReportLimits(fail_after=2)
+
+        summary, has_issues = self.check(mode, path, limits)
+
+        output = capsys.readouterr().out
+        assert output.startswith("Line 1, Record 1: OUT OF RANGE (too early)")
+        assert output.count("Line ") == 2
+        assert "Line 1, Record 2: ERROR" in output
+        assert has_issues
+        assert limits.stopped
+        assert 1 <= summary.total_lines < 80
+        if mode != "jobs":
+            assert summary.total_records < 100
+
+    def test_main(self, tmp_path: Path) -> None:
+        """Test the options and the notes printed with the summary."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(TestProcessFile.INPUT_DATA)
+
+        result = CliRunner().invoke(
+            main,
+            ["--start", "2020-01-01", "--end", "2020-12-31", "--max-reports", "0"]
+            + ["--fail-fast", "--no-index", str(path)],
+        )
+
+        assert result.exit_code == 1
+        assert result.output.startswith(
+            "... 1 more not shown (--max-reports)\n"
+            "Stopped after 1 issue(s) (--fail-fast)"
+        )
+
+    def test_quiet_windows(self, tmp_path: Path) -> None:
+        """Test stopping at the first issue of any window, without output."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(TestProcessFile.INPUT_DATA)
+
+        result = CliRunner().invoke(
+            main,
+            ["-q", "--fail-fast", "--window", "a=2020-01-01..2020-12-31", str(path)],
+        )
+
+        assert result.exit_code == 1
+        assert result.output.startswith("Stopped after 1 issue(s) (--fail-fast)")
+        # Batches count the rest of the line, including its missing timestamp
+        assert "\na: In range: 1, Out of range: 1, Errors: " in result.output
+
+
+class TestWindowOptions:
+    """Test the --window and --window-file options."""
+
+    @pytest.mark.parametrize(
+        ("options", "message"),
+        [
+            ([], "--start and --end are required"),
+            (["--start", "2020-01-01", "--window", "a=1..2"], "cannot be combined"),
+            (["--window", "a=1..2", "-j", "2"], "cannot be combined with --jobs"),
+            (["--window", "a=1..2", "--window", "a=3..4"], "Duplicate window name"),
+            (["--window", "a=2020-01-01"], "expected NAME=START..END"),
+        ],
+    )
+    def test_invalid_options(self, options: list[str], message: str) -> None:
+        """Test the option combinations that are rejected."""
+        result = CliRunner().invoke(main, options, input="")
+
+        assert result.exit_code == 2
+        assert message in result.output
+
+
+class TestReportFormat:
+    """Test the --format option."""
+
+    INPUT_DATA = (
+        '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"},{"timeUnixNano":"1576408200000000000"}]}]}]}\n'
+        '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{}]}]}]}\n'
+    )
+    EXPECTED = {
+        "ndjson": (
+            '{"line":1,"record":1,"timeUnixNano":1576408200000000000,'
+            '"status":"too_early","delta_ns":-1428600000000000}\n'
+            '{"line":2,"record":0,"timeUnixNano":null,"status":"error",'
+            '"delta_ns":null,"error":"Missing or invalid timeUnixNano field"}\n'
+        ),
+        "csv": (
+            "line,record,timeUnixNano,status,delta_ns,error\n"
+            "1,1,1576408200000000000,too_early,-1428600000000000,\n"
+            '2,0,,error,,"Missing or invalid timeUnixNano field"\n'
+        ),
+    }
+
+    @pytest.mark.parametrize("report_format", ["ndjson", "csv"])
+    @pytest.mark.parametrize("mode", ["stdin", "file", "jobs", "index", "extract"])
+    def test_output(self, tmp_path: Path, report_format: str, mode: str) -> None:
+        """Test that stdout only has the records, the same in every mode."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+        if mode == "index":
+            build_index(path)
+        elif mode == "extract":
+            pytest.importorskip("numpy")
+            # pylint: disable-next=import-outside-toplevel
+            from otlp_analyzer.common.timestamp_extract import build_extract
+
+            build_extract(path)
+        options = {"stdin": [], "jobs": ["-j", "2", str(path)]}.get(mode, [str(path)])
+
+        result = CliRunner().invoke(
+            main,
+            ["--start", "2020-01-01", "--end", "2020-12-31", "--format", report_format]
+            + options,
+            input=self.INPUT_DATA if mode == "stdin" else None,
+        )
+
+        assert result.exit_code == 1
+        assert result.stdout == self.EXPECTED[report_format]
+        assert "Total log records: 3" in result.stderr
+        assert "Too early (before start): 1\n    p50: 16.5d" in result.stderr
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            ["--window", "a=2020-01-01..2020-12-31", "{path}"],
+            ["--start", "2020-01-01", "--end", "2020-12-31", "{path}", "{path}"],
+        ],
+    )
+    def test_invalid_options(self, tmp_path: Path, options: list[str]) -> None:
+        """Test that other formats take a single range and input file."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(self.INPUT_DATA)
+
+        result = CliRunner().invoke(
+            main,
+            ["--format", "ndjson"] + [option.format(path=path) for option in options],
+        )
+
+        assert result.exit_code == 2
+        assert "takes a single time range" in result.output
+
+
+class TestMain:
+    """Test the command line interface."""
+
+    @pytest.fixture(autouse=True)
+    def restore_backend(self) -> Iterator[None]:
+        """Restore the default JSON backend changed by --json-backend."""
+        previous = default_backend()
+        yield
+        set_default_backend(previous.name)
+
+    def test_json_backend_option(self) -> None:
+        """Test selecting the stdlib JSON backend."""
+        input_data = '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"}]}]}]}\n'
+
+        result = CliRunner().invoke(
+            main,
+            [
+                "--start",
+                "2020-01-01",
+                "--end",
+                "2020-12-31",
+                "--json-backend",
+                "stdlib",
+            ],
+            input=input_data,
+        )
+
+        assert result.exit_code == 0
+        assert "In range: 1" in result.output
+        assert default_backend().name == "stdlib"
+
+    def test_input_file(self, tmp_path: Path) -> None:
+        """Test reading an input file with several jobs."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(
+            '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"}]}]}]}\n'
+            * 3
+        )
+
+        result = CliRunner().invoke(
+            main,
+            ["--start", "2020-01-01", "--end", "2020-12-31", "-j", "2", str(path)],
+        )
+
+        assert result.exit_code == 0
+        assert "In range: 3" in result.output
+
+    def test_input_files(self, tmp_path: Path) -> None:
+        """Test checking several files with per-file line numbers."""
+        in_range = '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"}]}]}]}\n'
+        paths = [tmp_path / "a.jsonl", tmp_path / "b.jsonl"]
+        paths[0].write_text(in_range)
+        paths[1].write_text(in_range + "{invalid json\n")
+
+        result = CliRunner().invoke(
+            main,
+            ["--start", "2020-01-01", "--end", "2020-12-31", *map(str, paths)],
+        )
+
+        assert result.exit_code == 1
+        assert result.output.startswith(
+            f"==> {paths[0]} <==\n==> {paths[1]} <==\nLine 2: ERROR - Invalid JSON"
+        )
+        assert "Total lines processed: 3" in result.output
+        assert "In range: 2" in result.output
+
+    @pytest.mark.parametrize("use_stdin", [False, True])
+    def test_compressed_input(self, tmp_path: Path, use_stdin: bool) -> None:
+        """Test that gzip input is decompressed, also with several jobs."""
+        path = tmp_path / "logs.jsonl.gz"
+        path.write_bytes(
+            gzip.compress(
+                b'{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"}]}]}]}\n'
+                * 3
+            )
+        )
+        args = ["--start", "2020-01-01", "--end", "2020-12-31"]
+
+        if use_stdin:
+            result = CliRunner().invoke(main, args, input=path.read_bytes())
+        else:
+            result = CliRunner().invoke(main, [*args, "-j", "2", str(path)])
+
+        assert result.exit_code == 0
+        assert "In range: 3" in result.output
+
+    def test_corrupt_compressed_input(self) -> None:
+        """Test that corrupt compressed input is rejected."""
+        result = CliRunner().invoke(
+            main,
+            ["--start", "2020-01-01", "--end", "2020-12-31"],
+            input=gzip.compress(b"{}\n" * 100)[:-8],
+        )
+
+        assert result.exit_code == 2
+        assert "Invalid gzip data" in result.output
+
+    def test_jobs_requires_input_file(self) -> None:
+        """Test that --jobs is rejected for stdin."""
+        result = CliRunner().invoke(
+            main,
+            ["--start", "2020-01-01", "--end", "2020-12-31", "--jobs", "2"],
+            input="",
+        )
+
+        assert result.exit_code == 2
+        assert "--jobs requires INPUT_FILES" in result.output
+
+    def test_invalid_json_backend(self) -> None:
+        """Test that an unknown JSON backend is rejected."""
+        result = CliRunner().invoke(
+            main,
+            ["--start", "2020-01-01", "--end", "2020-12-31", "--json-backend", "x"],
+            input="",
+        )
+
+        assert result.exit_code == 2
+
+    def test_short_stdin_imports_only_what_it_uses(self) -> None:
+        """Test that a short plain stdin run imports no option-specific module."""
+        script = (
+            "import sys\n"
+            "from otlp_analyzer.tools.check_timestamp import main\n"
+            "try:\n"
+            "    main(['--start', '2020-01-01', '--end', '2020-12-31'])\n"
+            "finally:\n"
+            "    print(sorted(name for name in ('numpy', 'gzip', 'bz2', 'cProfile',"
+            " 'otlp_analyzer.common.follow', 'otlp_analyzer.common.time_windows',"
+            " 'otlp_analyzer.common.timestamp_index') if name in sys.modules))\n"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            input=LINE_IN_RANGE,
+            capture_output=True,
+            text=True,
+            check=True,
+            env={"PYTHONPATH": str(Path(__file__).parents[2])},
+        )
+
+        assert "In range: 1" in result.stdout
+        assert result.stdout.endswith("[]\n")
@@ -0,0 +1,81 @@
+"""CLI tool to write sidecar timestamp indexes of OTLP JSONL files."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import click
+
+from otlp_analyzer.common.timestamp_index import (
+    TimestampIndexError,
+    build_index,
+    index_path_for,
+)
+
+
+@click.command()
+@click.option(
+    "--extract",
+    is_flag=True,
+    help="Write a sorted timestamp extract (FILE.tscol) instead (requires NumPy)",
+)
+@click.argument(
+    "input_files",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+def main(extract: bool, input_files: tuple[Path, ...]) -> None:
+    """
+    Write a timestamp index next to each of the INPUT_FILES.
+
+    The index of FILE is written to FILE.tsidx and holds, for every line, its
+    byte range and the minimum, maximum and number of its timeUnixNano
+    values. With --extract, all timestamps are written to FILE.tscol in
+    sorted order instead, so that checks of any time range are answered
+    without reading FILE. otlp-check-timestamp uses them as long as FILE is
+    unchanged. Compressed files cannot be indexed.
+
+    Examples:
+
+        otlp-index-timestamps logs-*.jsonl
+
+        otlp-index-timestamps --extract logs.jsonl
+    """
+    if extract:
+        _write_extracts(input_files)
+        return
+
+    for path in input_files:
+        try:
+            lines = build_index(path)
+        except TimestampIndexError as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(2)
+        click.echo(f"Indexed {lines} lines of {path} into {index_path_for(path)}")
+
+
+def _write_extracts(paths: tuple[Path, ...]) -> None:
+    if importlib.util.find_spec("numpy") is None:
+        click.echo("Error: --extract requires NumPy", err=True)
+        sys.exit(2)
+    # pylint: disable-next=import-outside-toplevel
+    from otlp_analyzer.common.timestamp_extract import (
+        TimestampExtractError,
+        build_extract,
+        extract_path_for,
+    )
+
+    for path in paths:
+        try:
+            records = build_extract(path)
+        except TimestampExtractError as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(2)
+        click.echo(
+            f"Extracted {records} records of {path} into {extract_path_for(path)}"
+        )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
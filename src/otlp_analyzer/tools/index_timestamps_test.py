@@ -0,0 +1,62 @@
+"""Tests for index_timestamps tool."""
+
+import gzip
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from otlp_analyzer.common.timestamp_index import index_path_for, open_index
+from otlp_analyzer.tools.index_timestamps import main
+
+LINE = '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"}]}]}]}\n'
+
+
+class TestMain:
+    """Test the command line interface."""
+
+    def test_index_files(self, tmp_path: Path) -> None:
+        """Test writing an index next to each file."""
+        paths = [tmp_path / "a.jsonl", tmp_path / "b.jsonl"]
+        paths[0].write_text(LINE * 2)
+        paths[1].write_text(LINE * 3)
+
+        result = CliRunner().invoke(main, [str(path) for path in paths])
+
+        assert result.exit_code == 0
+        assert result.output == (
+            f"Indexed 2 lines of {paths[0]} into {index_path_for(paths[0])}\n"
+            f"Indexed 3 lines of {paths[1]} into {index_path_for(paths[1])}\n"
+        )
+        for path in paths:
+            index = open_index(path)
+            assert index is not None
+            index.close()
+
+    def test_extract(self, tmp_path: Path) -> None:
+        """Test writing sorted extracts instead of indexes."""
+        pytest.importorskip("numpy")
+        path = tmp_path / "logs.jsonl"
+        path.write_text(LINE * 2)
+
+        result = CliRunner().invoke(main, ["--extract", str(path)])
+
+        assert result.exit_code == 0
+        assert result.output == f"Extracted 2 records of {path} into {path}.tscol\n"
+        assert not index_path_for(path).exists()
+
+    def test_compressed_file(self, tmp_path: Path) -> None:
+        """Test that compressed files are an error."""
+        path = tmp_path / "logs.jsonl.gz"
+        path.write_bytes(gzip.compress(LINE.encode()))
+
+        result = CliRunner().invoke(main, [str(path)])
+
+        assert result.exit_code == 2
+        assert "Cannot index compressed file" in result.output
+
+    def test_requires_files(self) -> None:
+        """Test that at least one file is required."""
+        result = CliRunner().invoke(main, [])
+
+        assert result.exit_code == 2
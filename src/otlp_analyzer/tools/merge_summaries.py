@@ -0,0 +1,114 @@
+"""CLI tool to merge partial results of otlp-check-timestamp --emit-partial."""
+
+import sys
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Optional, TextIO
+
+import click
+
+from otlp_analyzer.common.partial_results import (
+    PartialResult,
+    PartialResultError,
+    load_partial,
+    merge_partials,
+    save_partial,
+)
+from otlp_analyzer.common.reports import (
+    ReportWriter,
+    format_chunk_report,
+    print_summary,
+)
+
+
+def iter_partials(paths: Sequence[Path]) -> Iterator[PartialResult]:
+    """Load partial result files one at a time, so only the merge is kept in memory."""
+    for path in paths:
+        yield load_partial(path)
+
+
+def print_offenders(partial: PartialResult) -> None:
+    """Print the offenders of a partial result, under a header for each source."""
+    output = ReportWriter()
+    source = None
+    for offender in partial.offenders:
+        if offender[0] != source:
+            source = offender[0]
+            output.write(f"==> {source} <==")
+        output.write(
+            format_chunk_report(offender[1:], 0, partial.start_ns, partial.end_ns)
+        )
+    output.flush()
+    if partial.dropped_offenders:
+        click.echo(
+            f"... {partial.dropped_offenders} more offenders not kept in the "
+            "partial results"
+        )
+
+
+@click.command()
+@click.option(
+    "-q",
+    "--quiet",
+    is_flag=True,
+    help="Only show summary counts",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Also save the merged result to this file, to merge it again later",
+)
+@click.option(
+    "--files-from",
+    type=click.File("r"),
+    help="Read the paths of partial results from this file, one per line "
+    "('-' for stdin), e.g. when there are too many for the command line",
+)
+@click.argument(
+    "partial_files",
+    nargs=-1,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+def main(
+    quiet: bool,
+    output: Optional[Path],
+    files_from: Optional[TextIO],
+    partial_files: tuple[Path, ...],
+) -> None:
+    """
+    Merge the partial results of sharded otlp-check-timestamp runs.
+
+    Reads the PARTIAL_FILES written by otlp-check-timestamp --emit-partial,
+    all for the same time range, and prints their offenders (by input file)
+    and the summary of all of them, as if the inputs had been checked in a
+    single run. The input is not read again. Exits with status 1 if any
+    records were out of range or had errors.
+
+    Examples:
+
+        otlp merge-summaries shards/*.json
+
+        find shards -name '*.json' | otlp merge-summaries -q --files-from -
+        -o day.json
+    """
+    paths = list(partial_files)
+    if files_from is not None:
+        paths += [Path(line.strip()) for line in files_from if line.strip()]
+
+    try:
+        merged = merge_partials(iter_partials(paths))
+    except PartialResultError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(2)
+
+    if output is not None:
+        save_partial(output, merged)
+    if not quiet:
+        print_offenders(merged)
+    print_summary(merged.summary, quiet)
+    sys.exit(1 if merged.summary.has_issues() else 0)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
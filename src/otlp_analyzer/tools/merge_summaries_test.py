@@ -0,0 +1,164 @@
+"""Tests for merge_summaries tool."""
+
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from otlp_analyzer.common.partial_results import (
+    PartialResult,
+    load_partial,
+    save_partial,
+)
+from otlp_analyzer.common.timestamp_check import Summary
+from otlp_analyzer.tools import check_timestamp
+from otlp_analyzer.tools.merge_summaries import main
+
+START_NS = 1577836800000000000  # 2020-01-01
+END_NS = 1609459199999000000  # 2020-12-31 23:59:59.999
+
+
+def write_partials(tmp_path: Path) -> list[Path]:
+    """Save two partial results, one of them with an offender and an invalid line."""
+    paths = [tmp_path / "a.json", tmp_path / "b.json"]
+    save_partial(
+        paths[0],
+        PartialResult(
+            START_NS,
+            END_NS,
+            Summary(3, 2, 1, 0, 1, 1),
+            [
+                ("logs-a.jsonl", 1, 1, END_NS + 10**9, "too_late", ""),
+                ("logs-a.jsonl", 2, -1, None, "error", "Invalid JSON"),
+            ],
+        ),
+    )
+    save_partial(paths[1], PartialResult(START_NS, END_NS, Summary(5, 5, 5, 0, 0, 0)))
+    return paths
+
+
+LINES = (
+    '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"},{"timeUnixNano":"1576408200000000000"}]}]}]}\n'
+    "{invalid json\n"
+)
+
+
+class TestMain:
+    """Test the command line interface."""
+
+    def test_merge(self, tmp_path: Path) -> None:
+        """Test printing the offenders by source and the merged summary."""
+        paths = write_partials(tmp_path)
+
+        result = CliRunner().invoke(main, [str(path) for path in paths])
+
+        assert result.exit_code == 1
+        assert result.output.startswith(
+            "==> logs-a.jsonl <==\nLine 1, Record 1: OUT OF RANGE (too late)\n"
+        )
+        assert "Line 2: ERROR - Invalid JSON\n" in result.output
+        assert result.output.endswith(
+            "  Total lines processed: 8\n"
+            "  Total log records: 7\n"
+            "  In range: 6\n"
+            "  Out of range (too early): 0\n"
+            "  Out of range (too late): 1\n"
+            "  Errors: 1\n"
+        )
+
+    def test_files_from_and_output(self, tmp_path: Path) -> None:
+        """Test reading the paths from stdin and saving the merged result."""
+        paths = write_partials(tmp_path)
+        merged_path = tmp_path / "merged.json"
+
+        result = CliRunner().invoke(
+            main,
+            ["-q", "-o", str(merged_path), "--files-from", "-"],
+            input="".join(f"{path}\n" for path in paths),
+        )
+
+        assert result.exit_code == 1
+        assert result.output == "In range: 6, Out of range: 1, Errors: 1\n"
+        merged = load_partial(merged_path)
+        assert merged.summary == Summary(8, 7, 6, 0, 1, 1)
+        assert len(merged.offenders) == 2
+
+    def test_no_issues(self, tmp_path: Path) -> None:
+        """Test exiting with 0 if all records were in range."""
+        path = write_partials(tmp_path)[1]
+
+        result = CliRunner().invoke(main, ["-q", str(path)])
+
+        assert result.exit_code == 0
+
+    def test_invalid(self, tmp_path: Path) -> None:
+        """Test that invalid files and empty merges are errors."""
+        path = tmp_path / "a.json"
+        path.write_text("[]")
+        runner = CliRunner()
+
+        invalid = runner.invoke(main, [str(path)])
+        empty = runner.invoke(main, [])
+
+        assert invalid.exit_code == empty.exit_code == 2
+        assert "Invalid partial result" in invalid.output
+        assert "No partial results" in empty.output
+
+    def test_shards(self, tmp_path: Path) -> None:
+        """Test that merging the partial results of shards matches a single run."""
+        paths = [tmp_path / "a.jsonl", tmp_path / "b.jsonl"]
+        for path in paths:
+            path.write_text(LINES)
+        runner = CliRunner()
+        check = ["--start", "2020-01-01", "--end", "2020-12-31"]
+
+        shards = [
+            runner.invoke(
+                check_timestamp.main,
+                check + ["--emit-partial", f"{path}.part", str(path)],
+            )
+            for path in paths
+        ]
+        merged = runner.invoke(main, [f"{path}.part" for path in paths])
+        # Partial results do not keep the skew of the out-of-range records
+        single = runner.invoke(
+            check_timestamp.main, check + ["--no-skew"] + list(map(str, paths))
+        )
+
+        assert [shard.exit_code for shard in shards] == [1, 1]
+        assert "Line" not in shards[0].output
+        assert "Total log records: 2" in shards[0].output
+        assert "not available with --emit-partial" in shards[0].output
+        assert merged.exit_code == single.exit_code == 1
+        assert merged.output == single.output
+
+
+class TestEmitPartial:
+    """Test the --emit-partial option of otlp-check-timestamp."""
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            ["--jobs", "2"],
+            ["--profile"],
+            ["--follow"],
+            ["--format", "csv"],
+            ["-v"],
+            ["--max-reports", "5"],
+            ["--fail-fast"],
+        ],
+    )
+    def test_invalid_options(self, tmp_path: Path, options: list[str]) -> None:
+        """Test the option combinations that are rejected."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(LINES)
+
+        result = CliRunner().invoke(
+            check_timestamp.main,
+            ["--start", "2020-01-01", "--end", "2020-12-31"]
+            + ["--emit-partial", str(tmp_path / "part.json"), *options, str(path)],
+        )
+
+        assert result.exit_code == 2
+        assert "--emit-partial" in result.output
+        assert not (tmp_path / "part.json").exists()
@@ -0,0 +1,97 @@
+"""The otlp command, running every tool as a subcommand.
+
+Subcommands are listed with their help in SUBCOMMANDS and only imported
+when they are run, so that starting one tool does not pay for importing
+all others (and `otlp --help` imports none of them).
+"""
+
+import importlib
+from collections.abc import Mapping
+from typing import Any, NamedTuple, Optional
+
+import click
+
+from otlp_analyzer import __version__
+
+
+class Subcommand(NamedTuple):
+    """Where to find a subcommand, and its help for listing it without importing."""
+
+    target: str  # "module:attribute" of the click command
+    short_help: str  # must match the command help, see otlp_test.py
+
+
+SUBCOMMANDS: Mapping[str, Subcommand] = {
+    "analyze": Subcommand(
+        "otlp_analyzer.tools.analyze:main",
+        "Run several analyses of OTLP logs, decoding each line only once.",
+    ),
+    "check-timestamp": Subcommand(
+        "otlp_analyzer.tools.check_timestamp:main",
+        "Check if OTLP log record timestamps fall within a time range.",
+    ),
+    "index-timestamps": Subcommand(
+        "otlp_analyzer.tools.index_timestamps:main",
+        "Write a timestamp index next to each of the INPUT_FILES.",
+    ),
+    "merge-summaries": Subcommand(
+        "otlp_analyzer.tools.merge_summaries:main",
+        "Merge the partial results of sharded otlp-check-timestamp runs.",
+    ),
+}
+
+
+class LazyGroup(click.Group):
+    """A click group importing the commands of SUBCOMMANDS on first use."""
+
+    def __init__(
+        self, *args: Any, subcommands: Mapping[str, Subcommand], **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.subcommands = subcommands
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name in self.subcommands:
+            module_name, _, attribute = self.subcommands[cmd_name].target.partition(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        # The same limit as click.Group
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = [
+            (
+                name,
+                (
+                    self.subcommands[name].short_help
+                    if name in self.subcommands and name not in self.commands
+                    else self.commands[name].get_short_help_str(limit)
+                ),
+            )
+            for name in names
+        ]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, subcommands=SUBCOMMANDS)
+@click.version_option(version=__version__)
+def main() -> None:
+    """
+    Analyze JSONL files of OTLP (OpenTelemetry Protocol) data.
+
+    Run `otlp COMMAND --help` for the options of a command.
+    """
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Tests for the otlp command."""
+
+import importlib
+import pkgutil
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from otlp_analyzer.tools.otlp import SUBCOMMANDS, main
+
+LINE = '{"resourceLogs":[{"scopeLogs":[{"logRecords":[{"timeUnixNano":"1592224245000000000"}]}]}]}\n'
+
+
+class TestMain:
+    """Test dispatching to the subcommands."""
+
+    def test_help_imports_no_subcommand(self) -> None:
+        """Test that listing the subcommands does not import them."""
+        script = (
+            "import sys\n"
+            "from otlp_analyzer.tools.otlp import main\n"
+            "main(['--help'], standalone_mode=False)\n"
+            "print(sorted(name for name in sys.modules if name.startswith("
+            "'otlp_analyzer.tools.') and name != 'otlp_analyzer.tools.otlp'))\n"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={"PYTHONPATH": str(Path(__file__).parents[2])},
+        )
+
+        assert "check-timestamp" in result.stdout
+        assert "index-timestamps" in result.stdout
+        assert result.stdout.endswith("[]\n")
+
+    @pytest.mark.parametrize("name", sorted(SUBCOMMANDS))
+    def test_subcommands(self, name: str) -> None:
+        """Test that every subcommand exists and is listed with its own help."""
+        module_name, _, attribute = SUBCOMMANDS[name].target.partition(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+
+        assert isinstance(command, click.Command)
+        assert SUBCOMMANDS[name].short_help == command.get_short_help_str(limit=200)
+
+    def test_every_tool_is_a_subcommand(self) -> None:
+        """Test that every tool is in SUBCOMMANDS, named after its module."""
+        tools = importlib.import_module("otlp_analyzer.tools")
+        modules = {
+            module.name
+            for module in pkgutil.iter_modules(tools.__path__, f"{tools.__name__}.")
+            if not module.name.endswith(("_test", ".otlp"))
+        }
+
+        assert {
+            name: subcommand.target for name, subcommand in SUBCOMMANDS.items()
+        } == {
+            module_name.rpartition(".")[2].replace("_", "-"): f"{module_name}:main"
+            for module_name in modules
+        }
+
+    def test_check_timestamp(self, tmp_path: Path) -> None:
+        """Test running a subcommand with its arguments."""
+        path = tmp_path / "logs.jsonl"
+        path.write_text(LINE)
+
+        result = CliRunner().invoke(
+            main,
+            ["check-timestamp", "--start", "2020-01-01", "--end", "2020-12-31"]
+            + ["-q", str(path)],
+        )
+
+        assert result.exit_code == 0
+        assert result.output == "In range: 1, Out of range: 0, Errors: 0\n"
+
+    def test_unknown_command(self) -> None:
+        """Test that unknown subcommands are rejected."""
+        result = CliRunner().invoke(main, ["check-everything"])
+
+        assert result.exit_code == 2
+        assert "No such command" in result.output